@@ -0,0 +1,31 @@
+"""kg_edge natural-key uniqueness
+
+Revision ID: 20261018_000003
+Revises: 20260208_000002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "20261018_000003"
+down_revision = "20260208_000002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Earlier builders could persist the same edge twice; keep one row per natural key.
+    op.execute(
+        "DELETE FROM kg_edge WHERE edge_id NOT IN ("
+        "SELECT MIN(edge_id) FROM kg_edge GROUP BY src_entity_id, dst_entity_id, edge_type)"
+    )
+    op.create_index(
+        "uq_kg_edge_src_dst_type",
+        "kg_edge",
+        ["src_entity_id", "dst_entity_id", "edge_type"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_kg_edge_src_dst_type", table_name="kg_edge")
@@ -0,0 +1,34 @@
+"""ingest_quarantine for events that fail normalization
+
+Revision ID: 20261018_000004
+Revises: 20261018_000003
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261018_000004"
+down_revision = "20261018_000003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingest_quarantine",
+        sa.Column("quarantine_id", sa.String(36), primary_key=True, nullable=False),
+        sa.Column("tool", sa.String(64), nullable=False),
+        sa.Column("external_event_id", sa.String(256), nullable=False),
+        sa.Column("error_type", sa.String(128), nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("first_failed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_failed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("tool", "external_event_id", name="uq_ingest_quarantine_tool_external"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingest_quarantine")
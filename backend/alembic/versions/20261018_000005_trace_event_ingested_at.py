@@ -0,0 +1,39 @@
+"""trace_event.ingested_at for incremental personal timelines
+
+Revision ID: 20261018_000005
+Revises: 20261018_000004
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261018_000005"
+down_revision = "20261018_000004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows take the migration time; timelines without a checkpoint rebuild anyway.
+    op.add_column(
+        "trace_event",
+        sa.Column(
+            "ingested_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_trace_event_actor_ingested",
+        "trace_event",
+        ["actor_principal_id", "ingested_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trace_event_actor_ingested", table_name="trace_event")
+    op.drop_column("trace_event", "ingested_at")
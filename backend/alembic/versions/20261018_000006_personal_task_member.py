@@ -0,0 +1,97 @@
+"""personal_task_member: ordered task membership as rows
+
+Revision ID: 20261018_000006
+Revises: 20261018_000005
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261018_000006"
+down_revision = "20261018_000005"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    op.create_table(
+        "personal_task_member",
+        sa.Column(
+            "personal_task_id",
+            sa.String(36),
+            sa.ForeignKey("personal_task.personal_task_id"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("ordinal", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column(
+            "trace_event_id",
+            sa.String(36),
+            sa.ForeignKey("trace_event.trace_event_id"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_personal_task_member_event",
+        "personal_task_member",
+        ["trace_event_id"],
+        unique=False,
+    )
+
+    # Backfill from the JSON lists; ids whose trace_event is gone are skipped, ordinals kept.
+    bind = op.get_bind()
+    task = sa.table(
+        "personal_task",
+        sa.column("personal_task_id", sa.String),
+        sa.column("member_trace_event_ids", sa.JSON),
+    )
+    trace_event = sa.table("trace_event", sa.column("trace_event_id", sa.String))
+    member = sa.table(
+        "personal_task_member",
+        sa.column("personal_task_id", sa.String),
+        sa.column("ordinal", sa.Integer),
+        sa.column("trace_event_id", sa.String),
+    )
+    # Keyset pages over personal_task_id, so memory is bounded by BATCH_SIZE tasks.
+    after = ""
+    while True:
+        rows = bind.execute(
+            sa.select(task.c.personal_task_id, task.c.member_trace_event_ids)
+            .where(task.c.personal_task_id > after)
+            .order_by(task.c.personal_task_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        after = rows[-1][0]
+        batch = [
+            (task_id, ordinal, event_id)
+            for task_id, event_ids in rows
+            for ordinal, event_id in enumerate(event_ids or [])
+        ]
+        known: set[str] = set()
+        event_ids = sorted({event_id for _, _, event_id in batch})
+        for offset in range(0, len(event_ids), BATCH_SIZE):
+            known.update(
+                bind.execute(
+                    sa.select(trace_event.c.trace_event_id).where(
+                        trace_event.c.trace_event_id.in_(event_ids[offset : offset + BATCH_SIZE])
+                    )
+                ).scalars()
+            )
+        values = [
+            {"personal_task_id": task_id, "ordinal": ordinal, "trace_event_id": event_id}
+            for task_id, ordinal, event_id in batch
+            if event_id in known
+        ]
+        if values:
+            op.bulk_insert(member, values)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_personal_task_member_event", table_name="personal_task_member")
+    op.drop_table("personal_task_member")
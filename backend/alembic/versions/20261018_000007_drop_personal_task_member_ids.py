@@ -0,0 +1,71 @@
+"""drop personal_task.member_trace_event_ids now that personal_task_member holds membership
+
+Revision ID: 20261018_000007
+Revises: 20261018_000006
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20261018_000007"
+down_revision = "20261018_000006"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("personal_task") as batch:
+        batch.drop_column("member_trace_event_ids")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "personal_task",
+        sa.Column("member_trace_event_ids", sa.JSON(), nullable=False, server_default="[]"),
+    )
+
+    # Rebuild the JSON lists from personal_task_member, keyset-paged over personal_task_id.
+    bind = op.get_bind()
+    task = sa.table(
+        "personal_task",
+        sa.column("personal_task_id", sa.String),
+        sa.column("member_trace_event_ids", sa.JSON),
+    )
+    member = sa.table(
+        "personal_task_member",
+        sa.column("personal_task_id", sa.String),
+        sa.column("ordinal", sa.Integer),
+        sa.column("trace_event_id", sa.String),
+    )
+    after = ""
+    while True:
+        task_ids = (
+            bind.execute(
+                sa.select(task.c.personal_task_id)
+                .where(task.c.personal_task_id > after)
+                .order_by(task.c.personal_task_id)
+                .limit(BATCH_SIZE)
+            )
+            .scalars()
+            .all()
+        )
+        if not task_ids:
+            break
+        after = task_ids[-1]
+        members: dict[str, list[str]] = {}
+        for task_id, event_id in bind.execute(
+            sa.select(member.c.personal_task_id, member.c.trace_event_id)
+            .where(member.c.personal_task_id.in_(task_ids))
+            .order_by(member.c.personal_task_id, member.c.ordinal)
+        ):
+            members.setdefault(task_id, []).append(event_id)
+        for task_id, event_ids in members.items():
+            bind.execute(
+                task.update()
+                .where(task.c.personal_task_id == task_id)
+                .values(member_trace_event_ids=event_ids)
+            )
@@ -1,6 +1,6 @@
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -9,6 +9,7 @@ from ocg.api.deps import get_db, require_admin
 from ocg.connectors.registry import CONNECTOR_REGISTRY
 from ocg.db import models
 from ocg.services import ingest
+from ocg.services.reliability import CIRCUIT_CLOSED, circuit_breaker
 
 router = APIRouter(prefix="/api/v1/admin/connectors", tags=["admin"])
 
@@ -19,6 +20,8 @@ class ConnectorEnableRequest(BaseModel):
     scopes: list[str] = Field(default_factory=list)
     projects: list[str] = Field(default_factory=list)
     poll_interval_seconds: int = 120
+    rate_limit_per_second: float | None = Field(default=None, gt=0)
+    rate_limit_burst: int | None = Field(default=None, ge=1)
 
 
 class RetentionConfigRequest(BaseModel):
@@ -83,9 +86,10 @@ def sync_now(tool: str, _admin=Depends(require_admin), db: Session = Depends(get
     config = db.scalar(select(models.ConnectorConfig).where(models.ConnectorConfig.tool == tool))
     if not config or not config.enabled:
         raise HTTPException(status_code=409, detail="Connector is disabled.")
-    ingest_result = ingest.ingest_connector_batch(db, connector, config.config_json)
-    sync_result = ingest.sync_permissions(db, connector, config.config_json)
-    return {"ingest": ingest_result, "permissions_sync": sync_result}
+    result = ingest.sync_connectors(db, {tool: (connector, config.config_json)})[tool]
+    if result["status"] != "ok":
+        raise HTTPException(status_code=503, detail="Connector sync failed.")
+    return {"ingest": result["ingest"], "permissions_sync": result["permissions_sync"]}
 
 
 @router.get("/{tool}/health")
@@ -95,14 +99,54 @@ def connector_health(
     config = db.scalar(select(models.ConnectorConfig).where(models.ConnectorConfig.tool == tool))
     if not config:
         raise HTTPException(status_code=404, detail="Connector not configured.")
+    circuit = circuit_breaker(tool).snapshot()
+    if not config.enabled:
+        status = "disabled"
+    elif circuit["state"] != CIRCUIT_CLOSED:
+        status = "degraded"
+    else:
+        status = "healthy"
     return {
         "tool": tool,
         "enabled": config.enabled,
         "last_checked_at": datetime.now(tz=UTC).isoformat(),
-        "status": "healthy" if config.enabled else "disabled",
+        "status": status,
+        "circuit": circuit,
     }
 
 
+@router.get("/{tool}/quarantine")
+def list_quarantine(
+    tool: str,
+    limit: int = Query(default=100, ge=1, le=1000),
+    _admin=Depends(require_admin),
+    db: Session = Depends(get_db),
+) -> dict:
+    if tool not in CONNECTOR_REGISTRY:
+        raise HTTPException(status_code=404, detail="Connector not supported.")
+    return ingest.quarantine_summary(db, tool, limit=limit)
+
+
+@router.post("/{tool}/quarantine/redrive")
+def redrive_quarantine(
+    tool: str, _admin=Depends(require_admin), db: Session = Depends(get_db)
+) -> dict:
+    connector = CONNECTOR_REGISTRY.get(tool)
+    if not connector:
+        raise HTTPException(status_code=404, detail="Connector not supported.")
+    result = ingest.redrive_quarantined(db, connector)
+    db.add(
+        models.AuditLog(
+            actor_principal_id="admin",
+            action="quarantine_redrive",
+            metadata_json={"tool": tool, **result},
+            created_at=datetime.now(tz=UTC),
+        )
+    )
+    db.commit()
+    return {"tool": tool, "redrive": result}
+
+
 @router.get("/retention")
 def get_retention(_admin=Depends(require_admin), db: Session = Depends(get_db)) -> dict:
     row = db.get(models.JobCheckpoint, "retention_config")
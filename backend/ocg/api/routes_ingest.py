@@ -0,0 +1,58 @@
+import json
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ocg.api.deps import get_db
+from ocg.connectors.base import WebhookEventError
+from ocg.connectors.registry import CONNECTOR_REGISTRY
+from ocg.db import models
+from ocg.services import webhooks
+
+router = APIRouter(prefix="/api/v1/ingest", tags=["ingest"])
+
+
+async def _raw_body(request: Request) -> bytes:
+    return await request.body()
+
+
+# A sync handler runs in the threadpool, so the DB and Redis calls never block the event loop;
+# only reading the body, which needs the request stream, is async.
+@router.post("/{tool}/webhook", status_code=202)
+def receive_webhook(
+    tool: str,
+    body: bytes = Depends(_raw_body),
+    signature: str | None = Header(default=None, alias=webhooks.SIGNATURE_HEADER),
+    db: Session = Depends(get_db),
+) -> dict:
+    connector = CONNECTOR_REGISTRY.get(tool)
+    if not connector:
+        raise HTTPException(status_code=404, detail="Connector not supported.")
+    config = db.scalar(select(models.ConnectorConfig).where(models.ConnectorConfig.tool == tool))
+    if not config or not config.enabled:
+        raise HTTPException(status_code=409, detail="Connector is disabled.")
+    secret = webhooks.webhook_secret(config.config_json)
+    if secret is None or not webhooks.verify_signature(secret, body, signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature.")
+
+    try:
+        payload = json.loads(body)
+        deliveries = payload if isinstance(payload, list) else [payload]
+        received_at = datetime.now(tz=UTC)
+        events = [
+            connector.webhook_event(delivery, received_at=received_at)
+            for delivery in deliveries
+            if isinstance(delivery, dict)
+        ]
+    except (UnicodeDecodeError, json.JSONDecodeError, WebhookEventError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid webhook payload: {exc}") from exc
+    if len(events) != len(deliveries) or not events:
+        raise HTTPException(status_code=400, detail="Webhook payload must be an event object.")
+
+    try:
+        depth = webhooks.buffer_webhook_events(tool, events)
+    except webhooks.WebhookBufferFullError as exc:
+        raise HTTPException(status_code=429, detail="Webhook buffer is full.") from exc
+    return {"tool": tool, "accepted": len(events), "buffered": depth}
@@ -1,36 +1,157 @@
-from fastapi import APIRouter, Depends, Query
+from collections.abc import Callable
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from pydantic import BaseModel
+from redis.exceptions import RedisError
 from sqlalchemy.orm import Session
 
 from ocg.api.deps import get_auth_context, get_db
+from ocg.core.observability import PERSONAL_CACHE_REQUESTS
 from ocg.core.security import AuthContext
-from ocg.services import personal
+from ocg.services import personal, personal_cache
+from ocg.workers import runtime
 
 router = APIRouter(prefix="/api/v1/personal", tags=["personal"])
 
 
-@router.get("/timeline")
+def _schedule_refresh_if_needed(db: Session, context: AuthContext) -> None:
+    """Reads never write; a missing timeline or new principal set queues a background refresh.
+
+    Known timelines are kept current by the scheduler's ``personal_refresh`` job.
+    """
+    checkpoint = personal.timeline_checkpoint(db, context.person_id)
+    if checkpoint and checkpoint.get("principal_ids") == sorted(set(context.principal_ids)):
+        return
+    try:
+        runtime.enqueue_personal_graph(context.person_id, context.principal_ids)
+    except RedisError:
+        # Serve what is stored; the next read retries the enqueue.
+        pass
+
+
+def _cached_page(
+    kind: str,
+    params: dict,
+    context: AuthContext,
+    db: Session,
+    response: Response,
+    if_none_match: str | None,
+    load: Callable[[], dict],
+) -> dict | Response:
+    """Serve a page from the personal cache, or 304 when the client's ETag is current.
+
+    The ETag is the hash of the page stored with the cache entry, so a cached page matching
+    ``If-None-Match`` is answered without touching the DB, and a reloaded page gets a 304 only
+    if its content is unchanged.
+    """
+    version = personal_cache.version_store().get(context.person_id)
+    if version is None:
+        PERSONAL_CACHE_REQUESTS.labels(kind=kind, result="bypass").inc()
+        _schedule_refresh_if_needed(db, context)
+        return _load(load)
+    key = personal_cache.cache_key(context.person_id, context.principal_ids, version, kind, params)
+    cached = personal_cache.page_cache().get(key)
+    if cached is None:
+        PERSONAL_CACHE_REQUESTS.labels(kind=kind, result="miss").inc()
+        _schedule_refresh_if_needed(db, context)
+        payload = _load(load)
+        etag = personal_cache.page_cache().set(key, payload)
+    else:
+        etag, payload = cached
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "private, no-cache"}
+    not_modified = bool(if_none_match) and f'"{etag}"' in {
+        tag.strip() for tag in (if_none_match or "").split(",")
+    }
+    if cached is not None:
+        result = "not_modified" if not_modified else "hit"
+        PERSONAL_CACHE_REQUESTS.labels(kind=kind, result=result).inc()
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return payload
+
+
+def _load(load: Callable[[], dict]) -> dict:
+    try:
+        return load()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get(
+    "/timeline",
+    response_model=dict,
+    responses={304: {"description": "Not Modified"}},
+    description=(
+        "Timeline items newest first (descending `sequence_rank`). Pass `next_cursor` back as "
+        "`cursor` for the next, older page."
+    ),
+)
 def timeline(
+    response: Response,
     from_: str | None = Query(default=None, alias="from"),
     to: str | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
     context: AuthContext = Depends(get_auth_context),
     db: Session = Depends(get_db),
-) -> dict:
-    personal.build_personal_timeline(db, context.person_id, context.principal_ids)
-    return {"items": personal.personal_timeline(db, context.person_id, from_, to)}
+) -> dict | Response:
+    return _cached_page(
+        "timeline",
+        {"from": from_, "to": to, "limit": limit, "cursor": cursor},
+        context,
+        db,
+        response,
+        if_none_match,
+        lambda: personal.personal_timeline(
+            db,
+            context.person_id,
+            from_,
+            to,
+            limit=limit,
+            cursor=cursor,
+            principal_ids=context.principal_ids,
+        ),
+    )
 
 
-@router.get("/tasks")
+@router.get(
+    "/tasks",
+    response_model=dict,
+    responses={304: {"description": "Not Modified"}},
+    description=(
+        "Tasks newest first (descending `start_time`, then `personal_task_id`). Pass "
+        "`next_cursor` back as `cursor` for the next, older page."
+    ),
+)
 def tasks(
+    response: Response,
     from_: str | None = Query(default=None, alias="from"),
     to: str | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
     context: AuthContext = Depends(get_auth_context),
     db: Session = Depends(get_db),
-) -> dict:
-    _ = from_, to
-    personal.build_personal_timeline(db, context.person_id, context.principal_ids)
-    personal.cluster_personal_tasks(db, context.person_id)
-    return {"tasks": personal.personal_tasks(db, context.person_id)}
+) -> dict | Response:
+    return _cached_page(
+        "tasks",
+        {"from": from_, "to": to, "limit": limit, "cursor": cursor},
+        context,
+        db,
+        response,
+        if_none_match,
+        lambda: personal.personal_tasks(
+            db,
+            context.person_id,
+            from_,
+            to,
+            limit=limit,
+            cursor=cursor,
+            principal_ids=context.principal_ids,
+        ),
+    )
 
 
 class OptInRequest(BaseModel):
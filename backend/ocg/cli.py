@@ -1,5 +1,6 @@
 import json
 import time
+from collections.abc import Mapping
 from pathlib import Path
 
 import typer
@@ -11,7 +12,7 @@ from ocg.connectors.registry import CONNECTOR_REGISTRY
 from ocg.core.settings import get_settings
 from ocg.db import models
 from ocg.db.session import SessionLocal
-from ocg.services import aggregation, identity, ingest, kg, personal
+from ocg.services import aggregation, identity, ingest, kg, personal, personal_cache
 from ocg.workers import jobs, runtime
 from ocg.workers.queues import ALL_QUEUES
 
@@ -63,12 +64,12 @@ def seed_demo() -> None:
                 },
             )
 
-        for tool, connector in CONNECTOR_REGISTRY.items():
-            cfg = db.scalar(
-                select(models.ConnectorConfig).where(models.ConnectorConfig.tool == tool)
-            )
-            ingest.ingest_connector_batch(db, connector, cfg.config_json if cfg else {})
-            ingest.sync_permissions(db, connector, cfg.config_json if cfg else {})
+        results = ingest.sync_connectors(db, ingest.enabled_connector_targets(db))
+        failed = sorted(tool for tool, result in results.items() if result["status"] == "error")
+        if failed:
+            typer.echo(json.dumps({tool: results[tool] for tool in failed}, sort_keys=True))
+            typer.echo(f"demo seed failed: connector sync error for {', '.join(failed)}")
+            raise typer.Exit(code=1)
 
         identity.resolve_identities(db)
         kg.infer_kg_entities(db)
@@ -90,6 +91,43 @@ def seed_demo() -> None:
         db.close()
 
 
+@seed_app.command("synthetic")
+def seed_synthetic(
+    events: int = typer.Option(100_000, help="Number of events to generate."),
+    seed: int = typer.Option(0, help="Generator seed; the same seed yields the same events."),
+    actors: int = typer.Option(200, help="Distinct actors (Zipf-distributed activity)."),
+    resources: int = typer.Option(300, help="Resources per shape (Zipf-distributed)."),
+    acl_size: int = typer.Option(8, help="Mean principals per resource ACL."),
+    recording: str = typer.Option("", help="Replay recorded payloads from this JSONL file."),
+    page_size: int = typer.Option(0, help="Events per staged page (0 = OCG_INGEST_PAGE_SIZE)."),
+) -> None:
+    """Enable the synthetic connector with the given volume and backfill it."""
+    config: dict[str, object] = {
+        "seed": seed,
+        "events": events,
+        "actors": actors,
+        "resources": resources,
+        "acl_size": acl_size,
+    }
+    if recording:
+        config["recording_path"] = recording
+    connector = CONNECTOR_REGISTRY["synthetic"]
+    db = SessionLocal()
+    try:
+        try:
+            connector.validate(config)
+        except ValueError as exc:
+            typer.echo(str(exc))
+            raise typer.Exit(code=2) from exc
+        ingest.set_connector_enabled(db, "synthetic", True, config)
+        # Full ACLs first: event deltas then only add each actor to what it touched.
+        permissions = ingest.sync_permissions(db, connector, config, page_size=page_size or None)
+        result = ingest.backfill_connector(db, connector, config, page_size=page_size or None)
+        typer.echo(json.dumps({**result, "permissions": permissions}, indent=2, sort_keys=True))
+    finally:
+        db.close()
+
+
 @diag_app.command("connectors")
 def diagnostics_connectors() -> None:
     db = SessionLocal()
@@ -126,10 +164,14 @@ def worker_tick(
     include_aggregation: bool = typer.Option(
         True, help="Enqueue aggregation publish job in this cycle."
     ),
+    include_personal: bool = typer.Option(
+        True, help="Enqueue personal timeline/task refresh job in this cycle."
+    ),
 ) -> None:
     payload = runtime.enqueue_cycle(
         include_identity=include_identity,
         include_aggregation=include_aggregation,
+        include_personal=include_personal,
     )
     typer.echo(json.dumps(payload, indent=2, sort_keys=True))
 
@@ -145,6 +187,9 @@ def worker_scheduler(
     include_aggregation: bool = typer.Option(
         True, help="Enqueue aggregation publish in each cycle."
     ),
+    include_personal: bool = typer.Option(
+        True, help="Enqueue personal timeline/task refresh in each cycle."
+    ),
 ) -> None:
     settings = get_settings()
     effective_interval = interval_seconds or settings.worker_scheduler_interval_seconds
@@ -155,6 +200,7 @@ def worker_scheduler(
         payload = runtime.enqueue_cycle(
             include_identity=include_identity,
             include_aggregation=include_aggregation,
+            include_personal=include_personal,
         )
         typer.echo(json.dumps(payload, indent=2, sort_keys=True))
         if once:
@@ -162,6 +208,22 @@ def worker_scheduler(
         time.sleep(effective_interval)
 
 
+@worker_app.command("webhooks")
+def worker_webhooks(
+    batch_size: int = typer.Option(0, help="Flush after this many events (0 = configured)."),
+    flush_interval_ms: int = typer.Option(
+        0, help="Flush once the oldest event waited this long (0 = configured)."
+    ),
+    once: bool = typer.Option(False, help="Flush due buffers once and exit."),
+) -> None:
+    typer.echo("webhook batcher starting")
+    runtime.run_webhook_batcher(
+        batch_size=batch_size or None,
+        flush_interval_ms=flush_interval_ms or None,
+        once=once,
+    )
+
+
 @worker_app.command("stats")
 def worker_stats() -> None:
     payload = runtime.queue_depths()
@@ -176,22 +238,89 @@ def worker_run(job_name: str, arg: str = "") -> None:
     if job_name == "permissions":
         typer.echo(jobs.run_permissions_sync(arg))
         return
+    if job_name == "replay":
+        typer.echo(jobs.run_replay(arg))
+        return
     if job_name == "aggregation":
         typer.echo(jobs.run_aggregation())
         return
     if job_name == "kg":
         typer.echo(jobs.run_kg_and_identity())
         return
+    if job_name == "personal":
+        typer.echo(jobs.run_personal_refresh())
+        return
+    if job_name == "personal-tasks":
+        typer.echo(jobs.run_personal_tasks_bulk(arg or None))
+        return
     typer.echo(f"unknown job {job_name}")
     raise typer.Exit(code=2)
 
 
+@app.command("backfill")
+def backfill(
+    tool: str,
+    page_size: int = typer.Option(0, help="Events per staged page (0 = OCG_INGEST_PAGE_SIZE)."),
+) -> None:
+    connector = CONNECTOR_REGISTRY.get(tool)
+    if connector is None:
+        typer.echo(f"unknown connector {tool}")
+        raise typer.Exit(code=2)
+    db = SessionLocal()
+    try:
+        cfg = db.scalar(select(models.ConnectorConfig).where(models.ConnectorConfig.tool == tool))
+        if not cfg or not cfg.enabled:
+            typer.echo(f"connector {tool} is not enabled")
+            raise typer.Exit(code=2)
+        result = ingest.backfill_connector(
+            db, connector, cfg.config_json, page_size=page_size or None
+        )
+        typer.echo(json.dumps(result, indent=2, sort_keys=True))
+    finally:
+        db.close()
+
+
+@app.command("replay")
+def replay(
+    tool: str,
+    since: str = typer.Option("", help="Replay raw events fetched at or after (ISO-8601)."),
+    until: str = typer.Option("", help="Replay raw events fetched before (ISO-8601)."),
+    enqueue: bool = typer.Option(False, help="Enqueue on the normalize queue instead."),
+) -> None:
+    if tool not in CONNECTOR_REGISTRY:
+        typer.echo(f"unknown connector {tool}")
+        raise typer.Exit(code=2)
+    payload: Mapping[str, object]
+    if enqueue:
+        payload = runtime.enqueue_replay(tool, since=since or None, until=until or None)
+    else:
+        payload = jobs.run_replay(tool, since or None, until or None)
+    typer.echo(json.dumps(payload, indent=2, sort_keys=True))
+
+
+@app.command("redrive")
+def redrive(
+    tool: str,
+    page_size: int = typer.Option(0, help="Events per page (0 = OCG_INGEST_PAGE_SIZE)."),
+) -> None:
+    connector = CONNECTOR_REGISTRY.get(tool)
+    if connector is None:
+        typer.echo(f"unknown connector {tool}")
+        raise typer.Exit(code=2)
+    db = SessionLocal()
+    try:
+        result = ingest.redrive_quarantined(db, connector, page_size=page_size or None)
+        typer.echo(json.dumps(result, indent=2, sort_keys=True))
+    finally:
+        db.close()
+
+
 @app.command("export-user")
 def export_user(person_id: str, output: str = "artifacts/export.json") -> None:
     db = SessionLocal()
     try:
-        timeline = personal.personal_timeline(db, person_id, None, None)
-        tasks = personal.personal_tasks(db, person_id)
+        timeline = personal.personal_timeline(db, person_id, None, None)["items"]
+        tasks = personal.personal_tasks(db, person_id)["tasks"]
         payload = {"person_id": person_id, "timeline": timeline, "tasks": tasks}
         out = Path(output)
         out.parent.mkdir(parents=True, exist_ok=True)
@@ -205,16 +334,27 @@ def export_user(person_id: str, output: str = "artifacts/export.json") -> None:
 def delete_user(person_id: str) -> None:
     db = SessionLocal()
     try:
-        db.execute(delete(models.PersonalTask).where(models.PersonalTask.person_id == person_id))
+        personal.delete_tasks(db, models.PersonalTask.person_id == person_id)
         db.execute(
             delete(models.PersonalTimelineItem).where(
                 models.PersonalTimelineItem.person_id == person_id
             )
         )
         db.execute(delete(models.PersonalOptIn).where(models.PersonalOptIn.person_id == person_id))
+        db.execute(
+            delete(models.JobCheckpoint).where(
+                models.JobCheckpoint.job_name.in_(
+                    [
+                        personal.timeline_checkpoint_name(person_id),
+                        personal.tasks_checkpoint_name(person_id),
+                    ]
+                )
+            )
+        )
         db.execute(delete(models.Identity).where(models.Identity.person_id == person_id))
         db.execute(delete(models.Person).where(models.Person.person_id == person_id))
         db.commit()
+        personal_cache.bump_versions([person_id])
         typer.echo(f"deleted user scope for {person_id}")
     finally:
         db.close()
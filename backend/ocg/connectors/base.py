@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
+from ocg.connectors.transport import ConnectorTransport, get_transport
 
 FORBIDDEN_WRITE_SCOPE_MARKERS = ("write", "admin", "delete", "post", "publish", "merge")
 
 
+class WebhookEventError(ValueError):
+    """A webhook delivery that does not map to an event."""
+
+
 @dataclass(frozen=True)
 class ConnectorEvent:
     tool: str
@@ -44,6 +50,13 @@ class ResourceDelta:
     acl_principal_ids: list[str]
 
 
+@dataclass(frozen=True)
+class EventPage:
+    events: list[ConnectorEvent]
+    # Opaque high-water mark per scope (project/channel/repo) after this page.
+    cursors: dict[str, str] = field(default_factory=dict)
+
+
 class Connector(ABC):
     tool: str
 
@@ -52,13 +65,77 @@ class Connector(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def fetch_events(self, config: dict[str, Any]) -> list[ConnectorEvent]:
+    def fetch_events(
+        self, config: dict[str, Any], cursors: dict[str, str] | None = None
+    ) -> list[ConnectorEvent]:
+        """Return events newer than ``cursors[scope_of(event)]``, oldest first per scope."""
         raise NotImplementedError
 
     @abstractmethod
     def fetch_acls(self, config: dict[str, Any]) -> list[ResourceDelta]:
         raise NotImplementedError
 
+    def scope_of(self, event: ConnectorEvent) -> str:
+        """Cursor scope (project, channel, repo) an event belongs to."""
+        return self.tool
+
+    def cursor_of(self, event: ConnectorEvent) -> str | None:
+        """Resumable position of an event within its scope, if the source has one."""
+        return None
+
+    def iter_event_pages(
+        self,
+        config: dict[str, Any],
+        *,
+        page_size: int,
+        cursors: dict[str, str] | None = None,
+    ) -> Iterator[EventPage]:
+        """Yield events in bounded pages.
+
+        The default slices ``fetch_events``; connectors backed by paginated vendor APIs
+        override this so that only one page is held in memory at a time.
+        """
+        events = self.fetch_events(config, cursors=cursors)
+        for start in range(0, len(events), page_size):
+            page_events = events[start : start + page_size]
+            page_cursors: dict[str, str] = {}
+            for event in page_events:
+                position = self.cursor_of(event)
+                if position is not None:
+                    page_cursors[self.scope_of(event)] = position
+            yield EventPage(events=page_events, cursors=page_cursors)
+
+    def iter_acl_pages(
+        self, config: dict[str, Any], *, page_size: int
+    ) -> Iterator[list[ResourceDelta]]:
+        resources = self.fetch_acls(config)
+        for start in range(0, len(resources), page_size):
+            yield resources[start : start + page_size]
+
+    def webhook_event(self, body: dict[str, Any], *, received_at: datetime) -> ConnectorEvent:
+        """Map one webhook delivery to an event; raise ``WebhookEventError`` if it is malformed.
+
+        The default accepts ``{"external_event_id": str, "payload": {...}}`` where ``payload``
+        has the shape ``fetch_events`` produces; connectors override this for vendor formats.
+        """
+        external_event_id = body.get("external_event_id")
+        payload = body.get("payload")
+        if not isinstance(external_event_id, str) or not external_event_id:
+            raise WebhookEventError("webhook event needs a non-empty external_event_id")
+        if not isinstance(payload, dict):
+            raise WebhookEventError("webhook event payload must be an object")
+        return ConnectorEvent(
+            tool=self.tool,
+            external_event_id=external_event_id,
+            fetched_at=received_at,
+            payload_json=payload,
+            permission_state="KNOWN",
+        )
+
+    def transport(self, config: dict[str, Any]) -> ConnectorTransport:
+        """Pooled, rate-limited HTTP transport for vendor API calls of this tool."""
+        return get_transport(self.tool, config)
+
     @abstractmethod
     def normalize(self, event: ConnectorEvent) -> tuple[NormalizedTrace, ResourceDelta | None]:
         raise NotImplementedError
@@ -70,6 +147,10 @@ class Connector(ABC):
             if any(marker in lower for marker in FORBIDDEN_WRITE_SCOPE_MARKERS):
                 raise ValueError(f"Rejected non-read-only scope: {scope}")
 
+    @staticmethod
+    def is_after_cursor(ts: datetime, cursor: str | None) -> bool:
+        return cursor is None or ts > datetime.fromisoformat(cursor)
+
     @staticmethod
     def now() -> datetime:
         return datetime.now(tz=UTC)
@@ -0,0 +1,102 @@
+"""Concurrent connector fetching, decoupled from the DB write phase.
+
+``prefetch_pages`` drains a connector page iterator on an executor thread into a bounded
+buffer, so vendor I/O for several tools (and for the ACL and event streams of one tool)
+overlaps while a single session consumes pages and writes them. The buffer depth caps how
+far fetching may run ahead of the writer, keeping worker memory bounded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from queue import Empty, Full, Queue
+from typing import TypeVar
+
+from ocg.core.observability import CONNECTOR_FETCH_DURATION
+
+T = TypeVar("T")
+
+DEFAULT_PREFETCH_DEPTH = 4
+_POLL_SECONDS = 0.1
+_DONE = object()
+
+
+class _FetchFailure:
+    def __init__(self, exc: Exception) -> None:
+        self.exc = exc
+
+
+class PrefetchedPages(Iterator[T]):
+    """Pages fetched ahead on an executor thread, yielded in source order.
+
+    Each page fetch is observed in ``CONNECTOR_FETCH_DURATION``. A fetch error is re-raised
+    to the consumer at the position it occurred. ``close`` stops the producer; callers must
+    close streams they stop consuming before shutting the executor down.
+    """
+
+    def __init__(self, pages: Iterable[T], *, tool: str, executor: Executor, depth: int) -> None:
+        self._pages = pages
+        self._tool = tool
+        self._buffer: Queue[object] = Queue(maxsize=depth)
+        self._stopped = threading.Event()
+        self._finished = False
+        executor.submit(self._produce)
+
+    def _offer(self, item: object) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._buffer.put(item, timeout=_POLL_SECONDS)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        iterator = iter(self._pages)
+        try:
+            while not self._stopped.is_set():
+                started = time.perf_counter()
+                page = next(iterator, _DONE)
+                if page is _DONE:
+                    break
+                CONNECTOR_FETCH_DURATION.labels(tool=self._tool).observe(
+                    time.perf_counter() - started
+                )
+                if not self._offer(page):
+                    return
+        except Exception as exc:  # noqa: BLE001 - surfaced to the consumer
+            self._offer(_FetchFailure(exc))
+            return
+        self._offer(_DONE)
+
+    def __next__(self) -> T:
+        while not self._finished:
+            try:
+                item = self._buffer.get(timeout=_POLL_SECONDS)
+            except Empty:
+                continue
+            if item is _DONE:
+                self.close()
+                break
+            if isinstance(item, _FetchFailure):
+                self.close()
+                raise item.exc
+            return item  # type: ignore[return-value]
+        raise StopIteration
+
+    def close(self) -> None:
+        self._finished = True
+        self._stopped.set()
+
+
+def prefetch_pages(
+    pages: Iterable[T],
+    *,
+    tool: str,
+    executor: Executor,
+    depth: int = DEFAULT_PREFETCH_DEPTH,
+) -> PrefetchedPages[T]:
+    return PrefetchedPages(pages, tool=tool, executor=executor, depth=depth)
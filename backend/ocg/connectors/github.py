@@ -14,8 +14,12 @@ class GitHubConnector(Connector):
         if not token_ref.startswith("env:"):
             raise ValueError("GitHub token must be a secret reference (env:...).")
 
-    def fetch_events(self, config: dict[str, Any]) -> list[ConnectorEvent]:
+    def fetch_events(
+        self, config: dict[str, Any], cursors: dict[str, str] | None = None
+    ) -> list[ConnectorEvent]:
         now = self.now()
+        if not self.is_after_cursor(now, (cursors or {}).get("acme/context-graph")):
+            return []
         return [
             ConnectorEvent(
                 tool=self.tool,
@@ -32,6 +36,12 @@ class GitHubConnector(Connector):
             )
         ]
 
+    def scope_of(self, event: ConnectorEvent) -> str:
+        return str(event.payload_json["repo"])
+
+    def cursor_of(self, event: ConnectorEvent) -> str | None:
+        return str(event.payload_json["ts"])
+
     def fetch_acls(self, config: dict[str, Any]) -> list[ResourceDelta]:
         return [
             ResourceDelta(
@@ -1,7 +1,16 @@
-from datetime import UTC, datetime
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from ocg.connectors.base import Connector, ConnectorEvent, NormalizedTrace, ResourceDelta
+from ocg.connectors.base import (
+    Connector,
+    ConnectorEvent,
+    EventPage,
+    NormalizedTrace,
+    ResourceDelta,
+)
+
+SEARCH_PATH = "/rest/api/3/search"
 
 
 class JiraConnector(Connector):
@@ -13,9 +22,18 @@ class JiraConnector(Connector):
         token_ref = str(config.get("auth", {}).get("token_ref", ""))
         if not token_ref.startswith("env:"):
             raise ValueError("Jira token must be a secret reference (env:...).")
+        if config.get("base_url") and not config.get("projects"):
+            raise ValueError("Jira projects must be listed when base_url is set.")
 
-    def fetch_events(self, config: dict[str, Any]) -> list[ConnectorEvent]:
+    def fetch_events(
+        self, config: dict[str, Any], cursors: dict[str, str] | None = None
+    ) -> list[ConnectorEvent]:
+        if config.get("base_url"):
+            pages = self.iter_event_pages(config, page_size=100, cursors=cursors)
+            return [event for page in pages for event in page.events]
         now = self.now()
+        if not self.is_after_cursor(now, (cursors or {}).get("ENG")):
+            return []
         return [
             ConnectorEvent(
                 tool=self.tool,
@@ -32,6 +50,76 @@ class JiraConnector(Connector):
             )
         ]
 
+    def iter_event_pages(
+        self,
+        config: dict[str, Any],
+        *,
+        page_size: int,
+        cursors: dict[str, str] | None = None,
+    ) -> Iterator[EventPage]:
+        """Page issue updates per project from the Jira search API, oldest first.
+
+        Without ``base_url`` the connector serves its built-in demo event instead.
+        """
+        if not config.get("base_url"):
+            yield from super().iter_event_pages(config, page_size=page_size, cursors=cursors)
+            return
+        transport = self.transport(config)
+        for project in config["projects"]:
+            cursor = (cursors or {}).get(project)
+            jql = f'project = "{project}" ORDER BY updated ASC'
+            if cursor is not None:
+                # JQL dates are in the account's timezone, so bound by day and filter exactly below.
+                since = (datetime.fromisoformat(cursor) - timedelta(days=1)).date()
+                jql = f'project = "{project}" AND updated >= "{since}" ORDER BY updated ASC'
+            start = 0
+            while True:
+                body = transport.get_json(
+                    SEARCH_PATH,
+                    {
+                        "jql": jql,
+                        "startAt": start,
+                        "maxResults": page_size,
+                        "fields": "updated,status,assignee",
+                    },
+                )
+                issues = body.get("issues", [])
+                events = [
+                    event
+                    for event in map(self._issue_event, issues)
+                    if self.is_after_cursor(
+                        datetime.fromisoformat(event.payload_json["ts"]), cursor
+                    )
+                ]
+                if events:
+                    yield EventPage(events=events, cursors={project: events[-1].payload_json["ts"]})
+                start += len(issues)
+                if not issues or start >= int(body.get("total", 0)):
+                    break
+
+    def _issue_event(self, issue: dict[str, Any]) -> ConnectorEvent:
+        fields = issue.get("fields", {})
+        updated = datetime.fromisoformat(fields["updated"]).astimezone(UTC)
+        return ConnectorEvent(
+            tool=self.tool,
+            external_event_id=f"jira-{issue['key']}-{int(updated.timestamp())}",
+            fetched_at=self.now(),
+            payload_json={
+                "issue_key": issue["key"],
+                "actor": (fields.get("assignee") or {}).get("accountId"),
+                "transition": (fields.get("status") or {}).get("name", ""),
+                "comment_body_stored": False,
+                "ts": updated.isoformat(),
+            },
+            permission_state="KNOWN",
+        )
+
+    def scope_of(self, event: ConnectorEvent) -> str:
+        return str(event.payload_json["issue_key"]).split("-", 1)[0]
+
+    def cursor_of(self, event: ConnectorEvent) -> str | None:
+        return str(event.payload_json["ts"])
+
     def fetch_acls(self, config: dict[str, Any]) -> list[ResourceDelta]:
         return [
             ResourceDelta(
@@ -2,10 +2,12 @@ from ocg.connectors.base import Connector
 from ocg.connectors.github import GitHubConnector
 from ocg.connectors.jira import JiraConnector
 from ocg.connectors.slack import SlackConnector
+from ocg.connectors.synthetic import SyntheticConnector
 
 
 CONNECTOR_REGISTRY: dict[str, Connector] = {
     "slack": SlackConnector(),
     "jira": JiraConnector(),
     "github": GitHubConnector(),
+    "synthetic": SyntheticConnector(),
 }
@@ -14,8 +14,12 @@ class SlackConnector(Connector):
         if not token_ref.startswith("env:"):
             raise ValueError("Slack token must be a secret reference (env:...).")
 
-    def fetch_events(self, config: dict[str, Any]) -> list[ConnectorEvent]:
+    def fetch_events(
+        self, config: dict[str, Any], cursors: dict[str, str] | None = None
+    ) -> list[ConnectorEvent]:
         now = self.now()
+        if not self.is_after_cursor(now, (cursors or {}).get("C-DEMO")):
+            return []
         payload = {
             "event_type": "message_metadata",
             "channel_id": "C-DEMO",
@@ -33,6 +37,12 @@ class SlackConnector(Connector):
             )
         ]
 
+    def scope_of(self, event: ConnectorEvent) -> str:
+        return str(event.payload_json["channel_id"])
+
+    def cursor_of(self, event: ConnectorEvent) -> str | None:
+        return str(event.payload_json["ts"])
+
     def fetch_acls(self, config: dict[str, Any]) -> list[ResourceDelta]:
         return [
             ResourceDelta(
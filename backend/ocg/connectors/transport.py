@@ -0,0 +1,202 @@
+"""Shared HTTP transport for connectors backed by vendor APIs.
+
+One ``ConnectorTransport`` per tool and base URL owns a keep-alive ``httpx.Client`` pool and
+a token bucket. Requests are rate limited client-side, vendor ``429``/``503`` responses with
+``Retry-After`` pause the tool's bucket (and count in ``RATE_LIMITED_TOTAL``), and transient
+failures are retried through ``retry_with_backoff``.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+from ocg.core.observability import RATE_LIMITED_TOTAL
+from ocg.core.settings import get_settings
+from ocg.services.reliability import RetryPolicy, retry_with_backoff
+
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+MAX_RETRY_AFTER_SECONDS = 300.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens/second up to ``capacity``."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("token bucket needs rate > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for ``seconds`` (vendor ``Retry-After``)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class RateLimitedError(RuntimeError):
+    def __init__(self, tool: str, retry_after_seconds: float | None) -> None:
+        super().__init__(f"{tool} rate limited (retry after {retry_after_seconds}s)")
+        self.retry_after_seconds = retry_after_seconds
+
+
+def parse_retry_after(value: str | None, *, now: datetime | None = None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = (when - (now or datetime.now(tz=UTC))).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, RateLimitedError | httpx.TransportError):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
+
+
+def _auth_headers(config: dict[str, Any]) -> dict[str, str]:
+    token_ref = str(config.get("auth", {}).get("token_ref", ""))
+    if token_ref.startswith("env:"):
+        token = os.environ.get(token_ref.removeprefix("env:"))
+        if token:
+            return {"Authorization": f"Bearer {token}"}
+    return {}
+
+
+class ConnectorTransport:
+    def __init__(
+        self,
+        tool: str,
+        *,
+        base_url: str,
+        rate_per_second: float,
+        burst: int,
+        headers: dict[str, str] | None = None,
+        retry_policy: RetryPolicy | None = None,
+        max_connections: int = 10,
+        timeout_seconds: float = 30.0,
+    ) -> None:
+        self.tool = tool
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.max_connections = max_connections
+        self.client = httpx.Client(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+
+    def _request_once(self, method: str, path: str, params: dict[str, Any] | None) -> Any:
+        self.bucket.acquire()
+        response = self.client.request(method, path, params=params)
+        if response.status_code in RETRY_AFTER_STATUSES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if response.status_code == 429 or retry_after is not None:
+                RATE_LIMITED_TOTAL.labels(tool=self.tool).inc()
+                if retry_after:
+                    self.bucket.pause(retry_after)
+                raise RateLimitedError(self.tool, retry_after)
+        response.raise_for_status()
+        return response.json()
+
+    def get_json(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        return retry_with_backoff(
+            lambda: self._request_once("GET", path, params),
+            policy=self.retry_policy,
+            retryable=_is_retryable,
+        )
+
+    def get_pages(
+        self, path: str, page_params: Sequence[dict[str, Any]], *, max_concurrency: int = 4
+    ) -> list[Any]:
+        """Fetch several pages of ``path`` concurrently, returned in ``page_params`` order."""
+        workers = max(1, min(max_concurrency, self.max_connections, len(page_params)))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"{self.tool}-http"
+        ) as pool:
+            return list(pool.map(lambda params: self.get_json(path, params), page_params))
+
+    def close(self) -> None:
+        self.client.close()
+
+
+_TRANSPORTS: dict[tuple[str, str], ConnectorTransport] = {}
+_TRANSPORTS_LOCK = threading.Lock()
+
+
+def get_transport(tool: str, config: dict[str, Any]) -> ConnectorTransport:
+    """Shared transport for ``tool`` and ``config["base_url"]``, created on first use.
+
+    ``config`` may override ``rate_limit_per_second`` and ``rate_limit_burst``.
+    """
+    base_url = str(config.get("base_url") or "")
+    if not base_url:
+        raise ValueError(f"{tool} connector config has no base_url.")
+    with _TRANSPORTS_LOCK:
+        transport = _TRANSPORTS.get((tool, base_url))
+        if transport is None:
+            settings = get_settings()
+            transport = ConnectorTransport(
+                tool,
+                base_url=base_url,
+                rate_per_second=float(
+                    config.get("rate_limit_per_second") or settings.connector_rate_limit_per_second
+                ),
+                burst=int(config.get("rate_limit_burst") or settings.connector_rate_limit_burst),
+                headers=_auth_headers(config),
+            )
+            _TRANSPORTS[(tool, base_url)] = transport
+        return transport
+
+
+def close_transports() -> None:
+    with _TRANSPORTS_LOCK:
+        for transport in _TRANSPORTS.values():
+            transport.close()
+        _TRANSPORTS.clear()
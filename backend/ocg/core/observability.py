@@ -46,6 +46,11 @@ WORKER_JOB_DURATION = Histogram(
     "Worker job runtime",
     labelnames=("job",),
 )
+PERSONAL_CACHE_REQUESTS = Counter(
+    "personal_cache_requests_total",
+    "Personal page cache lookups",
+    labelnames=("kind", "result"),
+)
 TRACE_SPANS_TOTAL = Counter("trace_spans_total", "Trace spans", labelnames=("span", "status"))
 TRACE_SPAN_DURATION = Histogram(
     "trace_span_duration_seconds",
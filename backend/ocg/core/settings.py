@@ -39,6 +39,19 @@ class Settings(BaseSettings):
     worker_job_timeout_seconds: int = 600
     worker_result_ttl_seconds: int = 600
     worker_failure_ttl_seconds: int = 86_400
+    ingest_page_size: int = Field(default=500, ge=1)
+    replay_workers: int = Field(default=4, ge=1)
+    connector_rate_limit_per_second: float = Field(default=5.0, gt=0)
+    connector_rate_limit_burst: int = Field(default=10, ge=1)
+    circuit_failure_threshold: int = Field(default=5, ge=1)
+    circuit_reset_timeout_seconds: float = Field(default=60.0, gt=0)
+    webhook_batch_size: int = Field(default=200, ge=1)
+    webhook_flush_interval_ms: int = Field(default=500, ge=10)
+    webhook_buffer_max_events: int = Field(default=100_000, ge=1)
+    personal_timeline_overlap_seconds: int = Field(default=300, ge=0)
+    personal_cache_max_entries: int = Field(default=10_000, ge=1)
+    personal_cache_ttl_seconds: float = Field(default=300.0, gt=0)
+    personal_cache_redis_enabled: bool = False
 
 
 @lru_cache(maxsize=1)
@@ -0,0 +1,52 @@
+"""Staging-table bulk loads for backfills.
+
+Rows are loaded into a temporary copy of the target table with ``COPY`` on PostgreSQL
+(psycopg 3) and ``executemany`` on other dialects, then merged with set-based SQL
+(see ``ocg.db.upsert.insert_ignore_from``).
+"""
+
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy.orm import Session
+
+from ocg.db.base import Base
+
+
+def create_staging_table(db: Session, model: type[Base]) -> Table:
+    source = model.__table__
+    table = Table(
+        f"stage_{model.__tablename__}",
+        MetaData(),
+        *(Column(column.name, column.type) for column in source.columns),
+        prefixes=["TEMPORARY"],
+    )
+    table.create(db.connection())
+    return table
+
+
+def drop_staging_table(db: Session, table: Table) -> None:
+    table.drop(db.connection())
+
+
+def _copy_value(value: Any) -> Any:
+    return json.dumps(value) if isinstance(value, dict | list) else value
+
+
+def copy_rows(db: Session, table: Table, rows: Sequence[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    connection = db.connection()
+    if connection.dialect.name != "postgresql":
+        db.execute(table.insert(), list(rows))
+        return
+    columns = [column.name for column in table.columns]
+    cursor = connection.connection.cursor()
+    try:
+        with cursor.copy(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([_copy_value(row[column]) for column in columns])
+    finally:
+        cursor.close()
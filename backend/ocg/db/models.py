@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import UTC, datetime
 from uuid import uuid4
 
 from sqlalchemy import (
@@ -11,6 +11,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    func,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,6 +22,10 @@ def _uuid() -> str:
     return str(uuid4())
 
 
+def _utcnow() -> datetime:
+    return datetime.now(tz=UTC)
+
+
 class ConnectorConfig(Base):
     __tablename__ = "connector_config"
     connector_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
@@ -44,6 +49,23 @@ class RawEvent(Base):
     )
 
 
+class IngestQuarantine(Base):
+    """Event whose ``normalize`` raised; its payload stays in ``raw_event`` (same natural key)."""
+
+    __tablename__ = "ingest_quarantine"
+    quarantine_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
+    tool: Mapped[str] = mapped_column(String(64), nullable=False)
+    external_event_id: Mapped[str] = mapped_column(String(256), nullable=False)
+    error_type: Mapped[str] = mapped_column(String(128), nullable=False)
+    error_message: Mapped[str] = mapped_column(Text, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    first_failed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_failed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    __table_args__ = (
+        UniqueConstraint("tool", "external_event_id", name="uq_ingest_quarantine_tool_external"),
+    )
+
+
 class Resource(Base):
     __tablename__ = "resource"
     resource_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
@@ -132,6 +154,9 @@ class TraceEvent(Base):
     entity_tags_json: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
     metadata_json: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
     permission_state: Mapped[str] = mapped_column(String(32), nullable=False)
+    ingested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=_utcnow, server_default=func.now()
+    )
     __table_args__ = (
         UniqueConstraint("tool", "external_event_id", name="uq_trace_event_tool_external"),
     )
@@ -162,7 +187,19 @@ class PersonalTask(Base):
     end_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     label: Mapped[str] = mapped_column(String(256), nullable=False)
     confidence: Mapped[float] = mapped_column(Float, nullable=False)
-    member_trace_event_ids: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+
+
+class PersonalTaskMember(Base):
+    """Events of a personal task, by ``ordinal`` in timeline order."""
+
+    __tablename__ = "personal_task_member"
+    personal_task_id: Mapped[str] = mapped_column(
+        ForeignKey("personal_task.personal_task_id"), primary_key=True
+    )
+    ordinal: Mapped[int] = mapped_column(Integer, primary_key=True)
+    trace_event_id: Mapped[str] = mapped_column(
+        ForeignKey("trace_event.trace_event_id"), nullable=False
+    )
 
 
 class AbstractTrace(Base):
@@ -226,6 +263,11 @@ class KGEntity(Base):
 
 class KGEdge(Base):
     __tablename__ = "kg_edge"
+    __table_args__ = (
+        UniqueConstraint(
+            "src_entity_id", "dst_entity_id", "edge_type", name="uq_kg_edge_src_dst_type"
+        ),
+    )
     edge_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     src_entity_id: Mapped[str] = mapped_column(ForeignKey("kg_entity.entity_id"), nullable=False)
     dst_entity_id: Mapped[str] = mapped_column(ForeignKey("kg_entity.entity_id"), nullable=False)
@@ -0,0 +1,96 @@
+"""Dialect-aware ``INSERT ... ON CONFLICT`` helpers.
+
+Parallel ingest workers can write overlapping rows, so write paths insert with
+``ON CONFLICT`` instead of check-then-insert. PostgreSQL is the system of record;
+SQLite shares the syntax and backs the test suite. Callers pass one bounded chunk
+of rows per call.
+"""
+
+from collections.abc import Sequence
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, Table, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ocg.db.base import Base
+
+
+def _dialect_insert(db: Session, model: type[Base]) -> Any:
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported for dialect '{dialect}'")
+
+
+def insert_ignore(
+    db: Session,
+    model: type[Base],
+    rows: Sequence[dict[str, Any]],
+    *,
+    conflict_columns: Sequence[str] | None = None,
+    returning: Any = None,
+) -> list[Any]:
+    """Multi-row insert that skips rows conflicting with existing ones.
+
+    Without ``conflict_columns`` any unique or primary-key conflict is skipped. When
+    ``returning`` is a column, its values for the rows actually inserted are returned.
+    """
+    if not rows:
+        return []
+    stmt = (
+        _dialect_insert(db, model)
+        .values(list(rows))
+        .on_conflict_do_nothing(index_elements=list(conflict_columns) if conflict_columns else None)
+    )
+    if returning is None:
+        db.execute(stmt)
+        return []
+    return list(db.scalars(stmt.returning(returning)))
+
+
+def upsert(
+    db: Session,
+    model: type[Base],
+    rows: Sequence[dict[str, Any]],
+    *,
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    increment_columns: Sequence[str] = (),
+) -> None:
+    """Multi-row insert that overwrites ``update_columns`` on conflicting rows.
+
+    ``increment_columns`` are bumped by one on conflict instead of overwritten.
+    """
+    if not rows:
+        return
+    stmt = _dialect_insert(db, model).values(list(rows))
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    table = model.__table__
+    set_.update({column: table.c[column] + 1 for column in increment_columns})
+    stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+    db.execute(stmt)
+
+
+def insert_ignore_from(
+    db: Session,
+    model: type[Base],
+    source: Table,
+    *,
+    conflict_columns: Sequence[str],
+) -> int:
+    """``INSERT ... SELECT`` every row of ``source`` into ``model``, skipping conflicts.
+
+    Returns the number of rows inserted.
+    """
+    columns = [column.name for column in source.columns]
+    # SQLite needs a WHERE clause to tell an upsert's ON CONFLICT apart from a join's ON.
+    query = select(*(source.c[column] for column in columns)).where(true())
+    stmt = (
+        _dialect_insert(db, model)
+        .from_select(columns, query)
+        .on_conflict_do_nothing(index_elements=list(conflict_columns))
+    )
+    return cast(CursorResult, db.execute(stmt)).rowcount
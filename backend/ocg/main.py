@@ -1,7 +1,14 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 
-from ocg.api import routes_admin, routes_analytics, routes_health, routes_personal, routes_suggest
+from ocg.api import (
+    routes_admin,
+    routes_analytics,
+    routes_health,
+    routes_ingest,
+    routes_personal,
+    routes_suggest,
+)
 from ocg.core.observability import PrometheusMiddleware
 from ocg.core.security import validate_startup_security
 from ocg.core.settings import get_settings
@@ -54,6 +61,7 @@ def create_app() -> FastAPI:
 
     app.include_router(routes_health.router)
     app.include_router(routes_admin.router)
+    app.include_router(routes_ingest.router)
     app.include_router(routes_personal.router)
     app.include_router(routes_analytics.router)
     app.include_router(routes_suggest.router)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from collections import Counter, defaultdict
 from hashlib import sha256
+from itertools import groupby
+from operator import itemgetter
 
 from sqlalchemy import and_, delete, select
 from sqlalchemy.orm import Session
@@ -14,8 +16,10 @@ from ocg.core.observability import (
 )
 from ocg.core.settings import Settings
 from ocg.db import models
+from ocg.services import personal
 from ocg.services.common import utcnow
 from ocg.services.identity import hash_person
+from ocg.services.permissions import PermissionEvaluator
 
 
 def _step_hash(step: dict) -> str:
@@ -38,16 +42,41 @@ def abstract_opted_in_traces(db: Session) -> int:
     db.execute(delete(models.AbstractTrace))
     created = 0
     for person_id in sorted(opted_in):
-        tasks = db.scalars(
-            select(models.PersonalTask).where(models.PersonalTask.person_id == person_id)
+        # Re-check visibility with the principals of the last timeline refresh, so grants
+        # revoked since then no longer feed aggregates. No refresh yet: nothing to share.
+        checkpoint = personal.timeline_checkpoint(db, person_id)
+        if not checkpoint or checkpoint.get("principal_ids") is None:
+            continue
+        # One ordered join per person: tasks by start, members by ordinal (= timeline order).
+        rows = db.execute(
+            select(models.PersonalTask, models.TraceEvent)
+            .join(
+                models.PersonalTaskMember,
+                models.PersonalTaskMember.personal_task_id == models.PersonalTask.personal_task_id,
+            )
+            .join(
+                models.TraceEvent,
+                models.TraceEvent.trace_event_id == models.PersonalTaskMember.trace_event_id,
+            )
+            .where(models.PersonalTask.person_id == person_id)
+            .order_by(
+                models.PersonalTask.start_time,
+                models.PersonalTask.personal_task_id,
+                models.PersonalTaskMember.ordinal,
+            )
         ).all()
-        for task in tasks:
-            events = db.scalars(
-                select(models.TraceEvent).where(
-                    models.TraceEvent.trace_event_id.in_(task.member_trace_event_ids)
-                )
-            ).all()
-            events = sorted(events, key=lambda e: (e.event_time, e.trace_event_id))
+        visible = {
+            event.trace_event_id
+            for event in PermissionEvaluator.filter_visible_events(
+                db,
+                events=[event for _, event in rows],
+                principal_ids=checkpoint["principal_ids"],
+            )
+        }
+        for task, members in groupby(rows, key=itemgetter(0)):
+            events = [event for _, event in members if event.trace_event_id in visible]
+            if not events:
+                continue
             steps = []
             prev_time = None
             for event in events:
@@ -1,5 +1,22 @@
+from collections.abc import Iterator, Sequence
 from datetime import UTC, datetime
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Keeps IN lists and multi-row VALUES well under driver parameter limits.
+BULK_CHUNK_SIZE = 500
 
 
 def utcnow() -> datetime:
     return datetime.now(tz=UTC)
+
+
+def chunked(items: Sequence[T], size: int = BULK_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def as_text(value: bytes | str) -> str:
+    """Redis replies are ``bytes`` unless the client decodes responses."""
+    return value.decode() if isinstance(value, bytes) else value
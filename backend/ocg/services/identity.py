@@ -1,102 +1,121 @@
-from collections import defaultdict
+from datetime import datetime
 from hashlib import sha256
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ocg.db import models
-from ocg.services.common import utcnow
+from ocg.db.upsert import insert_ignore
+from ocg.services.common import chunked, utcnow
+
+USER_GROUP = "group:user"
+
+
+def _person_row(person_id: str, email: str | None, now: datetime) -> dict:
+    return {
+        "person_id": person_id,
+        "primary_email": email,
+        "display_name": person_id,
+        "created_at": now,
+    }
+
+
+def _user_principal_row(person_id: str, now: datetime) -> dict:
+    return {
+        "principal_id": person_id,
+        "principal_type": "user",
+        "person_id": person_id,
+        "external_group_ref": None,
+        "created_at": now,
+    }
 
 
 def ensure_person_and_principal(db: Session, person_id: str, email: str | None = None) -> None:
-    pending_person = any(
-        isinstance(pending, models.Person) and pending.person_id == person_id for pending in db.new
-    )
-    person = db.get(models.Person, person_id)
-    if not person and not pending_person:
-        db.add(
-            models.Person(
-                person_id=person_id,
-                primary_email=email,
-                display_name=person_id,
-                created_at=utcnow(),
-            )
-        )
-    pending_principal = any(
-        isinstance(pending, models.Principal) and pending.principal_id == person_id
-        for pending in db.new
-    )
-    principal = db.get(models.Principal, person_id)
-    if not principal and not pending_principal:
-        db.add(
-            models.Principal(
-                principal_id=person_id,
-                principal_type="user",
-                person_id=person_id,
-                external_group_ref=None,
-                created_at=utcnow(),
-            )
-        )
+    now = utcnow()
+    insert_ignore(db, models.Person, [_person_row(person_id, email, now)])
+    insert_ignore(db, models.Principal, [_user_principal_row(person_id, now)])
 
 
 def resolve_identities(db: Session) -> dict[str, int]:
-    rows = db.scalars(select(models.TraceEvent)).all()
-    created = 0
-    for event in rows:
-        actor = event.actor_principal_id
-        if not actor:
-            continue
-        email = f"{actor}@ocg.local"
-        ensure_person_and_principal(db, actor, email=email)
-        identity = db.scalar(
-            select(models.Identity).where(
-                models.Identity.tool == event.tool, models.Identity.external_user_id == actor
+    actors = sorted(
+        {
+            (row.tool, row.actor_principal_id)
+            for row in db.execute(
+                select(models.TraceEvent.tool, models.TraceEvent.actor_principal_id)
+                .where(models.TraceEvent.actor_principal_id.is_not(None))
+                .distinct()
             )
+            if row.actor_principal_id
+        }
+    )
+    now = utcnow()
+    for chunk in chunked(sorted({actor for _, actor in actors})):
+        insert_ignore(
+            db,
+            models.Person,
+            [_person_row(actor, f"{actor}@ocg.local", now) for actor in chunk],
+            conflict_columns=("person_id",),
+        )
+        insert_ignore(
+            db,
+            models.Principal,
+            [_user_principal_row(actor, now) for actor in chunk],
+            conflict_columns=("principal_id",),
         )
-        if not identity:
-            db.add(
-                models.Identity(
-                    tool=event.tool,
-                    external_user_id=actor,
-                    email=email,
-                    display_name=actor,
-                    person_id=actor,
-                    confidence=0.7,
-                    created_at=utcnow(),
-                )
+    created = 0
+    for chunk in chunked(actors):
+        created += len(
+            insert_ignore(
+                db,
+                models.Identity,
+                [
+                    {
+                        "tool": tool,
+                        "external_user_id": actor,
+                        "email": f"{actor}@ocg.local",
+                        "display_name": actor,
+                        "person_id": actor,
+                        "confidence": 0.7,
+                        "created_at": now,
+                    }
+                    for tool, actor in chunk
+                ],
+                conflict_columns=("tool", "external_user_id"),
+                returning=models.Identity.identity_id,
             )
-            created += 1
+        )
 
     # Baseline group membership from role groups.
-    groups: dict[str, set[str]] = defaultdict(set)
-    principals = db.scalars(select(models.Principal)).all()
-    for principal in principals:
-        if principal.principal_type == "user":
-            groups["group:user"].add(principal.principal_id)
-    for group, members in groups.items():
-        if not db.get(models.Principal, group):
-            db.add(
-                models.Principal(
-                    principal_id=group,
-                    principal_type="group",
-                    person_id=None,
-                    external_group_ref=group,
-                    created_at=utcnow(),
-                )
-            )
-        for member in members:
-            exists = db.get(
-                models.PrincipalMembership,
-                {"group_principal_id": group, "member_principal_id": member},
-            )
-            if not exists:
-                db.add(
-                    models.PrincipalMembership(
-                        group_principal_id=group,
-                        member_principal_id=member,
-                        created_at=utcnow(),
-                    )
-                )
+    members = list(
+        db.scalars(
+            select(models.Principal.principal_id).where(models.Principal.principal_type == "user")
+        )
+    )
+    if members:
+        insert_ignore(
+            db,
+            models.Principal,
+            [
+                {
+                    "principal_id": USER_GROUP,
+                    "principal_type": "group",
+                    "person_id": None,
+                    "external_group_ref": USER_GROUP,
+                    "created_at": now,
+                }
+            ],
+            conflict_columns=("principal_id",),
+        )
+    for chunk in chunked(members):
+        insert_ignore(
+            db,
+            models.PrincipalMembership,
+            [
+                {"group_principal_id": USER_GROUP, "member_principal_id": member, "created_at": now}
+                for member in chunk
+            ],
+            conflict_columns=("group_principal_id", "member_principal_id"),
+        )
     db.commit()
     return {"identities_created": created}
 
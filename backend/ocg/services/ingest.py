@@ -1,212 +1,1059 @@
-from datetime import UTC
+import math
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from itertools import repeat
+from typing import TypeVar
+from uuid import uuid4
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, delete, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from ocg.connectors.base import Connector, ConnectorEvent, ResourceDelta
-from ocg.core.observability import CONNECTOR_FETCH_DURATION, INGEST_EVENTS_TOTAL
+from ocg.connectors.base import (
+    Connector,
+    ConnectorEvent,
+    EventPage,
+    NormalizedTrace,
+    ResourceDelta,
+)
+from ocg.connectors.fetch import PrefetchedPages, prefetch_pages
+from ocg.connectors.registry import CONNECTOR_REGISTRY
+from ocg.core.observability import (
+    CONNECTOR_ERRORS,
+    CONNECTOR_FETCH_DURATION,
+    INGEST_EVENTS_TOTAL,
+)
+from ocg.core.settings import get_settings
 from ocg.db import models
-from ocg.services.common import utcnow
+from ocg.db.bulk import copy_rows, create_staging_table, drop_staging_table
+from ocg.db.upsert import insert_ignore, insert_ignore_from, upsert
+from ocg.services.common import chunked, utcnow
+from ocg.services.reliability import circuit_breaker
 
+T = TypeVar("T")
+ResourceKey = tuple[str, str, str]
+NormalizedBatch = list[tuple[NormalizedTrace, ResourceDelta | None]]
+# (external_event_id, error_type, error_message) of an event whose normalize raised.
+NormalizeFailure = tuple[str, str, str]
 
-def _ensure_principal(db: Session, principal_id: str) -> None:
-    for pending in db.new:
-        if isinstance(pending, models.Principal) and pending.principal_id == principal_id:
-            return
-    principal = db.get(models.Principal, principal_id)
-    if principal:
-        return
+MAX_QUARANTINE_ERROR_CHARS = 2000
+
+
+def _resource_key(delta: ResourceDelta) -> ResourceKey:
+    return (delta.tool, delta.resource_type, delta.external_id)
+
+
+def _principal_row(principal_id: str) -> dict:
     principal_type = "group" if principal_id.startswith("group:") else "user"
-    db.add(
-        models.Principal(
-            principal_id=principal_id,
-            principal_type=principal_type,
-            person_id=principal_id if principal_type == "user" else None,
-            external_group_ref=principal_id if principal_type == "group" else None,
-            created_at=utcnow(),
+    return {
+        "principal_id": principal_id,
+        "principal_type": principal_type,
+        "person_id": principal_id if principal_type == "user" else None,
+        "external_group_ref": principal_id if principal_type == "group" else None,
+        "created_at": utcnow(),
+    }
+
+
+def _ensure_principals(db: Session, principal_ids: Iterable[str]) -> None:
+    for chunk in chunked(sorted(set(principal_ids))):
+        insert_ignore(
+            db, models.Principal, [_principal_row(principal_id) for principal_id in chunk]
         )
+
+
+def _resource_changed(resource: models.Resource, delta: ResourceDelta) -> bool:
+    return (
+        resource.url != delta.url
+        or resource.title != delta.title
+        or resource.permission_state != delta.permission_state
     )
 
 
-def _upsert_resource(db: Session, delta: ResourceDelta) -> models.Resource:
-    resource = db.scalar(
-        select(models.Resource).where(
-            and_(
-                models.Resource.tool == delta.tool,
-                models.Resource.resource_type == delta.resource_type,
-                models.Resource.external_id == delta.external_id,
+def _resource_row(delta: ResourceDelta, now: datetime) -> dict:
+    return {
+        "tool": delta.tool,
+        "resource_type": delta.resource_type,
+        "external_id": delta.external_id,
+        "url": delta.url,
+        "title": delta.title,
+        "permission_state": delta.permission_state,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _load_resources(db: Session, keys: list[ResourceKey]) -> dict[ResourceKey, models.Resource]:
+    resources: dict[ResourceKey, models.Resource] = {}
+    for chunk in chunked(keys):
+        for resource in db.scalars(
+            select(models.Resource).where(
+                tuple_(
+                    models.Resource.tool,
+                    models.Resource.resource_type,
+                    models.Resource.external_id,
+                ).in_(chunk)
             )
-        )
-    )
+        ):
+            resources[(resource.tool, resource.resource_type, resource.external_id)] = resource
+    return resources
+
+
+def _upsert_resources(
+    db: Session, deltas: Iterable[ResourceDelta], stats: Counter[str]
+) -> dict[ResourceKey, models.Resource]:
+    """Insert new resources and update changed ones; unchanged rows get no UPDATE.
+
+    ``stats`` accumulates ``resources_inserted``/``resources_updated``/``resources_unchanged``.
+    """
+    # Later deltas win, matching what sequential per-delta upserts would leave behind.
+    latest: dict[ResourceKey, ResourceDelta] = {}
+    for delta in deltas:
+        latest[_resource_key(delta)] = delta
+    if not latest:
+        return {}
+
+    resources = _load_resources(db, list(latest))
+    missing = [key for key in latest if key not in resources]
     now = utcnow()
-    if resource is None:
-        resource = models.Resource(
-            tool=delta.tool,
-            resource_type=delta.resource_type,
-            external_id=delta.external_id,
-            url=delta.url,
-            title=delta.title,
-            permission_state=delta.permission_state,
-            created_at=now,
-            updated_at=now,
+    inserted: set[str] = set()
+    for chunk in chunked(missing):
+        inserted.update(
+            insert_ignore(
+                db,
+                models.Resource,
+                [_resource_row(latest[key], now) for key in chunk],
+                conflict_columns=("tool", "resource_type", "external_id"),
+                returning=models.Resource.resource_id,
+            )
         )
-        db.add(resource)
-        db.flush()
-    else:
-        resource.url = delta.url
-        resource.title = delta.title
-        resource.permission_state = delta.permission_state
-        resource.updated_at = now
-    return resource
-
-
-def _sync_resource_acl(
-    db: Session, resource_id: str, principal_ids: list[str], source: str
-) -> None:
-    for principal_id in principal_ids:
-        _ensure_principal(db, principal_id)
-        duplicate_pending = any(
-            isinstance(pending, models.ResourceACL)
-            and pending.resource_id == resource_id
-            and pending.principal_id == principal_id
-            and pending.revoked_at is None
-            for pending in db.new
-        )
-        if duplicate_pending:
-            continue
-        existing = db.scalar(
-            select(models.ResourceACL).where(
-                and_(
-                    models.ResourceACL.resource_id == resource_id,
-                    models.ResourceACL.principal_id == principal_id,
+    if missing:
+        # Rows skipped on conflict were written by a concurrent worker; load them too.
+        resources.update(_load_resources(db, missing))
+
+    for key, delta in latest.items():
+        resource = resources[key]
+        if resource.resource_id in inserted:
+            stats["resources_inserted"] += 1
+        elif _resource_changed(resource, delta):
+            resource.url = delta.url
+            resource.title = delta.title
+            resource.permission_state = delta.permission_state
+            resource.updated_at = now
+            stats["resources_updated"] += 1
+        else:
+            stats["resources_unchanged"] += 1
+    db.flush()
+    return resources
+
+
+def _active_acl_pairs(db: Session, resource_ids: Iterable[str]) -> set[tuple[str, str]]:
+    active: set[tuple[str, str]] = set()
+    for chunk in chunked(sorted(set(resource_ids))):
+        active.update(
+            (row.resource_id, row.principal_id)
+            for row in db.execute(
+                select(models.ResourceACL.resource_id, models.ResourceACL.principal_id).where(
+                    models.ResourceACL.resource_id.in_(chunk),
                     models.ResourceACL.revoked_at.is_(None),
                 )
             )
         )
-        if not existing:
-            db.add(
-                models.ResourceACL(
-                    resource_id=resource_id,
-                    principal_id=principal_id,
-                    acl_source=source,
-                    granted_at=utcnow(),
-                    revoked_at=None,
+    return active
+
+
+def _sync_resource_acls(
+    db: Session, desired: dict[str, set[str]], source: str, *, revoke: bool
+) -> tuple[int, int]:
+    """Reconcile active ACL rows for ``{resource_id: principal_ids}`` with set differences.
+
+    Grants are written with one multi-row insert per chunk. With ``revoke`` the listed
+    principal set is authoritative and active rows outside it get ``revoked_at`` set in bulk;
+    without it the sync is additive (event-level deltas only carry partial ACLs).
+    Returns ``(granted, revoked)``.
+    """
+    if not desired:
+        return 0, 0
+    wanted = {
+        (resource_id, principal_id)
+        for resource_id, principal_ids in desired.items()
+        for principal_id in principal_ids
+    }
+    active = _active_acl_pairs(db, desired)
+    grants = sorted(wanted - active)
+    revokes = sorted(active - wanted) if revoke else []
+
+    now = utcnow()
+    if grants:
+        # resource_acl has no natural unique key (granted_at is part of the PK); a grant
+        # raced by two workers leaves two active rows, which revocation retires together.
+        _ensure_principals(db, {principal_id for _, principal_id in grants})
+        rows = [
+            {
+                "resource_id": resource_id,
+                "principal_id": principal_id,
+                "acl_source": source,
+                "granted_at": now,
+                "revoked_at": None,
+            }
+            for resource_id, principal_id in grants
+        ]
+        for batch in chunked(rows):
+            db.execute(insert(models.ResourceACL), batch)
+    for chunk in chunked(revokes):
+        db.execute(
+            update(models.ResourceACL)
+            .where(
+                tuple_(models.ResourceACL.resource_id, models.ResourceACL.principal_id).in_(chunk),
+                models.ResourceACL.revoked_at.is_(None),
+            )
+            .values(revoked_at=now)
+        )
+    return len(grants), len(revokes)
+
+
+def _known_acl_grants(
+    deltas: Iterable[ResourceDelta], resources: dict[ResourceKey, models.Resource]
+) -> dict[str, set[str]]:
+    grants: dict[str, set[str]] = {}
+    for delta in deltas:
+        if delta.permission_state != "KNOWN":
+            continue
+        resource_id = resources[_resource_key(delta)].resource_id
+        grants.setdefault(resource_id, set()).update(delta.acl_principal_ids)
+    return grants
+
+
+def _existing_external_ids(
+    db: Session,
+    model: type[models.RawEvent] | type[models.TraceEvent],
+    tool: str,
+    external_ids: Iterable[str],
+) -> set[str]:
+    found: set[str] = set()
+    for chunk in chunked(sorted(set(external_ids))):
+        found.update(
+            db.scalars(
+                select(model.external_event_id).where(
+                    model.tool == tool, model.external_event_id.in_(chunk)
                 )
             )
+        )
+    return found
 
 
-def ingest_connector_batch(db: Session, connector: Connector, config: dict) -> dict[str, int]:
-    connector.validate(config)
-    with CONNECTOR_FETCH_DURATION.labels(tool=connector.tool).time():
-        events = connector.fetch_events(config)
-        resources = connector.fetch_acls(config)
-
-    for acl_delta in resources:
-        resource_row = _upsert_resource(db, acl_delta)
-        if acl_delta.permission_state == "KNOWN":
-            _sync_resource_acl(
+def _raw_event_row(event: ConnectorEvent) -> dict:
+    return {
+        "tool": event.tool,
+        "external_event_id": event.external_event_id,
+        "fetched_at": event.fetched_at,
+        "payload_json": event.payload_json,
+        "permission_state": event.permission_state,
+    }
+
+
+def _trace_event_row(
+    tool: str, normalized: NormalizedTrace, resource: models.Resource | None
+) -> dict:
+    return {
+        "tool": tool,
+        "external_event_id": normalized.external_event_id,
+        "tool_family": normalized.tool_family,
+        "action_type": normalized.action_type,
+        "event_time": normalized.event_time.astimezone(UTC),
+        "actor_principal_id": normalized.actor_principal_id,
+        "resource_id": resource.resource_id if resource else None,
+        "related_resource_ids": [":".join(ref) for ref in normalized.related_resource_refs],
+        "entity_tags_json": normalized.entity_tags_json,
+        "metadata_json": normalized.metadata_json,
+        "permission_state": normalized.permission_state,
+        "ingested_at": utcnow(),
+    }
+
+
+def _resource_counts(stats: Counter[str]) -> dict[str, int]:
+    return {
+        key: stats[key]
+        for key in ("resources_inserted", "resources_updated", "resources_unchanged")
+    }
+
+
+def _fetch_pages(tool: str, pages: Iterable[T]) -> Iterator[T]:
+    """Time each page fetch and pass it through the tool's circuit breaker."""
+    iterator = iter(circuit_breaker(tool).guard(pages))
+    while True:
+        with CONNECTOR_FETCH_DURATION.labels(tool=tool).time():
+            page = next(iterator, None)
+        if page is None:
+            return
+        yield page
+
+
+def _apply_resource_deltas(
+    db: Session,
+    deltas: list[ResourceDelta],
+    source: str,
+    stats: Counter[str],
+    *,
+    revoke: bool,
+) -> tuple[int, int]:
+    resource_rows = _upsert_resources(db, deltas, stats)
+    return _sync_resource_acls(db, _known_acl_grants(deltas, resource_rows), source, revoke=revoke)
+
+
+def _normalize_isolated(
+    connector: Connector, events: Iterable[ConnectorEvent]
+) -> tuple[NormalizedBatch, list[NormalizeFailure]]:
+    """Normalize events one at a time so a malformed payload cannot fail its whole page."""
+    normalized_batch: NormalizedBatch = []
+    failures: list[NormalizeFailure] = []
+    for event in events:
+        try:
+            normalized_batch.append(connector.normalize(event))
+        except Exception as exc:  # noqa: BLE001 - quarantined instead of failing the page
+            failures.append(
+                (event.external_event_id, type(exc).__name__, str(exc)[:MAX_QUARANTINE_ERROR_CHARS])
+            )
+    return normalized_batch, failures
+
+
+def _quarantine_events(db: Session, tool: str, failures: list[NormalizeFailure]) -> int:
+    """Record failed events in ``ingest_quarantine``; a repeat failure bumps ``attempts``.
+
+    The payload is not copied: it stays in ``raw_event`` under the same natural key.
+    """
+    now = utcnow()
+    rows = {
+        external_event_id: {
+            "tool": tool,
+            "external_event_id": external_event_id,
+            "error_type": error_type,
+            "error_message": error_message,
+            "attempts": 1,
+            "first_failed_at": now,
+            "last_failed_at": now,
+        }
+        for external_event_id, error_type, error_message in failures
+    }
+    for chunk in chunked(list(rows.values())):
+        upsert(
+            db,
+            models.IngestQuarantine,
+            chunk,
+            conflict_columns=("tool", "external_event_id"),
+            update_columns=("error_type", "error_message", "last_failed_at"),
+            increment_columns=("attempts",),
+        )
+    if rows:
+        CONNECTOR_ERRORS.labels(tool=tool, reason="normalize_failed").inc(len(rows))
+    return len(rows)
+
+
+def _release_quarantined(db: Session, tool: str, external_ids: Iterable[str]) -> None:
+    for chunk in chunked(sorted(set(external_ids))):
+        db.execute(
+            delete(models.IngestQuarantine).where(
+                models.IngestQuarantine.tool == tool,
+                models.IngestQuarantine.external_event_id.in_(chunk),
+            )
+        )
+
+
+def _ingest_event_page(
+    db: Session, connector: Connector, events: list[ConnectorEvent], stats: Counter[str]
+) -> tuple[int, int, int]:
+    existing_raw = _existing_external_ids(
+        db, models.RawEvent, connector.tool, (event.external_event_id for event in events)
+    )
+    fresh: dict[str, ConnectorEvent] = {}
+    for event in events:
+        if event.external_event_id in existing_raw or event.external_event_id in fresh:
+            continue
+        fresh[event.external_event_id] = event
+
+    normalized_batch, failures = _normalize_isolated(connector, fresh.values())
+    deltas = [delta for _, delta in normalized_batch if delta]
+    resource_rows = _upsert_resources(db, deltas, stats)
+    _sync_resource_acls(db, _known_acl_grants(deltas, resource_rows), connector.tool, revoke=False)
+
+    # The prefetch above skips normalization for known events; ON CONFLICT keeps the
+    # writes idempotent when a concurrent worker commits the same events in between.
+    raw_written = 0
+    for chunk in chunked([_raw_event_row(event) for event in fresh.values()]):
+        raw_written += len(
+            insert_ignore(
                 db,
-                resource_row.resource_id,
-                acl_delta.acl_principal_ids,
-                connector.tool,
+                models.RawEvent,
+                chunk,
+                conflict_columns=("tool", "external_event_id"),
+                returning=models.RawEvent.external_event_id,
             )
+        )
 
+    trace_rows: dict[str, dict] = {}
+    for normalized, delta in normalized_batch:
+        if normalized.external_event_id in trace_rows:
+            continue
+        resource = resource_rows[_resource_key(delta)] if delta else None
+        trace_rows[normalized.external_event_id] = _trace_event_row(
+            connector.tool, normalized, resource
+        )
+    traces_written = 0
+    for chunk in chunked(list(trace_rows.values())):
+        traces_written += len(
+            insert_ignore(
+                db,
+                models.TraceEvent,
+                chunk,
+                conflict_columns=("tool", "external_event_id"),
+                returning=models.TraceEvent.external_event_id,
+            )
+        )
+    # Raw rows of failed events are kept above so they can be re-driven without a refetch.
+    quarantined = _quarantine_events(db, connector.tool, failures)
+    return raw_written, traces_written, quarantined
+
+
+def _cursor_checkpoint_name(tool: str) -> str:
+    return f"connector_cursor:{tool}"
+
+
+def load_connector_cursors(db: Session, tool: str) -> dict[str, str]:
+    checkpoint = db.scalar(
+        select(models.JobCheckpoint.checkpoint_json).where(
+            models.JobCheckpoint.job_name == _cursor_checkpoint_name(tool)
+        )
+    )
+    if checkpoint is None:
+        return {}
+    return dict(checkpoint.get("cursors", {}))
+
+
+def _advance_connector_cursors(db: Session, tool: str, cursors: dict[str, str]) -> None:
+    """Stage the cursor update in the current transaction so it commits with the page."""
+    upsert(
+        db,
+        models.JobCheckpoint,
+        [
+            {
+                "job_name": _cursor_checkpoint_name(tool),
+                "checkpoint_json": {"cursors": dict(cursors)},
+                "updated_at": utcnow(),
+            }
+        ],
+        conflict_columns=("job_name",),
+        update_columns=("checkpoint_json", "updated_at"),
+    )
+
+
+def ingest_connector_batch(
+    db: Session,
+    connector: Connector,
+    config: dict,
+    *,
+    page_size: int | None = None,
+    acl_pages: Iterable[list[ResourceDelta]] | None = None,
+    event_pages: Iterable[EventPage] | None = None,
+) -> dict[str, int]:
+    """Ingest one connector run, committing after every ACL and event page.
+
+    Each page commit is self-contained and idempotent, and advances the per-scope cursors
+    stored in ``job_checkpoint`` atomically with the page, so the next run only fetches
+    events after the last committed page. Events whose ``normalize`` raises are quarantined
+    (see ``redrive_quarantined``) and the rest of their page commits. ``acl_pages`` and
+    ``event_pages`` supply pages that were already fetched (see ``sync_connectors``); event
+    pages must start from the cursors in ``load_connector_cursors``.
+    """
+    connector.validate(config)
+    size = page_size or get_settings().ingest_page_size
+    # Make pending ORM rows from earlier work visible to the set-based lookups below.
+    db.flush()
+
+    if acl_pages is None:
+        acl_pages = _fetch_pages(connector.tool, connector.iter_acl_pages(config, page_size=size))
+    resource_stats: Counter[str] = Counter()
+    resources_seen = 0
+    for deltas in acl_pages:
+        # Revocations are owned by sync_permissions; ingest only adds grants.
+        _apply_resource_deltas(db, deltas, connector.tool, resource_stats, revoke=False)
+        db.commit()
+        resources_seen += len(deltas)
+
+    cursors = load_connector_cursors(db, connector.tool)
     raw_written = 0
     traces_written = 0
-    for event in events:
-        if _raw_exists(db, connector.tool, event.external_event_id):
-            continue
-        raw_written += 1
-        _store_raw_event(db, event)
-        normalized, normalized_delta = connector.normalize(event)
-        resource_for_trace: models.Resource | None = None
-        if normalized_delta:
-            resource_for_trace = _upsert_resource(db, normalized_delta)
-            if normalized_delta.permission_state == "KNOWN":
-                _sync_resource_acl(
-                    db,
-                    resource_for_trace.resource_id,
-                    normalized_delta.acl_principal_ids,
+    quarantined = 0
+    pages = 0
+    if event_pages is None:
+        event_pages = _fetch_pages(
+            connector.tool,
+            connector.iter_event_pages(config, page_size=size, cursors=dict(cursors)),
+        )
+    for page in event_pages:
+        page_raw, page_traces, page_quarantined = _ingest_event_page(
+            db, connector, page.events, resource_stats
+        )
+        if page.cursors:
+            cursors.update(page.cursors)
+            _advance_connector_cursors(db, connector.tool, cursors)
+        db.commit()
+        pages += 1
+        raw_written += page_raw
+        traces_written += page_traces
+        quarantined += page_quarantined
+        if page_traces:
+            INGEST_EVENTS_TOTAL.labels(tool=connector.tool).inc(page_traces)
+    return {
+        "raw_event": raw_written,
+        "trace_event": traces_written,
+        "resource_acl": resources_seen,
+        "quarantined": quarantined,
+        "pages": pages,
+        **_resource_counts(resource_stats),
+    }
+
+
+BACKFILL_STAGES = ("fetch", "normalize", "resources", "stage", "merge")
+
+
+@contextmanager
+def _stage_timer(seconds: defaultdict[str, float], stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds[stage] += time.perf_counter() - started
+
+
+def _stage_report(
+    rows: Counter[str], seconds: defaultdict[str, float]
+) -> dict[str, dict[str, float]]:
+    return {
+        stage: {
+            "rows": rows[stage],
+            "seconds": round(seconds[stage], 3),
+            "rows_per_second": round(rows[stage] / seconds[stage], 1) if seconds[stage] else 0.0,
+        }
+        for stage in BACKFILL_STAGES
+    }
+
+
+def backfill_connector(
+    db: Session, connector: Connector, config: dict, *, page_size: int | None = None
+) -> dict:
+    """Load a connector's full event history through staging tables.
+
+    Each page is normalized, copied into temporary ``raw_event``/``trace_event`` staging
+    tables (``COPY`` on PostgreSQL) and merged with ``INSERT ... SELECT ... ON CONFLICT DO
+    NOTHING``, then committed. Cursors are only recorded for scopes that have none yet, so
+    a later incremental ingest starts after the history without moving cursors backwards.
+    The result reports rows and rows/sec for every stage in ``BACKFILL_STAGES``.
+    """
+    connector.validate(config)
+    size = page_size or get_settings().ingest_page_size
+    db.flush()
+
+    rows: Counter[str] = Counter()
+    seconds: defaultdict[str, float] = defaultdict(float)
+    resource_stats: Counter[str] = Counter()
+    known_cursors = load_connector_cursors(db, connector.tool)
+    cursors = dict(known_cursors)
+    raw_written = 0
+    traces_written = 0
+    quarantined = 0
+    pages = 0
+    event_pages = circuit_breaker(connector.tool).guard(
+        connector.iter_event_pages(config, page_size=size)
+    )
+    while True:
+        with _stage_timer(seconds, "fetch"):
+            page = next(event_pages, None)
+        if page is None:
+            break
+        rows["fetch"] += len(page.events)
+
+        with _stage_timer(seconds, "normalize"):
+            normalized_batch, failures = _normalize_isolated(connector, page.events)
+        rows["normalize"] += len(normalized_batch)
+
+        with _stage_timer(seconds, "resources"):
+            deltas = [delta for _, delta in normalized_batch if delta]
+            resource_rows = _upsert_resources(db, deltas, resource_stats)
+            _sync_resource_acls(
+                db, _known_acl_grants(deltas, resource_rows), connector.tool, revoke=False
+            )
+        rows["resources"] += len(deltas)
+
+        raw_rows = [
+            {"raw_event_id": str(uuid4()), **_raw_event_row(event)} for event in page.events
+        ]
+        trace_rows = [
+            {
+                "trace_event_id": str(uuid4()),
+                **_trace_event_row(
                     connector.tool,
-                )
+                    normalized,
+                    resource_rows[_resource_key(delta)] if delta else None,
+                ),
+            }
+            for normalized, delta in normalized_batch
+        ]
+        with _stage_timer(seconds, "stage"):
+            raw_stage = create_staging_table(db, models.RawEvent)
+            trace_stage = create_staging_table(db, models.TraceEvent)
+            copy_rows(db, raw_stage, raw_rows)
+            copy_rows(db, trace_stage, trace_rows)
+        rows["stage"] += len(raw_rows) + len(trace_rows)
 
-        if not _trace_exists(db, connector.tool, normalized.external_event_id):
-            traces_written += 1
-            db.add(
-                models.TraceEvent(
-                    tool=connector.tool,
-                    external_event_id=normalized.external_event_id,
-                    tool_family=normalized.tool_family,
-                    action_type=normalized.action_type,
-                    event_time=normalized.event_time.astimezone(UTC),
-                    actor_principal_id=normalized.actor_principal_id,
-                    resource_id=resource_for_trace.resource_id if resource_for_trace else None,
-                    related_resource_ids=[
-                        ":".join(ref) for ref in normalized.related_resource_refs
-                    ],
-                    entity_tags_json=normalized.entity_tags_json,
-                    metadata_json=normalized.metadata_json,
-                    permission_state=normalized.permission_state,
-                )
+        with _stage_timer(seconds, "merge"):
+            conflict_columns = ("tool", "external_event_id")
+            page_raw = insert_ignore_from(
+                db, models.RawEvent, raw_stage, conflict_columns=conflict_columns
             )
+            page_traces = insert_ignore_from(
+                db, models.TraceEvent, trace_stage, conflict_columns=conflict_columns
+            )
+            drop_staging_table(db, raw_stage)
+            drop_staging_table(db, trace_stage)
+            for scope, position in page.cursors.items():
+                if scope not in known_cursors:
+                    cursors[scope] = position
+            if cursors != known_cursors:
+                _advance_connector_cursors(db, connector.tool, cursors)
+            page_quarantined = _quarantine_events(db, connector.tool, failures)
+            db.commit()
+        rows["merge"] += page_raw + page_traces
 
-    db.commit()
-    if traces_written:
-        INGEST_EVENTS_TOTAL.labels(tool=connector.tool).inc(traces_written)
-    return {"raw_event": raw_written, "trace_event": traces_written, "resource_acl": len(resources)}
+        pages += 1
+        raw_written += page_raw
+        traces_written += page_traces
+        quarantined += page_quarantined
+        if page_traces:
+            INGEST_EVENTS_TOTAL.labels(tool=connector.tool).inc(page_traces)
+    return {
+        "raw_event": raw_written,
+        "trace_event": traces_written,
+        "quarantined": quarantined,
+        "pages": pages,
+        **_resource_counts(resource_stats),
+        "stages": _stage_report(rows, seconds),
+    }
 
 
-def _raw_exists(db: Session, tool: str, external_event_id: str) -> bool:
-    return (
-        db.scalar(
-            select(models.RawEvent.raw_event_id).where(
-                and_(
-                    models.RawEvent.tool == tool,
-                    models.RawEvent.external_event_id == external_event_id,
-                )
-            )
+TRACE_DERIVED_COLUMNS = (
+    "tool_family",
+    "action_type",
+    "event_time",
+    "actor_principal_id",
+    "resource_id",
+    "related_resource_ids",
+    "entity_tags_json",
+    "metadata_json",
+    "permission_state",
+)
+
+
+def _replay_checkpoint_name(tool: str) -> str:
+    return f"replay:{tool}"
+
+
+def _connector_event(row: models.RawEvent) -> ConnectorEvent:
+    return ConnectorEvent(
+        tool=row.tool,
+        external_event_id=row.external_event_id,
+        fetched_at=row.fetched_at,
+        payload_json=row.payload_json,
+        permission_state=row.permission_state,
+    )
+
+
+def _normalize_chunk(
+    tool: str, events: list[ConnectorEvent]
+) -> tuple[NormalizedBatch, list[NormalizeFailure]]:
+    # Runs in replay worker processes, which resolve the connector by tool name.
+    return _normalize_isolated(CONNECTOR_REGISTRY[tool], events)
+
+
+def _upsert_normalized(
+    db: Session, tool: str, normalized_batch: NormalizedBatch, stats: Counter[str]
+) -> int:
+    """Write re-derived traces over existing ones, keeping ``trace_event_id`` stable."""
+    deltas = [delta for _, delta in normalized_batch if delta]
+    resource_rows = _upsert_resources(db, deltas, stats)
+    _sync_resource_acls(db, _known_acl_grants(deltas, resource_rows), tool, revoke=False)
+    trace_rows: dict[str, dict] = {}
+    for normalized, delta in normalized_batch:
+        resource = resource_rows[_resource_key(delta)] if delta else None
+        trace_rows[normalized.external_event_id] = _trace_event_row(tool, normalized, resource)
+    for chunk in chunked(list(trace_rows.values())):
+        upsert(
+            db,
+            models.TraceEvent,
+            chunk,
+            conflict_columns=("tool", "external_event_id"),
+            # A fresh ingested_at puts rewritten traces back in personal timeline refresh windows.
+            update_columns=(*TRACE_DERIVED_COLUMNS, "ingested_at"),
         )
-        is not None
+    return len(trace_rows)
+
+
+def _renormalize_page(
+    db: Session,
+    connector: Connector,
+    events: list[ConnectorEvent],
+    stats: Counter[str],
+    executor: ProcessPoolExecutor | None = None,
+    worker_count: int = 1,
+) -> tuple[int, int]:
+    """Re-derive traces for stored events; failures stay (or become) quarantined."""
+    if executor is None:
+        normalized_batch, failures = _normalize_isolated(connector, events)
+    else:
+        step = math.ceil(len(events) / worker_count)
+        chunks = [events[start : start + step] for start in range(0, len(events), step)]
+        normalized_batch, failures = [], []
+        for chunk_batch, chunk_failures in executor.map(
+            _normalize_chunk, repeat(connector.tool), chunks
+        ):
+            normalized_batch.extend(chunk_batch)
+            failures.extend(chunk_failures)
+    traces_written = _upsert_normalized(db, connector.tool, normalized_batch, stats)
+    failed_ids = {external_event_id for external_event_id, _, _ in failures}
+    _release_quarantined(
+        db,
+        connector.tool,
+        (event.external_event_id for event in events if event.external_event_id not in failed_ids),
     )
+    return traces_written, _quarantine_events(db, connector.tool, failures)
 
 
-def _trace_exists(db: Session, tool: str, external_event_id: str) -> bool:
-    return (
-        db.scalar(
-            select(models.TraceEvent.trace_event_id).where(
-                and_(
-                    models.TraceEvent.tool == tool,
-                    models.TraceEvent.external_event_id == external_event_id,
+def _load_replay_position(
+    db: Session, tool: str, scope: dict[str, str | None]
+) -> tuple[datetime, str] | None:
+    checkpoint = db.scalar(
+        select(models.JobCheckpoint.checkpoint_json).where(
+            models.JobCheckpoint.job_name == _replay_checkpoint_name(tool)
+        )
+    )
+    if not checkpoint or checkpoint.get("scope") != scope:
+        return None
+    fetched_at, raw_event_id = checkpoint["after"]
+    return datetime.fromisoformat(fetched_at), raw_event_id
+
+
+def replay_raw_events(
+    db: Session,
+    connector: Connector,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    page_size: int | None = None,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """Re-derive ``trace_event`` rows and resources from stored ``raw_event`` payloads.
+
+    Raw events with ``since <= fetched_at < until`` are streamed in keyset pages of
+    ``(fetched_at, raw_event_id)``. With more than one worker each page is normalized in a
+    process pool (workers resolve the connector from ``CONNECTOR_REGISTRY``); traces are
+    then upserted on ``(tool, external_event_id)``, keeping ``trace_event_id`` stable for
+    timeline references. The page position is committed to ``job_checkpoint`` with each
+    page, so an interrupted replay of the same range resumes where it stopped; the
+    checkpoint is removed once the range is complete. Events that now normalize leave
+    ``ingest_quarantine``; events that fail are quarantined.
+    """
+    settings = get_settings()
+    size = page_size or settings.ingest_page_size
+    worker_count = workers or settings.replay_workers
+    scope = {
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+    }
+    position = _load_replay_position(db, connector.tool, scope)
+    filters = [models.RawEvent.tool == connector.tool]
+    if since is not None:
+        filters.append(models.RawEvent.fetched_at >= since)
+    if until is not None:
+        filters.append(models.RawEvent.fetched_at < until)
+
+    resource_stats: Counter[str] = Counter()
+    replayed = 0
+    traces_written = 0
+    quarantined = 0
+    pages = 0
+    executor = ProcessPoolExecutor(max_workers=worker_count) if worker_count > 1 else None
+    try:
+        while True:
+            query = select(models.RawEvent).where(*filters)
+            if position is not None:
+                query = query.where(
+                    tuple_(models.RawEvent.fetched_at, models.RawEvent.raw_event_id) > position
                 )
+            rows = db.scalars(
+                query.order_by(models.RawEvent.fetched_at, models.RawEvent.raw_event_id).limit(size)
+            ).all()
+            if not rows:
+                break
+            page_traces, page_quarantined = _renormalize_page(
+                db,
+                connector,
+                [_connector_event(row) for row in rows],
+                resource_stats,
+                executor,
+                worker_count,
+            )
+
+            position = (rows[-1].fetched_at, rows[-1].raw_event_id)
+            upsert(
+                db,
+                models.JobCheckpoint,
+                [
+                    {
+                        "job_name": _replay_checkpoint_name(connector.tool),
+                        "checkpoint_json": {
+                            "scope": scope,
+                            "after": [position[0].isoformat(), position[1]],
+                        },
+                        "updated_at": utcnow(),
+                    }
+                ],
+                conflict_columns=("job_name",),
+                update_columns=("checkpoint_json", "updated_at"),
             )
+            db.commit()
+            pages += 1
+            replayed += len(rows)
+            traces_written += page_traces
+            quarantined += page_quarantined
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    db.execute(
+        delete(models.JobCheckpoint).where(
+            models.JobCheckpoint.job_name == _replay_checkpoint_name(connector.tool)
         )
-        is not None
     )
+    db.commit()
+    return {
+        "raw_event": replayed,
+        "trace_event": traces_written,
+        "quarantined": quarantined,
+        "pages": pages,
+        **_resource_counts(resource_stats),
+    }
 
 
-def _store_raw_event(db: Session, event: ConnectorEvent) -> None:
-    db.add(
-        models.RawEvent(
-            tool=event.tool,
-            external_event_id=event.external_event_id,
-            fetched_at=event.fetched_at,
-            payload_json=event.payload_json,
-            permission_state=event.permission_state,
+def redrive_quarantined(
+    db: Session, connector: Connector, *, page_size: int | None = None
+) -> dict[str, int]:
+    """Re-normalize a tool's quarantined events from their stored ``raw_event`` payloads.
+
+    Run after a ``normalize`` fix: events that now succeed are written like a replay and
+    leave quarantine, events that still fail stay with ``attempts`` bumped. Pages are keyed
+    by ``external_event_id`` and committed one at a time.
+    """
+    size = page_size or get_settings().ingest_page_size
+    resource_stats: Counter[str] = Counter()
+    after: str | None = None
+    attempted = 0
+    traces_written = 0
+    still_quarantined = 0
+    pages = 0
+    while True:
+        query = (
+            select(models.RawEvent)
+            .join(
+                models.IngestQuarantine,
+                and_(
+                    models.IngestQuarantine.tool == models.RawEvent.tool,
+                    models.IngestQuarantine.external_event_id == models.RawEvent.external_event_id,
+                ),
+            )
+            .where(models.IngestQuarantine.tool == connector.tool)
+        )
+        if after is not None:
+            query = query.where(models.IngestQuarantine.external_event_id > after)
+        rows = db.scalars(
+            query.order_by(models.IngestQuarantine.external_event_id).limit(size)
+        ).all()
+        if not rows:
+            break
+        page_traces, page_failed = _renormalize_page(
+            db, connector, [_connector_event(row) for row in rows], resource_stats
         )
+        db.commit()
+        after = rows[-1].external_event_id
+        pages += 1
+        attempted += len(rows)
+        traces_written += page_traces
+        still_quarantined += page_failed
+    return {
+        "attempted": attempted,
+        "trace_event": traces_written,
+        "still_quarantined": still_quarantined,
+        "pages": pages,
+        **_resource_counts(resource_stats),
+    }
+
+
+def quarantine_summary(db: Session, tool: str, *, limit: int = 100) -> dict:
+    """Count and most recent failures of a tool's quarantined events."""
+    total = db.scalar(
+        select(func.count())
+        .select_from(models.IngestQuarantine)
+        .where(models.IngestQuarantine.tool == tool)
     )
+    rows = db.scalars(
+        select(models.IngestQuarantine)
+        .where(models.IngestQuarantine.tool == tool)
+        .order_by(
+            models.IngestQuarantine.last_failed_at.desc(),
+            models.IngestQuarantine.external_event_id,
+        )
+        .limit(limit)
+    ).all()
+    return {
+        "tool": tool,
+        "total": total or 0,
+        "items": [
+            {
+                "external_event_id": row.external_event_id,
+                "error_type": row.error_type,
+                "error_message": row.error_message,
+                "attempts": row.attempts,
+                "first_failed_at": row.first_failed_at.isoformat(),
+                "last_failed_at": row.last_failed_at.isoformat(),
+            }
+            for row in rows
+        ],
+    }
 
 
-def sync_permissions(db: Session, connector: Connector, config: dict) -> dict[str, int]:
+def sync_permissions(
+    db: Session,
+    connector: Connector,
+    config: dict,
+    *,
+    page_size: int | None = None,
+    acl_pages: Iterable[list[ResourceDelta]] | None = None,
+) -> dict[str, int]:
     connector.validate(config)
-    resources = connector.fetch_acls(config)
+    size = page_size or get_settings().ingest_page_size
+    db.flush()
+    if acl_pages is None:
+        acl_pages = _fetch_pages(connector.tool, connector.iter_acl_pages(config, page_size=size))
+    resource_stats: Counter[str] = Counter()
     touched = 0
-    for delta in resources:
-        resource = _upsert_resource(db, delta)
-        if delta.permission_state == "KNOWN":
-            _sync_resource_acl(db, resource.resource_id, delta.acl_principal_ids, connector.tool)
-        touched += 1
-    db.commit()
-    return {"resources": touched}
+    granted = 0
+    revoked = 0
+    for deltas in acl_pages:
+        page_granted, page_revoked = _apply_resource_deltas(
+            db, deltas, connector.tool, resource_stats, revoke=True
+        )
+        db.commit()
+        touched += len(deltas)
+        granted += page_granted
+        revoked += page_revoked
+    return {
+        "resources": touched,
+        "acl_granted": granted,
+        "acl_revoked": revoked,
+        **_resource_counts(resource_stats),
+    }
+
+
+def sync_connectors(
+    db: Session,
+    targets: dict[str, tuple[Connector, dict]],
+    *,
+    page_size: int | None = None,
+) -> dict[str, dict]:
+    """Ingest and permission-sync several connectors with concurrent fetching.
+
+    Every tool's ACL and event pages are fetched on a thread pool (``prefetch_pages``) while
+    this session writes them tool by tool, so vendor I/O overlaps instead of running
+    serially. A failing tool is rolled back, counted in ``CONNECTOR_ERRORS`` and reported as
+    ``{"status": "error"}`` without stopping the others.
+    """
+    size = page_size or get_settings().ingest_page_size
+    results: dict[str, dict] = {}
+    streams: dict[str, tuple[PrefetchedPages, PrefetchedPages, PrefetchedPages]] = {}
+    with ThreadPoolExecutor(
+        max_workers=max(len(targets) * 3, 1), thread_name_prefix="connector-fetch"
+    ) as executor:
+        try:
+            for tool, (connector, config) in targets.items():
+                try:
+                    connector.validate(config)
+                except Exception as exc:  # noqa: BLE001 - reported per tool
+                    results[tool] = _connector_failure(tool, exc)
+                    continue
+                cursors = load_connector_cursors(db, tool)
+                breaker = circuit_breaker(tool)
+                streams[tool] = (
+                    prefetch_pages(
+                        breaker.guard(connector.iter_acl_pages(config, page_size=size)),
+                        tool=tool,
+                        executor=executor,
+                    ),
+                    prefetch_pages(
+                        breaker.guard(
+                            connector.iter_event_pages(config, page_size=size, cursors=cursors)
+                        ),
+                        tool=tool,
+                        executor=executor,
+                    ),
+                    prefetch_pages(
+                        breaker.guard(connector.iter_acl_pages(config, page_size=size)),
+                        tool=tool,
+                        executor=executor,
+                    ),
+                )
+            for tool, (ingest_acls, events, permission_acls) in streams.items():
+                connector, config = targets[tool]
+                try:
+                    results[tool] = {
+                        "status": "ok",
+                        "ingest": ingest_connector_batch(
+                            db,
+                            connector,
+                            config,
+                            page_size=size,
+                            acl_pages=ingest_acls,
+                            event_pages=events,
+                        ),
+                        "permissions_sync": sync_permissions(
+                            db, connector, config, page_size=size, acl_pages=permission_acls
+                        ),
+                    }
+                except Exception as exc:  # noqa: BLE001 - reported per tool
+                    db.rollback()
+                    results[tool] = _connector_failure(tool, exc)
+        finally:
+            for stream in (page for pages in streams.values() for page in pages):
+                stream.close()
+    return results
+
+
+def enabled_connector_targets(db: Session) -> dict[str, tuple[Connector, dict]]:
+    """Registered connectors with an enabled config, keyed by tool."""
+    rows = db.scalars(
+        select(models.ConnectorConfig)
+        .where(models.ConnectorConfig.enabled.is_(True))
+        .order_by(models.ConnectorConfig.tool.asc())
+    ).all()
+    return {
+        row.tool: (CONNECTOR_REGISTRY[row.tool], row.config_json)
+        for row in rows
+        if row.tool in CONNECTOR_REGISTRY
+    }
+
+
+def _connector_failure(tool: str, exc: Exception) -> dict:
+    CONNECTOR_ERRORS.labels(tool=tool, reason="sync_failed").inc()
+    return {"status": "error", "error": type(exc).__name__}
 
 
 def set_connector_enabled(
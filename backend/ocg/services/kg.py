@@ -2,69 +2,73 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ocg.db import models
+from ocg.db.upsert import insert_ignore
+from ocg.services.common import chunked
+
+EdgeKey = tuple[str, str, str]
+
+
+def _entity_row(entity_id: str, entity_type: str, confidence: float, attrs: dict) -> dict:
+    return {
+        "entity_id": entity_id,
+        "entity_type": entity_type,
+        "canonical_key": entity_id,
+        "display_name": entity_id,
+        "confidence": confidence,
+        "attrs_json": attrs,
+    }
 
 
 def infer_kg_entities(db: Session) -> dict[str, int]:
-    events = db.scalars(select(models.TraceEvent)).all()
-    created_entities = 0
-    created_edges = 0
+    events = db.execute(
+        select(
+            models.TraceEvent.trace_event_id,
+            models.TraceEvent.tool,
+            models.TraceEvent.actor_principal_id,
+            models.TraceEvent.entity_tags_json,
+        ).order_by(models.TraceEvent.event_time, models.TraceEvent.trace_event_id)
+    )
+    entities: dict[str, dict] = {}
+    person_entities: dict[str, dict] = {}
+    edges: dict[EdgeKey, dict] = {}
     for event in events:
         tags = event.entity_tags_json or {}
         for entity_type in tags.get("entity_type_tags", []):
             key = f"{entity_type.lower()}:{event.tool}"
-            pending_entity_exists = any(
-                isinstance(pending, models.KGEntity) and pending.entity_id == key
-                for pending in db.new
-            )
-            entity = db.scalar(select(models.KGEntity).where(models.KGEntity.canonical_key == key))
-            if not entity and not pending_entity_exists:
-                entity = models.KGEntity(
-                    entity_id=key,
-                    entity_type=entity_type,
-                    canonical_key=key,
-                    display_name=key,
-                    confidence=0.6,
-                    attrs_json={"tool": event.tool},
-                )
-                db.add(entity)
-                created_entities += 1
-
+            entities.setdefault(key, _entity_row(key, entity_type, 0.6, {"tool": event.tool}))
             person_entity_id = f"person:{event.actor_principal_id or 'unknown'}"
-            pending_person_exists = any(
-                isinstance(pending, models.KGEntity) and pending.entity_id == person_entity_id
-                for pending in db.new
+            person_entities.setdefault(
+                person_entity_id, _entity_row(person_entity_id, "Person", 0.7, {})
             )
-            person_entity = db.scalar(
-                select(models.KGEntity).where(models.KGEntity.entity_id == person_entity_id)
+            # The earliest event establishing an edge is kept as its evidence.
+            edges.setdefault(
+                (person_entity_id, key, "acts_on"),
+                {
+                    "src_entity_id": person_entity_id,
+                    "dst_entity_id": key,
+                    "edge_type": "acts_on",
+                    "confidence": 0.5,
+                    "evidence_trace_event_ids": [event.trace_event_id],
+                },
             )
-            if not person_entity and not pending_person_exists:
-                db.add(
-                    models.KGEntity(
-                        entity_id=person_entity_id,
-                        entity_type="Person",
-                        canonical_key=person_entity_id,
-                        display_name=person_entity_id,
-                        confidence=0.7,
-                        attrs_json={},
-                    )
-                )
-            edge_exists = db.scalar(
-                select(models.KGEdge).where(
-                    models.KGEdge.src_entity_id == person_entity_id,
-                    models.KGEdge.dst_entity_id == key,
-                    models.KGEdge.edge_type == "acts_on",
-                )
+
+    created_entities = 0
+    for chunk in chunked(list(entities.values())):
+        created_entities += len(
+            insert_ignore(db, models.KGEntity, chunk, returning=models.KGEntity.entity_id)
+        )
+    for chunk in chunked(list(person_entities.values())):
+        insert_ignore(db, models.KGEntity, chunk)
+    created_edges = 0
+    for chunk in chunked(list(edges.values())):
+        created_edges += len(
+            insert_ignore(
+                db,
+                models.KGEdge,
+                chunk,
+                conflict_columns=("src_entity_id", "dst_entity_id", "edge_type"),
+                returning=models.KGEdge.edge_id,
             )
-            if not edge_exists:
-                db.add(
-                    models.KGEdge(
-                        src_entity_id=person_entity_id,
-                        dst_entity_id=key,
-                        edge_type="acts_on",
-                        confidence=0.5,
-                        evidence_trace_event_ids=[event.trace_event_id],
-                    )
-                )
-                created_edges += 1
+        )
     db.commit()
     return {"entities_created": created_entities, "edges_created": created_edges}
@@ -1,49 +1,130 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 
-from sqlalchemy import and_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, and_, exists, or_, select
+from sqlalchemy.orm import Session, aliased
 
 from ocg.core.observability import PERMISSION_UNKNOWN
 from ocg.db import models
+from ocg.services.common import chunked
 
 
 class PermissionEvaluator:
     """Single permission evaluator used by API and workers."""
 
+    @staticmethod
+    def _active_grant(resource_id, principal_ids: Sequence[str]) -> ColumnElement[bool]:
+        acl = aliased(models.ResourceACL)
+        return (
+            exists()
+            .where(
+                acl.resource_id == resource_id,
+                acl.revoked_at.is_(None),
+                acl.principal_id.in_(sorted(set(principal_ids))),
+            )
+            .correlate_except(acl)
+        )
+
+    @staticmethod
+    def resource_visibility_filter(principal_ids: Sequence[str]) -> ColumnElement[bool]:
+        """WHERE clause keeping ``resource`` rows visible to ``principal_ids``.
+
+        Same rule as ``visible_resource_ids``, evaluated in the database so only visible rows
+        are returned. Use in queries whose FROM includes ``models.Resource``.
+        """
+        return and_(
+            models.Resource.permission_state == "KNOWN",
+            PermissionEvaluator._active_grant(models.Resource.resource_id, principal_ids),
+        )
+
+    @staticmethod
+    def event_visibility_filter(principal_ids: Sequence[str]) -> ColumnElement[bool]:
+        """WHERE clause keeping ``trace_event`` rows visible to ``principal_ids``.
+
+        Events must be KNOWN; events with a resource also need a KNOWN resource with an active
+        grant. Use in queries whose FROM includes ``models.TraceEvent``.
+        """
+        resource = aliased(models.Resource)
+        resource_visible = (
+            exists()
+            .where(
+                resource.resource_id == models.TraceEvent.resource_id,
+                resource.permission_state == "KNOWN",
+                PermissionEvaluator._active_grant(resource.resource_id, principal_ids),
+            )
+            .correlate_except(resource)
+        )
+        return and_(
+            models.TraceEvent.permission_state == "KNOWN",
+            or_(models.TraceEvent.resource_id.is_(None), resource_visible),
+        )
+
+    @staticmethod
+    def visible_resource_ids(
+        db: Session, *, resource_ids: Iterable[str], principal_ids: Sequence[str]
+    ) -> set[str]:
+        """Subset of ``resource_ids`` visible to any of ``principal_ids``, in one query per chunk.
+
+        A resource is visible when it exists, its permission state is KNOWN, and it has an
+        active ACL grant for one of the principals. Missing ACLs fail closed.
+        """
+        unique_ids = sorted(set(resource_ids))
+        principals = sorted(set(principal_ids))
+        if not unique_ids:
+            return set()
+        granted = PermissionEvaluator._active_grant(models.Resource.resource_id, principals)
+        visible: set[str] = set()
+        unknown = 0
+        for chunk in chunked(unique_ids):
+            rows = db.execute(
+                select(
+                    models.Resource.resource_id,
+                    models.Resource.permission_state,
+                    granted,
+                ).where(models.Resource.resource_id.in_(chunk))
+            ).all()
+            for resource_id, permission_state, is_granted in rows:
+                if permission_state != "KNOWN":
+                    unknown += 1
+                elif is_granted:
+                    visible.add(resource_id)
+        if unknown:
+            PERMISSION_UNKNOWN.inc(unknown)
+        return visible
+
+    @staticmethod
+    def filter_visible_events(
+        db: Session, *, events: Iterable[models.TraceEvent], principal_ids: Sequence[str]
+    ) -> list[models.TraceEvent]:
+        """Events visible to ``principal_ids``, in input order, resolved set-based."""
+        candidates = []
+        for event in events:
+            if event.permission_state != "KNOWN":
+                PERMISSION_UNKNOWN.inc()
+                continue
+            candidates.append(event)
+        visible = PermissionEvaluator.visible_resource_ids(
+            db,
+            resource_ids=[event.resource_id for event in candidates if event.resource_id],
+            principal_ids=principal_ids,
+        )
+        return [
+            event for event in candidates if not event.resource_id or event.resource_id in visible
+        ]
+
     @staticmethod
     def resource_visible_to_principals(
         db: Session, *, resource_id: str, principal_ids: Sequence[str]
     ) -> bool:
-        resource = db.get(models.Resource, resource_id)
-        if resource is None:
-            return False
-        if resource.permission_state != "KNOWN":
-            PERMISSION_UNKNOWN.inc()
-            return False
-
-        acl_rows = db.scalars(
-            select(models.ResourceACL).where(
-                and_(
-                    models.ResourceACL.resource_id == resource_id,
-                    models.ResourceACL.revoked_at.is_(None),
-                )
-            )
-        ).all()
-        if not acl_rows:
-            # Public-within-org semantics are tool-specific; default fail-closed.
-            return False
-        allowed = {row.principal_id for row in acl_rows}
-        return bool(allowed.intersection(set(principal_ids)))
+        return resource_id in PermissionEvaluator.visible_resource_ids(
+            db, resource_ids=[resource_id], principal_ids=principal_ids
+        )
 
     @staticmethod
     def event_visible_to_principals(
         db: Session, *, event: models.TraceEvent, principal_ids: Sequence[str]
     ) -> bool:
-        if event.permission_state != "KNOWN":
-            PERMISSION_UNKNOWN.inc()
-            return False
-        if not event.resource_id:
-            return True
-        return PermissionEvaluator.resource_visible_to_principals(
-            db, resource_id=event.resource_id, principal_ids=principal_ids
+        return bool(
+            PermissionEvaluator.filter_visible_events(
+                db, events=[event], principal_ids=principal_ids
+            )
         )
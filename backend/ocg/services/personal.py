@@ -1,11 +1,20 @@
-from collections import defaultdict
-from datetime import timedelta
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from operator import attrgetter
+from uuid import uuid4
 
-from sqlalchemy import delete, select
+from sqlalchemy import Row, and_, delete, func, insert, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 
+from ocg.core.settings import get_settings
 from ocg.db import models
-from ocg.services.common import utcnow
+from ocg.db.upsert import upsert
+from ocg.services import personal_cache
+from ocg.services.common import BULK_CHUNK_SIZE, chunked, utcnow
 from ocg.services.permissions import PermissionEvaluator
 
 
@@ -24,97 +33,712 @@ def set_opt_in(db: Session, person_id: str, enabled: bool) -> models.PersonalOpt
     return row
 
 
-def build_personal_timeline(db: Session, person_id: str, principal_ids: list[str]) -> int:
-    events = db.scalars(
-        select(models.TraceEvent).where(models.TraceEvent.actor_principal_id == person_id)
-    ).all()
-    allowed = [
-        event
-        for event in events
-        if PermissionEvaluator.event_visible_to_principals(
-            db, event=event, principal_ids=principal_ids
+TASK_GAP = timedelta(minutes=30)
+
+
+def timeline_checkpoint_name(person_id: str) -> str:
+    return f"personal_timeline:{person_id}"
+
+
+def tasks_checkpoint_name(person_id: str) -> str:
+    return f"personal_tasks:{person_id}"
+
+
+def _save_timeline_checkpoint(
+    db: Session, person_id: str, principal_ids: list[str], refreshed_at: datetime
+) -> None:
+    upsert(
+        db,
+        models.JobCheckpoint,
+        [
+            {
+                "job_name": timeline_checkpoint_name(person_id),
+                "checkpoint_json": {
+                    "refreshed_at": refreshed_at.isoformat(),
+                    "principal_ids": principal_ids,
+                },
+                "updated_at": utcnow(),
+            }
+        ],
+        conflict_columns=("job_name",),
+        update_columns=("checkpoint_json", "updated_at"),
+    )
+
+
+def timeline_checkpoint(db: Session, person_id: str) -> dict | None:
+    return db.scalar(
+        select(models.JobCheckpoint.checkpoint_json).where(
+            models.JobCheckpoint.job_name == timeline_checkpoint_name(person_id)
         )
-    ]
-    allowed.sort(key=lambda ev: (ev.event_time, ev.trace_event_id))
+    )
+
+
+def _tasks_checkpoint_row(person_id: str, dirty_from: datetime | None) -> dict:
+    return {
+        "job_name": tasks_checkpoint_name(person_id),
+        "checkpoint_json": {"dirty_from": dirty_from.isoformat() if dirty_from else None},
+        "updated_at": utcnow(),
+    }
+
+
+def _save_tasks_checkpoint(db: Session, person_id: str, dirty_from: datetime | None) -> None:
+    upsert(
+        db,
+        models.JobCheckpoint,
+        [_tasks_checkpoint_row(person_id, dirty_from)],
+        conflict_columns=("job_name",),
+        update_columns=("checkpoint_json", "updated_at"),
+    )
+
+
+def _clear_tasks_checkpoint(db: Session, person_id: str) -> None:
+    db.execute(
+        delete(models.JobCheckpoint).where(
+            models.JobCheckpoint.job_name == tasks_checkpoint_name(person_id)
+        )
+    )
+
+
+def tasks_checkpoint(db: Session, person_id: str) -> dict | None:
+    return db.scalar(
+        select(models.JobCheckpoint.checkpoint_json).where(
+            models.JobCheckpoint.job_name == tasks_checkpoint_name(person_id)
+        )
+    )
+
+
+def _mark_tasks_dirty(db: Session, person_id: str, pivot: int) -> None:
+    """Record that timeline ranks from ``pivot`` on changed, for the next task clustering.
+
+    The event time of the last unchanged item (rank ``pivot - 1``) bounds every affected
+    item from below. Without an earlier item the next clustering is a full rebuild.
+    """
+    checkpoint = tasks_checkpoint(db, person_id)
+    if checkpoint is None:
+        return
+    boundary = db.scalar(
+        select(models.TraceEvent.event_time)
+        .join(
+            models.PersonalTimelineItem,
+            models.PersonalTimelineItem.trace_event_id == models.TraceEvent.trace_event_id,
+        )
+        .where(
+            models.PersonalTimelineItem.person_id == person_id,
+            models.PersonalTimelineItem.sequence_rank == pivot - 1,
+        )
+    )
+    if boundary is None:
+        _clear_tasks_checkpoint(db, person_id)
+        return
+    boundary = _as_utc(boundary)
+    current = checkpoint.get("dirty_from")
+    if current and datetime.fromisoformat(current) <= boundary:
+        return
+    _save_tasks_checkpoint(db, person_id, boundary)
+
+
+def _order_key(row) -> tuple[datetime, str]:
+    return (row.event_time, row.trace_event_id)
+
+
+def _rebuild_timeline(db: Session, person_id: str, principal_ids: list[str]) -> int:
+    allowed = db.execute(
+        select(models.TraceEvent.trace_event_id)
+        .where(
+            models.TraceEvent.actor_principal_id == person_id,
+            PermissionEvaluator.event_visibility_filter(principal_ids),
+        )
+        .order_by(models.TraceEvent.event_time.asc(), models.TraceEvent.trace_event_id.asc())
+    ).all()
     db.execute(
         delete(models.PersonalTimelineItem).where(
             models.PersonalTimelineItem.person_id == person_id
         )
     )
-    for idx, event in enumerate(allowed, start=1):
-        db.add(
-            models.PersonalTimelineItem(
-                person_id=person_id,
-                trace_event_id=event.trace_event_id,
-                sequence_rank=idx,
-                created_at=utcnow(),
+    now = utcnow()
+    rows = [
+        {
+            "person_id": person_id,
+            "trace_event_id": trace_event_id,
+            "sequence_rank": idx,
+            "created_at": now,
+        }
+        for idx, (trace_event_id,) in enumerate(allowed, start=1)
+    ]
+    for chunk in chunked(rows):
+        db.execute(insert(models.PersonalTimelineItem), chunk)
+    _clear_tasks_checkpoint(db, person_id)
+    return len(allowed)
+
+
+def build_personal_timeline(db: Session, person_id: str, principal_ids: list[str]) -> int:
+    """Rebuild the person's whole timeline and record it as the refresh high-water mark."""
+    principals = sorted(set(principal_ids))
+    started = utcnow()
+    count = _rebuild_timeline(db, person_id, principals)
+    _save_timeline_checkpoint(db, person_id, principals, started)
+    db.commit()
+    personal_cache.bump_versions([person_id])
+    return count
+
+
+def _acl_changed_since(db: Session, person_id: str, since: datetime) -> bool:
+    """Whether visibility of the person's traces ingested before ``since`` may have changed."""
+    older_resources = select(models.TraceEvent.resource_id).where(
+        models.TraceEvent.actor_principal_id == person_id,
+        models.TraceEvent.ingested_at <= since,
+        models.TraceEvent.resource_id.is_not(None),
+    )
+    acl_changed = (
+        select(models.ResourceACL.resource_id)
+        .where(
+            models.ResourceACL.resource_id.in_(older_resources),
+            or_(models.ResourceACL.granted_at > since, models.ResourceACL.revoked_at > since),
+        )
+        .exists()
+    )
+    resource_changed = (
+        select(models.Resource.resource_id)
+        .where(
+            models.Resource.resource_id.in_(older_resources),
+            models.Resource.updated_at > since,
+        )
+        .exists()
+    )
+    return bool(db.scalar(select(or_(acl_changed, resource_changed))))
+
+
+def _apply_timeline_window(
+    db: Session, person_id: str, principal_ids: list[str], since: datetime
+) -> tuple[int, int, int | None]:
+    """Merge traces ingested (or rewritten) after ``since`` into the stored timeline.
+
+    Window traces are (re)placed by their current ``event_time``; items whose trace moved to
+    another actor or became invisible are dropped. Ranks are rewritten only from the first
+    affected position, so the common case (new events after the last item) is a pure append.
+    Returns ``(added, removed, pivot)`` where ``pivot`` is the first rewritten rank (None if
+    the window was empty).
+    """
+    window = db.execute(
+        select(
+            models.TraceEvent.trace_event_id,
+            models.TraceEvent.event_time,
+            PermissionEvaluator.event_visibility_filter(principal_ids).label("visible"),
+        ).where(
+            models.TraceEvent.actor_principal_id == person_id,
+            models.TraceEvent.ingested_at > since,
+        )
+    ).all()
+    reassigned = db.execute(
+        select(
+            models.PersonalTimelineItem.trace_event_id, models.PersonalTimelineItem.sequence_rank
+        )
+        .join(
+            models.TraceEvent,
+            models.TraceEvent.trace_event_id == models.PersonalTimelineItem.trace_event_id,
+        )
+        .where(
+            models.PersonalTimelineItem.person_id == person_id,
+            models.TraceEvent.ingested_at > since,
+            or_(
+                models.TraceEvent.actor_principal_id.is_(None),
+                models.TraceEvent.actor_principal_id != person_id,
+            ),
+        )
+    ).all()
+    stored: dict[str, int] = {}
+    for chunk in chunked([row.trace_event_id for row in window]):
+        stored.update(
+            db.execute(
+                select(
+                    models.PersonalTimelineItem.trace_event_id,
+                    models.PersonalTimelineItem.sequence_rank,
+                ).where(
+                    models.PersonalTimelineItem.person_id == person_id,
+                    models.PersonalTimelineItem.trace_event_id.in_(chunk),
+                )
+            ).all()
+        )
+    stored.update({trace_event_id: rank for trace_event_id, rank in reassigned})
+    if not window and not stored:
+        return 0, 0, None
+
+    visible = sorted((row for row in window if row.visible), key=_order_key)
+    removed = set(stored) - {row.trace_event_id for row in visible}
+    # Window items are re-placed, so drop every stored one and re-insert the visible ones.
+    for chunk in chunked(sorted(stored)):
+        db.execute(
+            delete(models.PersonalTimelineItem).where(
+                models.PersonalTimelineItem.person_id == person_id,
+                models.PersonalTimelineItem.trace_event_id.in_(chunk),
             )
         )
-    db.commit()
-    return len(allowed)
 
+    # First rank that can change: the earliest dropped item or the slot of the earliest
+    # visible window event, whichever comes first.
+    pivot = min(stored.values(), default=None)
+    if visible:
+        first_time, first_id = _order_key(visible[0])
+        slot = db.scalar(
+            select(func.min(models.PersonalTimelineItem.sequence_rank))
+            .join(
+                models.TraceEvent,
+                models.TraceEvent.trace_event_id == models.PersonalTimelineItem.trace_event_id,
+            )
+            .where(
+                models.PersonalTimelineItem.person_id == person_id,
+                or_(
+                    models.TraceEvent.event_time > first_time,
+                    and_(
+                        models.TraceEvent.event_time == first_time,
+                        models.TraceEvent.trace_event_id > first_id,
+                    ),
+                ),
+            )
+        )
+        if slot is None:
+            slot = (
+                db.scalar(
+                    select(func.max(models.PersonalTimelineItem.sequence_rank)).where(
+                        models.PersonalTimelineItem.person_id == person_id
+                    )
+                )
+                or 0
+            ) + 1
+        pivot = slot if pivot is None else min(pivot, slot)
 
-def cluster_personal_tasks(db: Session, person_id: str) -> int:
-    timeline = db.scalars(
-        select(models.PersonalTimelineItem)
-        .where(models.PersonalTimelineItem.person_id == person_id)
-        .order_by(models.PersonalTimelineItem.sequence_rank.asc())
+    tail = db.execute(
+        select(
+            models.PersonalTimelineItem.trace_event_id,
+            models.PersonalTimelineItem.sequence_rank,
+            models.TraceEvent.event_time,
+        )
+        .join(
+            models.TraceEvent,
+            models.TraceEvent.trace_event_id == models.PersonalTimelineItem.trace_event_id,
+        )
+        .where(
+            models.PersonalTimelineItem.person_id == person_id,
+            models.PersonalTimelineItem.sequence_rank >= pivot,
+        )
     ).all()
-    event_by_id = {
-        event.trace_event_id: event
-        for event in db.scalars(
-            select(models.TraceEvent).where(models.TraceEvent.actor_principal_id == person_id)
+    base = (
+        db.scalar(
+            select(func.count()).where(
+                models.PersonalTimelineItem.person_id == person_id,
+                models.PersonalTimelineItem.sequence_rank < pivot,
+            )
+        )
+        or 0
+    )
+    merged = sorted(
+        [(event_time, trace_event_id, rank) for trace_event_id, rank, event_time in tail]
+        + [(*_order_key(row), None) for row in visible],
+    )
+    now = utcnow()
+    inserts = []
+    rank_updates = []
+    for offset, (_, trace_event_id, old_rank) in enumerate(merged, start=1):
+        rank = base + offset
+        if old_rank is None:
+            inserts.append(
+                {
+                    "person_id": person_id,
+                    "trace_event_id": trace_event_id,
+                    "sequence_rank": rank,
+                    "created_at": now,
+                }
+            )
+        elif old_rank != rank:
+            rank_updates.append(
+                {"person_id": person_id, "trace_event_id": trace_event_id, "sequence_rank": rank}
+            )
+    for chunk in chunked(rank_updates):
+        db.execute(update(models.PersonalTimelineItem), chunk)
+    for chunk in chunked(inserts):
+        db.execute(insert(models.PersonalTimelineItem), chunk)
+    return len(visible) - (len(stored) - len(removed)), len(removed), pivot
+
+
+def refresh_personal_timeline(
+    db: Session, person_id: str, principal_ids: list[str] | None = None
+) -> dict[str, object]:
+    """Bring the person's timeline up to date, incrementally when possible.
+
+    Only traces ingested after the stored high-water mark (minus
+    ``personal_timeline_overlap_seconds`` for late commits) are merged in. A full rebuild
+    happens when there is no checkpoint yet, the principal set changed, or ACLs/resources
+    behind older traces changed since the last refresh. ``principal_ids`` defaults to the
+    set recorded by the previous refresh.
+    """
+    checkpoint = timeline_checkpoint(db, person_id) or {}
+    if principal_ids is None:
+        principal_ids = checkpoint.get("principal_ids")
+        if principal_ids is None:
+            raise ValueError(f"no recorded principals for {person_id}; pass principal_ids")
+    principals = sorted(set(principal_ids))
+    started = utcnow()
+    since = None
+    if checkpoint.get("refreshed_at") and checkpoint.get("principal_ids") == principals:
+        overlap = timedelta(seconds=get_settings().personal_timeline_overlap_seconds)
+        since = datetime.fromisoformat(checkpoint["refreshed_at"]) - overlap
+    if since is None or _acl_changed_since(db, person_id, since):
+        items = _rebuild_timeline(db, person_id, principals)
+        result: dict[str, object] = {"mode": "rebuild", "items": items}
+        changed = True
+    else:
+        added, removed, pivot = _apply_timeline_window(db, person_id, principals, since)
+        changed = pivot is not None
+        if pivot is not None:
+            _mark_tasks_dirty(db, person_id, pivot)
+        result = {"mode": "incremental", "added": added, "removed": removed}
+    _save_timeline_checkpoint(db, person_id, principals, started)
+    db.commit()
+    if changed:
+        personal_cache.bump_versions([person_id])
+    return result
+
+
+def refresh_personal_graphs(db: Session) -> dict[str, int]:
+    """Refresh every checkpointed timeline with its recorded principals and re-cluster tasks.
+
+    Task clustering is a no-op for people whose timeline did not change.
+    """
+    prefix = timeline_checkpoint_name("")
+    names = db.scalars(
+        select(models.JobCheckpoint.job_name).where(
+            models.JobCheckpoint.job_name.startswith(prefix)
         )
+    ).all()
+    stats: Counter[str] = Counter()
+    for name in sorted(names):
+        person_id = name.removeprefix(prefix)
+        result = refresh_personal_timeline(db, person_id)
+        stats[str(result["mode"])] += 1
+        if _cluster_tasks(db, person_id) != "clean":
+            stats["reclustered"] += 1
+    return {
+        "people": len(names),
+        "rebuilt": stats["rebuild"],
+        "incremental": stats["incremental"],
+        "reclustered": stats["reclustered"],
     }
-    db.execute(delete(models.PersonalTask).where(models.PersonalTask.person_id == person_id))
-
-    tasks: list[list[models.TraceEvent]] = []
-    current: list[models.TraceEvent] = []
-    last_time = None
-    for item in timeline:
-        event = event_by_id.get(item.trace_event_id)
-        if not event:
-            continue
-        if last_time and event.event_time - last_time > timedelta(minutes=30) and current:
-            tasks.append(current)
-            current = []
-        current.append(event)
-        last_time = event.event_time
-    if current:
-        tasks.append(current)
-
-    for bucket in tasks:
-        action_hist: dict[str, int] = defaultdict(int)
-        for ev in bucket:
-            action_hist[ev.action_type] += 1
-        top_action = sorted(action_hist.items(), key=lambda item: (-item[1], item[0]))[0][0]
-        db.add(
-            models.PersonalTask(
-                person_id=person_id,
-                start_time=bucket[0].event_time,
-                end_time=bucket[-1].event_time,
-                label=f"task:{top_action}",
-                confidence=0.8,
-                member_trace_event_ids=[ev.trace_event_id for ev in bucket],
+
+
+def _sessionize(rows: Iterable[Row]) -> list[list[Row]]:
+    """Split rank-ordered ``(trace_event_id, event_time, action_type)`` rows at gaps > TASK_GAP."""
+    sessions: list[list] = []
+    for row in rows:
+        if sessions and row.event_time - sessions[-1][-1].event_time <= TASK_GAP:
+            sessions[-1].append(row)
+        else:
+            sessions.append([row])
+    return sessions
+
+
+def _task_row(person_id: str, session: list) -> dict:
+    action_hist: dict[str, int] = defaultdict(int)
+    for row in session:
+        action_hist[row.action_type] += 1
+    top_action = sorted(action_hist.items(), key=lambda item: (-item[1], item[0]))[0][0]
+    return {
+        "personal_task_id": str(uuid4()),
+        "person_id": person_id,
+        "start_time": session[0].event_time,
+        "end_time": session[-1].event_time,
+        "label": f"task:{top_action}",
+        "confidence": 0.8,
+    }
+
+
+def _insert_tasks(db: Session, sessions: list[tuple[str, list[Row]]]) -> None:
+    """Insert a task per ``(person_id, session)`` and its ordered ``personal_task_member`` rows."""
+    rows = [_task_row(person_id, session) for person_id, session in sessions]
+    for chunk in chunked(rows):
+        db.execute(insert(models.PersonalTask), chunk)
+    members = [
+        {
+            "personal_task_id": row["personal_task_id"],
+            "ordinal": ordinal,
+            "trace_event_id": event.trace_event_id,
+        }
+        for row, (_, session) in zip(rows, sessions)
+        for ordinal, event in enumerate(session)
+    ]
+    for chunk in chunked(members):
+        db.execute(insert(models.PersonalTaskMember), chunk)
+
+
+def delete_tasks(db: Session, *criteria) -> None:
+    """Delete the tasks matching ``criteria`` together with their member rows."""
+    db.execute(
+        delete(models.PersonalTaskMember).where(
+            models.PersonalTaskMember.personal_task_id.in_(
+                select(models.PersonalTask.personal_task_id).where(*criteria)
+            )
+        )
+    )
+    db.execute(delete(models.PersonalTask).where(*criteria))
+
+
+def _cluster_tasks(db: Session, person_id: str) -> str:
+    """Re-sessionize the timeline from the earliest dirty point; returns the mode used.
+
+    ``rebuild`` without a checkpoint (first run or timeline rebuilt), ``tail`` when the
+    timeline changed from ``dirty_from`` on, ``clean`` when nothing changed. A tail pass
+    reopens only tasks ending within TASK_GAP of ``dirty_from``: earlier tasks are separated
+    from every changed item by more than the gap, so their boundaries cannot move.
+    """
+    checkpoint = tasks_checkpoint(db, person_id)
+    if checkpoint is not None and not checkpoint.get("dirty_from"):
+        return "clean"
+    query = (
+        select(
+            models.TraceEvent.trace_event_id,
+            models.TraceEvent.event_time,
+            models.TraceEvent.action_type,
+        )
+        .join(
+            models.PersonalTimelineItem,
+            models.PersonalTimelineItem.trace_event_id == models.TraceEvent.trace_event_id,
+        )
+        .where(
+            models.PersonalTimelineItem.person_id == person_id,
+            models.TraceEvent.actor_principal_id == person_id,
+        )
+        .order_by(models.PersonalTimelineItem.sequence_rank.asc())
+    )
+    if checkpoint is None:
+        mode = "rebuild"
+        delete_tasks(db, models.PersonalTask.person_id == person_id)
+    else:
+        mode = "tail"
+        dirty_from = datetime.fromisoformat(checkpoint["dirty_from"])
+        reopened = db.execute(
+            select(models.PersonalTask.personal_task_id, models.PersonalTask.start_time).where(
+                models.PersonalTask.person_id == person_id,
+                models.PersonalTask.end_time >= dirty_from - TASK_GAP,
             )
+        ).all()
+        reopen_from = min([dirty_from, *(_as_utc(start) for _, start in reopened)])
+        for chunk in chunked([task_id for task_id, _ in reopened]):
+            delete_tasks(db, models.PersonalTask.personal_task_id.in_(chunk))
+        query = query.where(models.TraceEvent.event_time >= reopen_from)
+
+    _insert_tasks(db, [(person_id, session) for session in _sessionize(db.execute(query).all())])
+    _save_tasks_checkpoint(db, person_id, None)
+    db.commit()
+    personal_cache.bump_versions([person_id])
+    return mode
+
+
+def cluster_personal_tasks(db: Session, person_id: str) -> int:
+    """Bring the person's tasks in line with their timeline; returns the task count."""
+    _cluster_tasks(db, person_id)
+    return int(
+        db.scalar(
+            select(func.count())
+            .select_from(models.PersonalTask)
+            .where(models.PersonalTask.person_id == person_id)
+        )
+        or 0
+    )
+
+
+def cluster_all_personal_tasks(db: Session, *, since: datetime | None = None) -> dict[str, int]:
+    """Sessionize every person's timeline in one ordered pass instead of one job per person.
+
+    Streams ``(person_id, trace_event_id, event_time, action_type)`` for all timeline items
+    ordered by person and rank, applies the gap rule per person, and bulk-inserts tasks. With
+    ``since`` only tasks ending within TASK_GAP of it are reopened (as in a tail pass);
+    without it every person's tasks are rebuilt. Returns people and inserted task counts.
+    """
+    people = db.scalars(
+        select(models.PersonalTimelineItem.person_id)
+        .distinct()
+        .order_by(models.PersonalTimelineItem.person_id)
+    ).all()
+    reopen_from: dict[str, datetime] = {}
+    if since is None:
+        for chunk in chunked(people):
+            delete_tasks(db, models.PersonalTask.person_id.in_(chunk))
+    else:
+        since = _as_utc(since)
+        reopened = db.execute(
+            select(
+                models.PersonalTask.personal_task_id,
+                models.PersonalTask.person_id,
+                models.PersonalTask.start_time,
+            ).where(models.PersonalTask.end_time >= since - TASK_GAP)
+        ).all()
+        for _, person_id, start_time in reopened:
+            reopen_from[person_id] = min(reopen_from.get(person_id, since), _as_utc(start_time))
+        for chunk in chunked([task_id for task_id, _, _ in reopened]):
+            delete_tasks(db, models.PersonalTask.personal_task_id.in_(chunk))
+
+    query = (
+        select(
+            models.PersonalTimelineItem.person_id,
+            models.TraceEvent.trace_event_id,
+            models.TraceEvent.event_time,
+            models.TraceEvent.action_type,
+        )
+        .join(
+            models.TraceEvent,
+            models.TraceEvent.trace_event_id == models.PersonalTimelineItem.trace_event_id,
+        )
+        .where(models.TraceEvent.actor_principal_id == models.PersonalTimelineItem.person_id)
+        .order_by(models.PersonalTimelineItem.person_id, models.PersonalTimelineItem.sequence_rank)
+    )
+    if since is not None:
+        query = query.where(models.TraceEvent.event_time >= min([since, *reopen_from.values()]))
+    pending: list[tuple[str, list[Row]]] = []
+    inserted = 0
+    rows = db.execute(query.execution_options(yield_per=BULK_CHUNK_SIZE))
+    for person_id, person_rows in groupby(rows, key=attrgetter("person_id")):
+        window = list(person_rows)
+        if since is not None:
+            bound = reopen_from.get(person_id, since)
+            window = [row for row in window if _as_utc(row.event_time) >= bound]
+        pending.extend((person_id, session) for session in _sessionize(window))
+        if len(pending) >= BULK_CHUNK_SIZE:
+            _insert_tasks(db, pending)
+            inserted += len(pending)
+            pending = []
+    if pending:
+        _insert_tasks(db, pending)
+        inserted += len(pending)
+
+    # Tasks are now current for everyone, except people whose timeline changed before
+    # ``since`` (their dirty mark stays) or who have no checkpoint (next pass is full).
+    clean = list(people)
+    if since is not None:
+        marks: dict[str, dict] = dict(
+            db.execute(
+                select(models.JobCheckpoint.job_name, models.JobCheckpoint.checkpoint_json).where(
+                    models.JobCheckpoint.job_name.startswith(tasks_checkpoint_name(""))
+                )
+            ).all()
+        )
+        clean = []
+        for person_id in people:
+            mark = marks.get(tasks_checkpoint_name(person_id))
+            if mark is None:
+                continue
+            dirty_from = mark.get("dirty_from")
+            if not dirty_from or datetime.fromisoformat(dirty_from) >= since:
+                clean.append(person_id)
+    for chunk in chunked(clean):
+        upsert(
+            db,
+            models.JobCheckpoint,
+            [_tasks_checkpoint_row(person_id, None) for person_id in chunk],
+            conflict_columns=("job_name",),
+            update_columns=("checkpoint_json", "updated_at"),
         )
     db.commit()
-    return len(tasks)
+    personal_cache.bump_versions(people)
+    return {"people": len(people), "tasks": inserted}
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _parse_time(value: str, name: str) -> datetime:
+    try:
+        return _as_utc(datetime.fromisoformat(value))
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an ISO-8601 timestamp") from exc
+
+
+def _encode_cursor(*values: object) -> str:
+    return urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, arity: int) -> list:
+    try:
+        values = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != arity:
+        raise ValueError("invalid cursor")
+    return values
+
+
+def _timeline_rank_bound(db: Session, person_id: str, at: datetime, *, lower: bool) -> int | None:
+    """Rank of the first item at/after ``at`` (``lower``) or the last item before it.
+
+    Ranks follow ``(event_time, trace_event_id)``, so a time bound is one ordered lookup on the
+    actor's events and the page itself is a range scan on ``(person_id, sequence_rank)``.
+    """
+    order = (models.TraceEvent.event_time, models.TraceEvent.trace_event_id)
+    return db.scalar(
+        select(models.PersonalTimelineItem.sequence_rank)
+        .join(
+            models.TraceEvent,
+            models.TraceEvent.trace_event_id == models.PersonalTimelineItem.trace_event_id,
+        )
+        .where(
+            models.PersonalTimelineItem.person_id == person_id,
+            models.TraceEvent.actor_principal_id == person_id,
+            models.TraceEvent.event_time >= at if lower else models.TraceEvent.event_time < at,
+        )
+        .order_by(*(col.asc() if lower else col.desc() for col in order))
+        .limit(1)
+    )
 
 
 def personal_timeline(
-    db: Session, person_id: str, from_iso: str | None, to_iso: str | None
-) -> list[dict]:
+    db: Session,
+    person_id: str,
+    from_iso: str | None,
+    to_iso: str | None,
+    *,
+    limit: int | None = None,
+    cursor: str | None = None,
+    principal_ids: Sequence[str] | None = None,
+) -> dict:
+    """One page of the timeline, newest rank first, ``from`` inclusive and ``to`` exclusive.
+
+    ``next_cursor`` is set when more items follow; pass it back as ``cursor``. With
+    ``principal_ids``, items are re-checked against those principals, since the stored
+    timeline reflects the principals of its last refresh.
+    """
+    ranks = [models.PersonalTimelineItem.person_id == person_id]
+    if from_iso:
+        first = _timeline_rank_bound(db, person_id, _parse_time(from_iso, "from"), lower=True)
+        if first is None:
+            return {"items": [], "next_cursor": None}
+        ranks.append(models.PersonalTimelineItem.sequence_rank >= first)
+    if to_iso:
+        last = _timeline_rank_bound(db, person_id, _parse_time(to_iso, "to"), lower=False)
+        if last is None:
+            return {"items": [], "next_cursor": None}
+        ranks.append(models.PersonalTimelineItem.sequence_rank <= last)
+    if cursor:
+        (after,) = _decode_cursor(cursor, 1)
+        if not isinstance(after, int):
+            raise ValueError("invalid cursor")
+        ranks.append(models.PersonalTimelineItem.sequence_rank < after)
     query = (
         select(models.PersonalTimelineItem, models.TraceEvent)
         .join(
             models.TraceEvent,
             models.TraceEvent.trace_event_id == models.PersonalTimelineItem.trace_event_id,
         )
-        .where(models.PersonalTimelineItem.person_id == person_id)
-        .order_by(models.PersonalTimelineItem.sequence_rank.asc())
+        .where(*ranks)
+        .order_by(models.PersonalTimelineItem.sequence_rank.desc())
     )
+    if principal_ids is not None:
+        query = query.where(PermissionEvaluator.event_visibility_filter(principal_ids))
+    if limit is not None:
+        query = query.limit(limit + 1)
     rows = db.execute(query).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1][0].sequence_rank)
     result = []
     for item, event in rows:
         result.append(
@@ -126,22 +750,70 @@ def personal_timeline(
                 "tool_family": event.tool_family,
             }
         )
-    return result
+    return {"items": result, "next_cursor": next_cursor}
 
 
-def personal_tasks(db: Session, person_id: str) -> list[dict]:
-    rows = db.scalars(
-        select(models.PersonalTask)
-        .where(models.PersonalTask.person_id == person_id)
-        .order_by(models.PersonalTask.start_time.desc())
-    ).all()
-    return [
-        {
-            "personal_task_id": row.personal_task_id,
-            "label": row.label,
-            "start_time": row.start_time.isoformat(),
-            "end_time": row.end_time.isoformat(),
-            "confidence": row.confidence,
-        }
-        for row in rows
-    ]
+def personal_tasks(
+    db: Session,
+    person_id: str,
+    from_iso: str | None = None,
+    to_iso: str | None = None,
+    *,
+    limit: int | None = None,
+    cursor: str | None = None,
+    principal_ids: Sequence[str] | None = None,
+) -> dict:
+    """One page of tasks, newest ``start_time`` first; ``from``/``to`` bound ``start_time``.
+
+    With ``principal_ids``, tasks containing an event those principals cannot see are left out.
+    """
+    query = select(models.PersonalTask).where(models.PersonalTask.person_id == person_id)
+    if principal_ids is not None:
+        hidden_member = (
+            select(models.PersonalTaskMember.trace_event_id)
+            .join(
+                models.TraceEvent,
+                models.TraceEvent.trace_event_id == models.PersonalTaskMember.trace_event_id,
+            )
+            .where(
+                models.PersonalTaskMember.personal_task_id == models.PersonalTask.personal_task_id,
+                ~PermissionEvaluator.event_visibility_filter(principal_ids),
+            )
+            .exists()
+        )
+        query = query.where(~hidden_member)
+    if from_iso:
+        query = query.where(models.PersonalTask.start_time >= _parse_time(from_iso, "from"))
+    if to_iso:
+        query = query.where(models.PersonalTask.start_time < _parse_time(to_iso, "to"))
+    if cursor:
+        start_time, task_id = _decode_cursor(cursor, 2)
+        query = query.where(
+            tuple_(models.PersonalTask.start_time, models.PersonalTask.personal_task_id)
+            < tuple_(_parse_time(str(start_time), "cursor"), str(task_id))
+        )
+    query = query.order_by(
+        models.PersonalTask.start_time.desc(), models.PersonalTask.personal_task_id.desc()
+    )
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = db.scalars(query).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(
+            _as_utc(rows[-1].start_time).isoformat(), rows[-1].personal_task_id
+        )
+    return {
+        "tasks": [
+            {
+                "personal_task_id": row.personal_task_id,
+                "label": row.label,
+                "start_time": row.start_time.isoformat(),
+                "end_time": row.end_time.isoformat(),
+                "confidence": row.confidence,
+            }
+            for row in rows
+        ],
+        "next_cursor": next_cursor,
+    }
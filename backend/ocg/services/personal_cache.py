@@ -0,0 +1,210 @@
+"""Read-through cache for personal timeline and task pages.
+
+Entries are keyed by person, a fingerprint of the caller's principal set, the person's data
+version, and the request parameters. Workers bump the version after committing any change to a
+person's timeline or tasks, so a bumped person's old entries are never read again and simply
+age out. Each entry stores a hash of its page, which is the response ETag: a polling client
+revalidates with ``If-None-Match`` for the cost of one version lookup and no database work, and
+an ETag always describes the bytes it was served with, even if a bump is lost.
+
+Versions live in Redis so every API process sees worker bumps. Pages are cached in a
+process-local LRU and, with ``personal_cache_redis_enabled``, in Redis shared by all API
+processes. Redis outages fail open: lookups miss and reads go to the database.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Protocol
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from ocg.core.settings import get_settings
+
+
+class VersionStore(Protocol):
+    def get(self, person_id: str) -> int | None: ...
+
+    def bump(self, person_ids: Iterable[str]) -> None: ...
+
+
+class InMemoryVersionStore:
+    """Process-local versions for tests and single-process deployments."""
+
+    def __init__(self) -> None:
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, person_id: str) -> int | None:
+        with self._lock:
+            return self._versions.get(person_id, 0)
+
+    def bump(self, person_ids: Iterable[str]) -> None:
+        with self._lock:
+            for person_id in person_ids:
+                self._versions[person_id] = self._versions.get(person_id, 0) + 1
+
+
+class RedisVersionStore:
+    """Per-person counters ``ocg:personal_version:{person_id}``; ``None`` when Redis is down."""
+
+    def __init__(self, redis: Redis, prefix: str = "ocg:personal_version:") -> None:
+        self._redis = redis
+        self._prefix = prefix
+
+    def get(self, person_id: str) -> int | None:
+        try:
+            value = self._redis.get(f"{self._prefix}{person_id}")
+        except RedisError:
+            return None
+        return int(value) if value is not None else 0
+
+    def bump(self, person_ids: Iterable[str]) -> None:
+        # A lost bump serves the old page until its entry expires after
+        # personal_cache_ttl_seconds; the reload then gets a new ETag from its content.
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for person_id in person_ids:
+                pipe.incr(f"{self._prefix}{person_id}")
+            pipe.execute()
+        except RedisError:
+            return
+
+
+def page_etag(payload: dict[str, Any]) -> str:
+    material = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+class PageCache:
+    """LRU of JSON pages and their ETags with a TTL, optionally backed by a shared Redis tier."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        redis: Redis | None = None,
+        prefix: str = "ocg:personal_cache:",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._redis = redis
+        self._prefix = prefix
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, tuple[str, dict[str, Any]]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, key: str) -> tuple[str, dict[str, Any]] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _set_local(self, key: str, page: tuple[str, dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl_seconds, page)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> tuple[str, dict[str, Any]] | None:
+        """``(etag, payload)`` of a live entry, or ``None``."""
+        page = self._get_local(key)
+        if page is not None or self._redis is None:
+            return page
+        try:
+            raw = self._redis.get(f"{self._prefix}{key}")
+        except RedisError:
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        page = (entry["etag"], entry["payload"])
+        self._set_local(key, page)
+        return page
+
+    def set(self, key: str, payload: dict[str, Any]) -> str:
+        """Cache ``payload`` under ``key`` and return its ETag."""
+        etag = page_etag(payload)
+        self._set_local(key, (etag, payload))
+        if self._redis is None:
+            return etag
+        try:
+            self._redis.set(
+                f"{self._prefix}{key}",
+                json.dumps({"etag": etag, "payload": payload}, separators=(",", ":")),
+                ex=max(int(self._ttl_seconds), 1),
+            )
+        except RedisError:
+            pass
+        return etag
+
+
+_versions: VersionStore | None = None
+_pages: PageCache | None = None
+
+
+def set_version_store(store: VersionStore | None) -> None:
+    global _versions
+    _versions = store
+
+
+def set_page_cache(cache: PageCache | None) -> None:
+    global _pages
+    _pages = cache
+
+
+def _redis() -> Redis:
+    return Redis.from_url(get_settings().redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+
+def version_store() -> VersionStore:
+    global _versions
+    if _versions is None:
+        _versions = RedisVersionStore(_redis())
+    return _versions
+
+
+def page_cache() -> PageCache:
+    global _pages
+    if _pages is None:
+        settings = get_settings()
+        _pages = PageCache(
+            max_entries=settings.personal_cache_max_entries,
+            ttl_seconds=settings.personal_cache_ttl_seconds,
+            redis=_redis() if settings.personal_cache_redis_enabled else None,
+        )
+    return _pages
+
+
+def bump_versions(person_ids: Iterable[str]) -> None:
+    """Invalidate cached pages of ``person_ids``; call after committing their changes."""
+    version_store().bump(person_ids)
+
+
+def cache_key(
+    person_id: str,
+    principal_ids: Sequence[str],
+    version: int,
+    kind: str,
+    params: dict[str, Any],
+) -> str:
+    material = json.dumps(
+        [person_id, sorted(set(principal_ids)), version, kind, params],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import random
+import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
-from typing import TypeVar
+from typing import Protocol, TypeVar
 
+from redis import Redis
+from redis.exceptions import RedisError
+
+from ocg.core.observability import CONNECTOR_ERRORS
+from ocg.core.settings import get_settings
+from ocg.services.common import as_text
 
 T = TypeVar("T")
 
@@ -36,3 +43,223 @@ def retry_with_backoff(
             )
             sleep_for = sleep_for + random.uniform(0, sleep_for / 2)
             time.sleep(sleep_for)
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitPolicy:
+    failure_threshold: int = 5
+    reset_timeout_seconds: float = 60.0
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, tool: str) -> None:
+        super().__init__(f"circuit open for connector {tool}")
+        self.tool = tool
+
+
+class CircuitStore(Protocol):
+    def read(self, tool: str) -> dict[str, str]: ...
+
+    def add_failure(self, tool: str) -> int: ...
+
+    def trip(self, tool: str, opened_at: float) -> None: ...
+
+    def reset(self, tool: str) -> None: ...
+
+    def claim_probe(self, tool: str, ttl_seconds: float) -> bool: ...
+
+
+class InMemoryCircuitStore:
+    """Process-local store for tests and single-process deployments."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._circuits: dict[str, dict[str, str]] = {}
+        self._probes: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def read(self, tool: str) -> dict[str, str]:
+        with self._lock:
+            return dict(self._circuits.get(tool, {}))
+
+    def add_failure(self, tool: str) -> int:
+        with self._lock:
+            circuit = self._circuits.setdefault(tool, {})
+            failures = int(circuit.get("failures", "0")) + 1
+            circuit["failures"] = str(failures)
+            return failures
+
+    def trip(self, tool: str, opened_at: float) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(tool, {})
+            circuit.update(state=CIRCUIT_OPEN, opened_at=str(opened_at))
+            self._probes.pop(tool, None)
+
+    def reset(self, tool: str) -> None:
+        with self._lock:
+            self._circuits.pop(tool, None)
+            self._probes.pop(tool, None)
+
+    def claim_probe(self, tool: str, ttl_seconds: float) -> bool:
+        with self._lock:
+            now = self._clock()
+            if self._probes.get(tool, 0.0) > now:
+                return False
+            self._probes[tool] = now + ttl_seconds
+            return True
+
+
+class RedisCircuitStore:
+    """Circuit state shared by all workers, in hash ``ocg:circuit:{tool}``.
+
+    Redis outages fail open: the breaker then behaves as closed rather than blocking fetches.
+    """
+
+    def __init__(self, redis: Redis, prefix: str = "ocg:circuit:") -> None:
+        self._redis = redis
+        self._prefix = prefix
+
+    def _key(self, tool: str) -> str:
+        return f"{self._prefix}{tool}"
+
+    def read(self, tool: str) -> dict[str, str]:
+        try:
+            raw = self._redis.hgetall(self._key(tool))
+        except RedisError:
+            return {}
+        return {as_text(key): as_text(value) for key, value in raw.items()}
+
+    def add_failure(self, tool: str) -> int:
+        try:
+            return int(self._redis.hincrby(self._key(tool), "failures", 1))
+        except RedisError:
+            return 0
+
+    def trip(self, tool: str, opened_at: float) -> None:
+        try:
+            pipe = self._redis.pipeline()
+            pipe.hset(self._key(tool), mapping={"state": CIRCUIT_OPEN, "opened_at": opened_at})
+            pipe.delete(f"{self._key(tool)}:probe")
+            pipe.execute()
+        except RedisError:
+            return
+
+    def reset(self, tool: str) -> None:
+        try:
+            self._redis.delete(self._key(tool), f"{self._key(tool)}:probe")
+        except RedisError:
+            return
+
+    def claim_probe(self, tool: str, ttl_seconds: float) -> bool:
+        try:
+            return bool(
+                self._redis.set(
+                    f"{self._key(tool)}:probe", "1", nx=True, px=max(int(ttl_seconds * 1000), 1)
+                )
+            )
+        except RedisError:
+            return True
+
+
+class CircuitBreaker:
+    """Per-tool breaker: opens after ``failure_threshold`` consecutive fetch failures.
+
+    While open, calls fail fast with ``CircuitOpenError``. After ``reset_timeout_seconds``
+    the circuit is half-open and one caller (across all workers sharing the store) may
+    probe; success closes the circuit, failure re-opens it for another timeout.
+    """
+
+    def __init__(
+        self,
+        tool: str,
+        *,
+        store: CircuitStore,
+        policy: CircuitPolicy,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.tool = tool
+        self.store = store
+        self.policy = policy
+        self._clock = clock
+
+    def snapshot(self) -> dict[str, object]:
+        circuit = self.store.read(self.tool)
+        state = circuit.get("state", CIRCUIT_CLOSED)
+        opened_at = float(circuit["opened_at"]) if "opened_at" in circuit else None
+        if (
+            state == CIRCUIT_OPEN
+            and opened_at is not None
+            and self._clock() - opened_at >= self.policy.reset_timeout_seconds
+        ):
+            state = CIRCUIT_HALF_OPEN
+        return {
+            "state": state,
+            "failures": int(circuit.get("failures", "0")),
+            "opened_at": opened_at,
+        }
+
+    def before_call(self) -> dict[str, object]:
+        snapshot = self.snapshot()
+        if snapshot["state"] == CIRCUIT_OPEN or (
+            snapshot["state"] == CIRCUIT_HALF_OPEN
+            and not self.store.claim_probe(self.tool, self.policy.reset_timeout_seconds)
+        ):
+            CONNECTOR_ERRORS.labels(tool=self.tool, reason="circuit_open").inc()
+            raise CircuitOpenError(self.tool)
+        return snapshot
+
+    def record_success(self, snapshot: dict[str, object]) -> None:
+        if snapshot["state"] != CIRCUIT_CLOSED or snapshot["failures"]:
+            self.store.reset(self.tool)
+
+    def record_failure(self, snapshot: dict[str, object]) -> None:
+        failures = self.store.add_failure(self.tool)
+        if snapshot["state"] == CIRCUIT_HALF_OPEN or failures >= self.policy.failure_threshold:
+            self.store.trip(self.tool, self._clock())
+            CONNECTOR_ERRORS.labels(tool=self.tool, reason="circuit_opened").inc()
+
+    def guard(self, pages: Iterable[T]) -> Iterator[T]:
+        """Yield ``pages``, passing every page fetch through the breaker."""
+        iterator = iter(pages)
+        while True:
+            snapshot = self.before_call()
+            try:
+                page = next(iterator, _END)
+            except Exception:
+                self.record_failure(snapshot)
+                raise
+            self.record_success(snapshot)
+            if page is _END:
+                return
+            yield page  # type: ignore[misc]
+
+
+_END = object()
+_circuit_store: CircuitStore | None = None
+
+
+def set_circuit_store(store: CircuitStore | None) -> None:
+    global _circuit_store
+    _circuit_store = store
+
+
+def circuit_breaker(tool: str) -> CircuitBreaker:
+    global _circuit_store
+    settings = get_settings()
+    if _circuit_store is None:
+        _circuit_store = RedisCircuitStore(
+            Redis.from_url(settings.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        )
+    return CircuitBreaker(
+        tool,
+        store=_circuit_store,
+        policy=CircuitPolicy(
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout_seconds=settings.circuit_reset_timeout_seconds,
+        ),
+    )
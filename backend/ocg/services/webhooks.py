@@ -0,0 +1,371 @@
+"""Push ingestion: webhook deliveries are buffered, then flushed in micro-batches.
+
+The API validates each delivery and appends it to a per-tool buffer (a Redis list shared by
+API processes and the batcher). The batcher flushes a tool once ``webhook_batch_size`` events
+are waiting or the oldest has waited ``webhook_flush_interval_ms``, writing the whole batch
+through ``ingest_connector_batch`` as one event page (one transaction).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+from redis import Redis
+from sqlalchemy.orm import Session
+
+from ocg.connectors.base import Connector, ConnectorEvent, EventPage
+from ocg.core.observability import CONNECTOR_ERRORS, INGEST_BACKLOG_DEPTH
+from ocg.core.settings import get_settings
+from ocg.services import ingest
+from ocg.services.common import as_text
+
+SIGNATURE_HEADER = "X-OCG-Signature"
+
+
+class WebhookBufferFullError(RuntimeError):
+    pass
+
+
+class WebhookBuffer(Protocol):
+    """Per-tool FIFO with a processing list, so a batch is only dropped once it is committed.
+
+    ``claim`` moves a batch from the pending list to the processing list; ``ack`` removes it
+    after the ingest commit and ``requeue`` puts it back at the head on failure. ``recover``
+    returns batches left in processing by a batcher that died before either.
+    """
+
+    def push(self, tool: str, items: list[str], max_depth: int) -> int: ...
+
+    def claim(self, tool: str, count: int) -> list[str]: ...
+
+    def ack(self, tool: str, items: list[str]) -> None: ...
+
+    def requeue(self, tool: str, items: list[str]) -> None: ...
+
+    def recover(self, tool: str) -> int: ...
+
+    def depth(self, tool: str) -> int: ...
+
+    def oldest(self, tool: str) -> str | None: ...
+
+
+class InMemoryWebhookBuffer:
+    """Process-local buffer for tests and single-process deployments."""
+
+    def __init__(self) -> None:
+        self._items: dict[str, deque[str]] = {}
+        self._processing: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def push(self, tool: str, items: list[str], max_depth: int) -> int:
+        with self._lock:
+            queue = self._items.setdefault(tool, deque())
+            if len(queue) + len(items) > max_depth:
+                raise WebhookBufferFullError(f"webhook buffer for {tool} is full")
+            queue.extend(items)
+            return len(queue)
+
+    def claim(self, tool: str, count: int) -> list[str]:
+        with self._lock:
+            queue = self._items.get(tool, deque())
+            items = [queue.popleft() for _ in range(min(count, len(queue)))]
+            self._processing.setdefault(tool, []).extend(items)
+            return items
+
+    def _release(self, tool: str, items: list[str]) -> None:
+        processing = self._processing.get(tool, [])
+        for item in items:
+            if item in processing:
+                processing.remove(item)
+
+    def ack(self, tool: str, items: list[str]) -> None:
+        with self._lock:
+            self._release(tool, items)
+
+    def requeue(self, tool: str, items: list[str]) -> None:
+        with self._lock:
+            self._release(tool, items)
+            self._items.setdefault(tool, deque()).extendleft(reversed(items))
+
+    def recover(self, tool: str) -> int:
+        with self._lock:
+            items = self._processing.pop(tool, [])
+            self._items.setdefault(tool, deque()).extendleft(reversed(items))
+            return len(items)
+
+    def processing(self, tool: str) -> list[str]:
+        with self._lock:
+            return list(self._processing.get(tool, ()))
+
+    def depth(self, tool: str) -> int:
+        with self._lock:
+            return len(self._items.get(tool, ()))
+
+    def oldest(self, tool: str) -> str | None:
+        with self._lock:
+            queue = self._items.get(tool)
+            return queue[0] if queue else None
+
+
+# Each script runs atomically, so concurrent API processes and batchers never interleave.
+_PUSH = """
+if redis.call('LLEN', KEYS[1]) + #ARGV - 1 > tonumber(ARGV[1]) then
+  return -1
+end
+for i = 2, #ARGV do
+  redis.call('RPUSH', KEYS[1], ARGV[i])
+end
+return redis.call('LLEN', KEYS[1])
+"""
+_CLAIM = """
+local items = {}
+for _ = 1, tonumber(ARGV[1]) do
+  local item = redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT')
+  if not item then
+    break
+  end
+  items[#items + 1] = item
+end
+return items
+"""
+_ACK = """
+for i = 1, #ARGV do
+  redis.call('LREM', KEYS[1], 1, ARGV[i])
+end
+return #ARGV
+"""
+_REQUEUE = """
+for i = #ARGV, 1, -1 do
+  redis.call('LREM', KEYS[2], 1, ARGV[i])
+  redis.call('LPUSH', KEYS[1], ARGV[i])
+end
+return #ARGV
+"""
+_RECOVER = """
+local moved = 0
+while redis.call('LMOVE', KEYS[2], KEYS[1], 'RIGHT', 'LEFT') do
+  moved = moved + 1
+end
+return moved
+"""
+
+
+class RedisWebhookBuffer:
+    """Per-tool Redis lists ``ocg:webhook:{tool}`` (pending) and ``...:processing``."""
+
+    def __init__(self, redis: Redis, prefix: str = "ocg:webhook:") -> None:
+        self._redis = redis
+        self._prefix = prefix
+        self._push = redis.register_script(_PUSH)
+        self._claim = redis.register_script(_CLAIM)
+        self._ack = redis.register_script(_ACK)
+        self._requeue = redis.register_script(_REQUEUE)
+        self._recover = redis.register_script(_RECOVER)
+
+    def _keys(self, tool: str) -> list[str]:
+        return [f"{self._prefix}{tool}", f"{self._prefix}{tool}:processing"]
+
+    def push(self, tool: str, items: list[str], max_depth: int) -> int:
+        depth = int(self._push(keys=self._keys(tool)[:1], args=[max_depth, *items]))
+        if depth < 0:
+            raise WebhookBufferFullError(f"webhook buffer for {tool} is full")
+        return depth
+
+    def claim(self, tool: str, count: int) -> list[str]:
+        return [as_text(item) for item in self._claim(keys=self._keys(tool), args=[count])]
+
+    def ack(self, tool: str, items: list[str]) -> None:
+        if items:
+            self._ack(keys=self._keys(tool)[1:], args=items)
+
+    def requeue(self, tool: str, items: list[str]) -> None:
+        if items:
+            self._requeue(keys=self._keys(tool), args=items)
+
+    def recover(self, tool: str) -> int:
+        return int(self._recover(keys=self._keys(tool)))
+
+    def depth(self, tool: str) -> int:
+        return int(self._redis.llen(self._keys(tool)[0]))
+
+    def oldest(self, tool: str) -> str | None:
+        item = self._redis.lindex(self._keys(tool)[0], 0)
+        return as_text(item) if item is not None else None
+
+
+_buffer: WebhookBuffer | None = None
+
+
+def set_webhook_buffer(buffer: WebhookBuffer | None) -> None:
+    global _buffer
+    _buffer = buffer
+
+
+def webhook_buffer() -> WebhookBuffer:
+    global _buffer
+    if _buffer is None:
+        _buffer = RedisWebhookBuffer(Redis.from_url(get_settings().redis_url))
+    return _buffer
+
+
+def webhook_secret(config: dict[str, Any]) -> str | None:
+    secret_ref = str(config.get("webhook_secret_ref", ""))
+    if not secret_ref.startswith("env:"):
+        return None
+    return os.environ.get(secret_ref.removeprefix("env:")) or None
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check ``sha256=<hex>`` HMAC of the raw request body."""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.removeprefix("sha256="))
+
+
+def _encode(event: ConnectorEvent) -> str:
+    return json.dumps(
+        {
+            "external_event_id": event.external_event_id,
+            "fetched_at": event.fetched_at.isoformat(),
+            "payload_json": event.payload_json,
+            "permission_state": event.permission_state,
+        }
+    )
+
+
+def _decode(tool: str, item: str) -> ConnectorEvent:
+    data = json.loads(item)
+    return ConnectorEvent(
+        tool=tool,
+        external_event_id=data["external_event_id"],
+        fetched_at=datetime.fromisoformat(data["fetched_at"]),
+        payload_json=data["payload_json"],
+        permission_state=data["permission_state"],
+    )
+
+
+def buffer_webhook_events(
+    tool: str, events: list[ConnectorEvent], *, buffer: WebhookBuffer | None = None
+) -> int:
+    """Append validated events to the tool's buffer and return its depth."""
+    buffer = buffer or webhook_buffer()
+    depth = buffer.push(
+        tool, [_encode(event) for event in events], get_settings().webhook_buffer_max_events
+    )
+    INGEST_BACKLOG_DEPTH.labels(queue=f"webhook:{tool}").set(depth)
+    return depth
+
+
+def flush_due(
+    tool: str,
+    *,
+    buffer: WebhookBuffer,
+    batch_size: int,
+    flush_interval_ms: int,
+    now: datetime | None = None,
+) -> bool:
+    """Whether ``batch_size`` events are waiting or the oldest is ``flush_interval_ms`` old."""
+    if buffer.depth(tool) >= batch_size:
+        return True
+    oldest = buffer.oldest(tool)
+    if oldest is None:
+        return False
+    received_at = datetime.fromisoformat(json.loads(oldest)["fetched_at"])
+    waited = (now or datetime.now(tz=UTC)) - received_at
+    return waited.total_seconds() * 1000 >= flush_interval_ms
+
+
+def flush_webhook_events(
+    db: Session,
+    connector: Connector,
+    config: dict,
+    *,
+    buffer: WebhookBuffer | None = None,
+    max_events: int | None = None,
+) -> dict[str, int]:
+    """Write up to ``max_events`` buffered events through the normal ingest path.
+
+    The batch is one event page, so it commits in one transaction; webhook pages carry no
+    cursors, leaving polling high-water marks untouched. The batch stays in the processing
+    list until that commit, so delivery is at-least-once; a batch replayed after a crash is
+    deduplicated by the ``raw_event`` natural key. On failure the batch is put back at the
+    head of the buffer.
+    """
+    buffer = buffer or webhook_buffer()
+    items = buffer.claim(connector.tool, max_events or get_settings().webhook_batch_size)
+    if not items:
+        return {"events": 0, "raw_event": 0, "trace_event": 0, "quarantined": 0}
+    try:
+        events = [_decode(connector.tool, item) for item in items]
+        result = ingest.ingest_connector_batch(
+            db, connector, config, acl_pages=[], event_pages=[EventPage(events=events)]
+        )
+    except Exception:
+        db.rollback()
+        buffer.requeue(connector.tool, items)
+        raise
+    buffer.ack(connector.tool, items)
+    INGEST_BACKLOG_DEPTH.labels(queue=f"webhook:{connector.tool}").set(buffer.depth(connector.tool))
+    return {
+        "events": len(events),
+        "raw_event": result["raw_event"],
+        "trace_event": result["trace_event"],
+        "quarantined": result["quarantined"],
+    }
+
+
+def run_batcher(
+    load_targets: Callable[[], dict[str, tuple[Connector, dict]]],
+    session_factory: Callable[[], Session],
+    *,
+    batch_size: int,
+    flush_interval_ms: int,
+    buffer: WebhookBuffer | None = None,
+    once: bool = False,
+    targets_ttl_seconds: float = 5.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Flush every enabled tool's buffer whenever ``flush_due``; loops until ``once``.
+
+    Batches a previous batcher claimed but never committed or requeued are returned to the
+    head of their buffer the first time each tool is seen, so run one batcher per deployment.
+    """
+    buffer = buffer or webhook_buffer()
+    recovered: set[str] = set()
+    tick = max(flush_interval_ms / 5, 10) / 1000
+    targets: dict[str, tuple[Connector, dict]] = {}
+    loaded_at = float("-inf")
+    while True:
+        if time.monotonic() - loaded_at >= targets_ttl_seconds:
+            targets = load_targets()
+            loaded_at = time.monotonic()
+        for tool, (connector, config) in targets.items():
+            if tool not in recovered:
+                buffer.recover(tool)
+                recovered.add(tool)
+            while flush_due(
+                tool, buffer=buffer, batch_size=batch_size, flush_interval_ms=flush_interval_ms
+            ):
+                db = session_factory()
+                try:
+                    flush_webhook_events(
+                        db, connector, config, buffer=buffer, max_events=batch_size
+                    )
+                except Exception:  # noqa: BLE001 - the batch was requeued; retry next tick
+                    CONNECTOR_ERRORS.labels(tool=tool, reason="webhook_flush_failed").inc()
+                    break
+                finally:
+                    db.close()
+        if once:
+            return
+        sleep(tick)
@@ -1,3 +1,8 @@
+import hashlib
+from datetime import datetime
+
+from redis import Redis
+from redis.exceptions import RedisError
 from sqlalchemy import select
 
 from ocg.connectors.registry import CONNECTOR_REGISTRY
@@ -6,6 +11,7 @@ from ocg.core.settings import get_settings
 from ocg.db import models
 from ocg.db.session import SessionLocal
 from ocg.services import aggregation, identity, ingest, kg, personal
+from ocg.services.reliability import CircuitOpenError
 
 
 def run_connector_ingest(tool: str) -> dict[str, object]:
@@ -25,7 +31,13 @@ def run_connector_ingest(tool: str) -> dict[str, object]:
                     status = str(payload["status"])
                     return payload
                 connector = CONNECTOR_REGISTRY[tool]
-                result = ingest.ingest_connector_batch(db, connector, config_row.config_json)
+                try:
+                    result = ingest.ingest_connector_batch(db, connector, config_row.config_json)
+                except CircuitOpenError:
+                    db.rollback()
+                    payload = {"status": "skipped", "reason": "circuit open"}
+                    status = str(payload["status"])
+                    return payload
                 payload = {"status": "ok", "result": result}
                 status = str(payload["status"])
                 return payload
@@ -37,6 +49,27 @@ def run_connector_ingest(tool: str) -> dict[str, object]:
         db.close()
 
 
+def run_connector_cycle() -> dict[str, object]:
+    db = SessionLocal()
+    status = "error"
+    try:
+        with traced_span("worker.connector_cycle"):
+            with WORKER_JOB_DURATION.labels(job="connector_cycle").time():
+                targets = ingest.enabled_connector_targets(db)
+                payload: dict[str, object] = {
+                    "status": "ok",
+                    "connectors": ingest.sync_connectors(db, targets),
+                }
+                status = str(payload["status"])
+                return payload
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        WORKER_JOBS_TOTAL.labels(job="connector_cycle", status=status).inc()
+        db.close()
+
+
 def run_permissions_sync(tool: str) -> dict[str, object]:
     db = SessionLocal()
     status = "error"
@@ -54,7 +87,13 @@ def run_permissions_sync(tool: str) -> dict[str, object]:
                     status = str(payload["status"])
                     return payload
                 connector = CONNECTOR_REGISTRY[tool]
-                result = ingest.sync_permissions(db, connector, config_row.config_json)
+                try:
+                    result = ingest.sync_permissions(db, connector, config_row.config_json)
+                except CircuitOpenError:
+                    db.rollback()
+                    payload = {"status": "skipped", "reason": "circuit open"}
+                    status = str(payload["status"])
+                    return payload
                 payload = {"status": "ok", "result": result}
                 status = str(payload["status"])
                 return payload
@@ -66,17 +105,60 @@ def run_permissions_sync(tool: str) -> dict[str, object]:
         db.close()
 
 
+def run_replay(tool: str, since: str | None = None, until: str | None = None) -> dict[str, object]:
+    db = SessionLocal()
+    status = "error"
+    try:
+        with traced_span("worker.replay"):
+            with WORKER_JOB_DURATION.labels(job="replay").time():
+                connector = CONNECTOR_REGISTRY[tool]
+                result = ingest.replay_raw_events(
+                    db,
+                    connector,
+                    since=datetime.fromisoformat(since) if since else None,
+                    until=datetime.fromisoformat(until) if until else None,
+                )
+                payload: dict[str, object] = {"status": "ok", "result": result}
+                status = str(payload["status"])
+                return payload
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        WORKER_JOBS_TOTAL.labels(job="replay", status=status).inc()
+        db.close()
+
+
+def personal_refresh_key(person_id: str, principal_ids: list[str]) -> str:
+    """Dedup key of a pending ``personal_graph`` job for this person and principal set."""
+    principals = ",".join(sorted(set(principal_ids)))
+    fingerprint = hashlib.sha256(principals.encode("utf-8")).hexdigest()[:16]
+    return f"ocg:personal_refresh:{person_id}:{fingerprint}"
+
+
+def _release_personal_refresh(person_id: str, principal_ids: list[str]) -> None:
+    try:
+        conn = Redis.from_url(get_settings().redis_url)
+        try:
+            conn.delete(personal_refresh_key(person_id, principal_ids))
+        finally:
+            conn.close()
+    except RedisError:
+        # The key still expires after worker_job_timeout_seconds.
+        return
+
+
 def run_personal_graph(person_id: str, principal_ids: list[str]) -> dict[str, object]:
     db = SessionLocal()
     status = "error"
     try:
         with traced_span("worker.personal_graph"):
             with WORKER_JOB_DURATION.labels(job="personal_graph").time():
-                timeline_count = personal.build_personal_timeline(db, person_id, principal_ids)
+                timeline = personal.refresh_personal_timeline(db, person_id, principal_ids)
                 task_count = personal.cluster_personal_tasks(db, person_id)
                 payload: dict[str, object] = {
                     "status": "ok",
-                    "timeline_items": timeline_count,
+                    "timeline": timeline,
                     "tasks": task_count,
                 }
                 status = str(payload["status"])
@@ -87,6 +169,47 @@ def run_personal_graph(person_id: str, principal_ids: list[str]) -> dict[str, ob
     finally:
         WORKER_JOBS_TOTAL.labels(job="personal_graph", status=status).inc()
         db.close()
+        _release_personal_refresh(person_id, principal_ids)
+
+
+def run_personal_refresh() -> dict[str, object]:
+    db = SessionLocal()
+    status = "error"
+    try:
+        with traced_span("worker.personal_refresh"):
+            with WORKER_JOB_DURATION.labels(job="personal_refresh").time():
+                payload: dict[str, object] = {
+                    "status": "ok",
+                    "result": personal.refresh_personal_graphs(db),
+                }
+                status = str(payload["status"])
+                return payload
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        WORKER_JOBS_TOTAL.labels(job="personal_refresh", status=status).inc()
+        db.close()
+
+
+def run_personal_tasks_bulk(since: str | None = None) -> dict[str, object]:
+    db = SessionLocal()
+    status = "error"
+    try:
+        with traced_span("worker.personal_tasks_bulk"):
+            with WORKER_JOB_DURATION.labels(job="personal_tasks_bulk").time():
+                result = personal.cluster_all_personal_tasks(
+                    db, since=datetime.fromisoformat(since) if since else None
+                )
+                payload: dict[str, object] = {"status": "ok", "result": result}
+                status = str(payload["status"])
+                return payload
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        WORKER_JOBS_TOTAL.labels(job="personal_tasks_bulk", status=status).inc()
+        db.close()
 
 
 def run_kg_and_identity() -> dict[str, object]:
@@ -10,6 +10,7 @@ from ocg.core.observability import INGEST_BACKLOG_DEPTH
 from ocg.core.settings import get_settings
 from ocg.db import models
 from ocg.db.session import SessionLocal
+from ocg.services import ingest, webhooks
 from ocg.workers import jobs
 from ocg.workers.queues import (
     AGGREGATE_CONTEXT_QUEUE,
@@ -17,6 +18,7 @@ from ocg.workers.queues import (
     CONNECTOR_INGEST_QUEUE,
     NORMALIZE_QUEUE,
     PERMISSIONS_SYNC_QUEUE,
+    PERSONAL_GRAPH_QUEUE,
 )
 
 
@@ -101,10 +103,60 @@ def enqueue_connector_sync(tool: str, *, connection: Redis | None = None) -> dic
             conn.close()
 
 
+def enqueue_replay(
+    tool: str,
+    *,
+    since: str | None = None,
+    until: str | None = None,
+    connection: Redis | None = None,
+) -> dict[str, str]:
+    own_connection = connection is None
+    conn = connection or redis_connection()
+    try:
+        job = _enqueue_job(NORMALIZE_QUEUE, jobs.run_replay, tool, since, until, connection=conn)
+        refresh_queue_depth_metrics(conn)
+        return {"replay_job_id": job.id}
+    finally:
+        if own_connection:
+            conn.close()
+
+
+def enqueue_personal_graph(
+    person_id: str, principal_ids: list[str], *, connection: Redis | None = None
+) -> dict[str, str | None]:
+    """Enqueue a timeline/task refresh unless one is pending for this person and principal set.
+
+    The job deletes the dedup key when it finishes, so later reads can enqueue again.
+    """
+    own_connection = connection is None
+    conn = connection or redis_connection()
+    try:
+        pending = conn.set(
+            jobs.personal_refresh_key(person_id, principal_ids),
+            1,
+            nx=True,
+            ex=get_settings().worker_job_timeout_seconds,
+        )
+        if not pending:
+            return {"personal_graph_job_id": None}
+        job = _enqueue_job(
+            PERSONAL_GRAPH_QUEUE,
+            jobs.run_personal_graph,
+            person_id,
+            sorted(set(principal_ids)),
+            connection=conn,
+        )
+        return {"personal_graph_job_id": job.id}
+    finally:
+        if own_connection:
+            conn.close()
+
+
 def enqueue_cycle(
     *,
     include_identity: bool = True,
     include_aggregation: bool = True,
+    include_personal: bool = True,
     connection: Redis | None = None,
 ) -> dict:
     own_connection = connection is None
@@ -120,9 +172,12 @@ def enqueue_cycle(
         finally:
             db.close()
 
-        connector_jobs: dict[str, dict[str, str]] = {}
-        for tool in tools:
-            connector_jobs[tool] = enqueue_connector_sync(tool, connection=conn)
+        # One job fetches all enabled connectors concurrently (see ingest.sync_connectors).
+        connector_job_id = None
+        if tools:
+            connector_job_id = _enqueue_job(
+                CONNECTOR_INGEST_QUEUE, jobs.run_connector_cycle, connection=conn
+            ).id
 
         identity_job_id = None
         if include_identity:
@@ -130,6 +185,12 @@ def enqueue_cycle(
                 NORMALIZE_QUEUE, jobs.run_kg_and_identity, connection=conn
             ).id
 
+        personal_job_id = None
+        if include_personal:
+            personal_job_id = _enqueue_job(
+                PERSONAL_GRAPH_QUEUE, jobs.run_personal_refresh, connection=conn
+            ).id
+
         aggregation_job_id = None
         if include_aggregation:
             aggregation_job_id = _enqueue_job(
@@ -139,8 +200,9 @@ def enqueue_cycle(
         depths = refresh_queue_depth_metrics(conn)
         return {
             "enabled_connectors": tools,
-            "connector_jobs": connector_jobs,
+            "connector_job_id": connector_job_id,
             "identity_job_id": identity_job_id,
+            "personal_job_id": personal_job_id,
             "aggregation_job_id": aggregation_job_id,
             "queue_depths": depths,
         }
@@ -167,6 +229,7 @@ def run_scheduler(
     once: bool = False,
     include_identity: bool = True,
     include_aggregation: bool = True,
+    include_personal: bool = True,
 ) -> None:
     if interval_seconds <= 0:
         raise ValueError("interval_seconds must be > 0")
@@ -175,7 +238,32 @@ def run_scheduler(
         enqueue_cycle(
             include_identity=include_identity,
             include_aggregation=include_aggregation,
+            include_personal=include_personal,
         )
         if once:
             return
         time.sleep(interval_seconds)
+
+
+def _webhook_targets() -> dict:
+    db = SessionLocal()
+    try:
+        return ingest.enabled_connector_targets(db)
+    finally:
+        db.close()
+
+
+def run_webhook_batcher(
+    *,
+    batch_size: int | None = None,
+    flush_interval_ms: int | None = None,
+    once: bool = False,
+) -> None:
+    settings = get_settings()
+    webhooks.run_batcher(
+        _webhook_targets,
+        SessionLocal,
+        batch_size=batch_size or settings.webhook_batch_size,
+        flush_interval_ms=flush_interval_ms or settings.webhook_flush_interval_ms,
+        once=once,
+    )
@@ -6,6 +6,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from ocg.db.base import Base
+from ocg.services import personal_cache
+from ocg.services.reliability import InMemoryCircuitStore, set_circuit_store
+from ocg.services.webhooks import InMemoryWebhookBuffer, set_webhook_buffer
 
 
 @pytest.fixture()
@@ -25,3 +28,30 @@ def db_session() -> Generator[Session, None, None]:
 @pytest.fixture()
 def now() -> datetime:
     return datetime(2026, 2, 7, 10, 0, 0, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def circuit_store() -> Generator[InMemoryCircuitStore, None, None]:
+    # Keep connector circuit state per test and off the shared Redis store.
+    store = InMemoryCircuitStore()
+    set_circuit_store(store)
+    yield store
+    set_circuit_store(None)
+
+
+@pytest.fixture(autouse=True)
+def webhook_buffer() -> Generator[InMemoryWebhookBuffer, None, None]:
+    buffer = InMemoryWebhookBuffer()
+    set_webhook_buffer(buffer)
+    yield buffer
+    set_webhook_buffer(None)
+
+
+@pytest.fixture(autouse=True)
+def personal_versions() -> Generator[personal_cache.InMemoryVersionStore, None, None]:
+    store = personal_cache.InMemoryVersionStore()
+    personal_cache.set_version_store(store)
+    personal_cache.set_page_cache(personal_cache.PageCache(max_entries=128, ttl_seconds=60))
+    yield store
+    personal_cache.set_version_store(None)
+    personal_cache.set_page_cache(None)
@@ -1,3 +1,4 @@
+import time
 from datetime import UTC, datetime, timedelta
 
 import jwt
@@ -10,6 +11,7 @@ from ocg.api.deps import get_db
 from ocg.core.settings import get_settings
 from ocg.db.base import Base
 from ocg.main import create_app
+from ocg.services import ingest
 
 
 def _build_client() -> tuple[TestClient, sessionmaker]:
@@ -98,3 +100,39 @@ def test_admin_rbac_enforced():
     )
     assert denied.status_code == 403
     assert allowed.status_code == 200
+
+
+def test_connector_health_reports_circuit_state(circuit_store):
+    client, LocalSession = _build_client()
+    db = LocalSession()
+    try:
+        ingest.set_connector_enabled(db, "jira", True, {"auth": {"token_ref": "env:JIRA_TOKEN"}})
+    finally:
+        db.close()
+    headers = {"Authorization": f"Bearer {_token('admin')}"}
+
+    healthy = client.get("/api/v1/admin/connectors/jira/health", headers=headers).json()
+    assert healthy["status"] == "healthy"
+    assert healthy["circuit"]["state"] == "closed"
+
+    circuit_store.trip("jira", time.time())
+    degraded = client.get("/api/v1/admin/connectors/jira/health", headers=headers).json()
+    assert degraded["status"] == "degraded"
+    assert degraded["circuit"]["state"] == "open"
+
+
+def test_quarantine_list_and_redrive_endpoints():
+    client, _ = _build_client()
+    headers = {"Authorization": f"Bearer {_token('admin')}"}
+
+    listed = client.get("/api/v1/admin/connectors/jira/quarantine", headers=headers)
+    assert listed.status_code == 200
+    assert listed.json() == {"tool": "jira", "total": 0, "items": []}
+
+    redriven = client.post("/api/v1/admin/connectors/jira/quarantine/redrive", headers=headers)
+    assert redriven.status_code == 200
+    assert redriven.json()["redrive"]["attempted"] == 0
+    assert (
+        client.get("/api/v1/admin/connectors/unknown/quarantine", headers=headers).status_code
+        == 404
+    )
@@ -30,7 +30,8 @@ def _seed_person(db, person_id: str) -> None:
 
 
 def test_ingest_to_analytics_pipeline(db_session):
-    for tool, connector in CONNECTOR_REGISTRY.items():
+    for tool in ("slack", "jira", "github"):
+        connector = CONNECTOR_REGISTRY[tool]
         config = {"auth": {"token_ref": f"env:{tool.upper()}_TOKEN"}, "scopes": ["read:default"]}
         ingest.set_connector_enabled(db_session, tool, True, config)
         ingest.ingest_connector_batch(db_session, connector, config)
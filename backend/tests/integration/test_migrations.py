@@ -29,6 +29,7 @@ def test_alembic_upgrade_and_downgrade(tmp_path):
         names = {row[0] for row in rows}
         assert "ix_trace_event_tool_action_time" in names
         assert "ix_context_edge_pattern_from_prob" in names
+        assert "ix_personal_task_member_event" in names
     finally:
         engine.dispose()
 
@@ -0,0 +1,39 @@
+from sqlalchemy import func, select
+
+from ocg.db import models
+from ocg.services import ingest
+from tests.unit.test_ingest_bulk import BatchConnector, CursorConnector
+
+
+def _count(db_session, model) -> int:
+    return db_session.scalar(select(func.count()).select_from(model))
+
+
+def test_backfill_merges_staged_pages_idempotently(db_session, now):
+    connector = BatchConnector(now, 10)
+    result = ingest.backfill_connector(db_session, connector, {}, page_size=4)
+    assert result["raw_event"] == 10
+    assert result["trace_event"] == 10
+    assert result["pages"] == 3
+    assert result["resources_inserted"] == 7
+    stages = result["stages"]
+    assert set(stages) == set(ingest.BACKFILL_STAGES)
+    assert stages["fetch"]["rows"] == 11
+    assert stages["merge"]["rows"] == 20
+    assert _count(db_session, models.TraceEvent) == 10
+
+    again = ingest.backfill_connector(db_session, connector, {}, page_size=4)
+    assert again["raw_event"] == 0
+    assert again["trace_event"] == 0
+    assert _count(db_session, models.RawEvent) == 10
+
+
+def test_backfill_only_records_missing_cursors(db_session, now):
+    connector = CursorConnector(now, 6)
+    ingest.backfill_connector(db_session, connector, {}, page_size=4)
+    assert ingest.load_connector_cursors(db_session, "batch") == {"ENG": "5"}
+
+    connector._count = 9
+    ingest.ingest_connector_batch(db_session, connector, {})
+    ingest.backfill_connector(db_session, connector, {})
+    assert ingest.load_connector_cursors(db_session, "batch") == {"ENG": "8"}
@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func, select
+
+from ocg.connectors.fetch import prefetch_pages
+from ocg.core.observability import CONNECTOR_ERRORS
+from ocg.db import models
+from ocg.services import ingest
+from ocg.services.reliability import CircuitOpenError
+from tests.unit.test_ingest_bulk import BatchConnector
+
+
+class BarrierConnector(BatchConnector):
+    """Event fetches only complete once every tool's fetch is in flight at the same time."""
+
+    def __init__(self, now, tool: str, barrier: threading.Barrier) -> None:
+        super().__init__(now, 3)
+        self.tool = tool
+        self.barrier = barrier
+
+    def fetch_events(self, config, cursors=None):
+        self.barrier.wait(timeout=5)
+        return [
+            event.__class__(**{**event.__dict__, "tool": self.tool})
+            for event in super().fetch_events(config)
+        ]
+
+
+class BrokenFetchConnector(BatchConnector):
+    tool = "broken"
+
+    def fetch_events(self, config, cursors=None):
+        raise ConnectionError("vendor down")
+
+
+def test_prefetch_preserves_order_and_surfaces_errors():
+    def pages():
+        yield 1
+        yield 2
+        raise ConnectionError("vendor down")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        stream = prefetch_pages(pages(), tool="batch", executor=executor, depth=1)
+        assert next(stream) == 1
+        assert next(stream) == 2
+        with pytest.raises(ConnectionError):
+            next(stream)
+
+
+def test_prefetch_close_stops_producer():
+    produced = []
+
+    def pages():
+        for i in range(1_000):
+            produced.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        stream = prefetch_pages(pages(), tool="batch", executor=executor, depth=2)
+        assert next(stream) == 0
+        stream.close()
+    assert len(produced) < 10
+
+
+def test_sync_connectors_fetches_tools_concurrently(db_session, now):
+    barrier = threading.Barrier(3)
+    targets = {
+        tool: (BarrierConnector(now, tool, barrier), {}) for tool in ("alpha", "beta", "gamma")
+    }
+    results = ingest.sync_connectors(db_session, targets)
+    assert {tool: result["status"] for tool, result in results.items()} == {
+        "alpha": "ok",
+        "beta": "ok",
+        "gamma": "ok",
+    }
+    assert results["alpha"]["ingest"]["trace_event"] == 3
+    assert db_session.scalar(select(func.count()).select_from(models.TraceEvent)) == 9
+
+
+def test_sync_connectors_isolates_failing_tool(db_session, now):
+    before = CONNECTOR_ERRORS.labels(tool="broken", reason="sync_failed")._value.get()
+    results = ingest.sync_connectors(
+        db_session,
+        {"batch": (BatchConnector(now, 4), {}), "broken": (BrokenFetchConnector(now, 4), {})},
+    )
+    assert results["batch"]["status"] == "ok"
+    assert results["broken"] == {"status": "error", "error": "ConnectionError"}
+    assert CONNECTOR_ERRORS.labels(tool="broken", reason="sync_failed")._value.get() == before + 1
+
+
+class UnreachableConnector(BatchConnector):
+    tool = "unreachable"
+
+    def __init__(self, now, total):
+        super().__init__(now, total)
+        self.fetch_calls = 0
+
+    def fetch_acls(self, config):
+        self.fetch_calls += 1
+        raise ConnectionError("vendor down")
+
+    def fetch_events(self, config, cursors=None):
+        return self.fetch_acls(config)
+
+
+def test_open_circuit_skips_vendor_fetches(db_session, now, circuit_store):
+    connector = UnreachableConnector(now, 4)
+    for _ in range(5):
+        with pytest.raises(ConnectionError):
+            ingest.ingest_connector_batch(db_session, connector, {})
+    with pytest.raises(CircuitOpenError):
+        ingest.ingest_connector_batch(db_session, connector, {})
+    assert connector.fetch_calls == 5
+    assert circuit_store.read("unreachable")["state"] == "open"
@@ -0,0 +1,174 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from ocg.connectors.jira import JiraConnector
+from ocg.connectors.transport import (
+    ConnectorTransport,
+    RateLimitedError,
+    TokenBucket,
+    close_transports,
+    parse_retry_after,
+)
+from ocg.core.observability import RATE_LIMITED_TOTAL
+from ocg.services.reliability import RetryPolicy
+
+
+class _StubVendor(BaseHTTPRequestHandler):
+    # http.server builds a handler per request, so the stub's state lives on the class.
+    throttle_remaining = 0
+    requests: ClassVar[list[str]] = []
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        if type(self).throttle_remaining > 0:
+            type(self).throttle_remaining -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        query = parse_qs(urlparse(self.path).query)
+        if urlparse(self.path).path == "/rest/api/3/search":
+            start, size = int(query["startAt"][0]), int(query["maxResults"][0])
+            issues = [
+                {
+                    "key": f"ENG-{i}",
+                    "fields": {
+                        "updated": f"2026-02-07T10:0{i}:00.000+0000",
+                        "status": {"name": "Done"},
+                        "assignee": {"accountId": "demo-user"},
+                    },
+                }
+                for i in range(3)
+            ]
+            payload = {
+                "startAt": start,
+                "total": len(issues),
+                "issues": issues[start : start + size],
+            }
+        else:
+            payload = {"page": int(query.get("page", ["0"])[0])}
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        return
+
+
+@pytest.fixture()
+def vendor():
+    _StubVendor.throttle_remaining = 0
+    _StubVendor.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubVendor)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _transport(base_url: str, attempts: int = 3) -> ConnectorTransport:
+    return ConnectorTransport(
+        "stub",
+        base_url=base_url,
+        rate_per_second=1_000,
+        burst=10,
+        retry_policy=RetryPolicy(
+            max_attempts=attempts, base_delay_seconds=0.0, max_delay_seconds=0.0
+        ),
+    )
+
+
+def test_token_bucket_waits_for_refill_and_retry_after():
+    clock = {"now": 0.0}
+    waits: list[float] = []
+    bucket = TokenBucket(2.0, 2, clock=lambda: clock["now"], sleep=waits.append)
+    bucket.acquire()
+    bucket.acquire()
+    assert waits == []
+    bucket.acquire()
+    assert waits == [pytest.approx(0.5)]
+
+    clock["now"] = 10.0
+    bucket.pause(3.0)
+    bucket.acquire()
+    assert waits[-1] == pytest.approx(3.0)
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    from datetime import UTC, datetime
+
+    now = datetime(2026, 2, 7, 10, 0, 0, tzinfo=UTC)
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Sat, 07 Feb 2026 10:00:30 GMT", now=now) == 30.0
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after(None) is None
+
+
+def test_rate_limited_responses_are_counted_and_retried(vendor):
+    _StubVendor.throttle_remaining = 2
+    before = RATE_LIMITED_TOTAL.labels(tool="stub")._value.get()
+    transport = _transport(vendor)
+    try:
+        assert transport.get_json("/events", {"page": 3}) == {"page": 3}
+    finally:
+        transport.close()
+    assert len(_StubVendor.requests) == 3
+    assert RATE_LIMITED_TOTAL.labels(tool="stub")._value.get() == before + 2
+
+
+def test_rate_limit_surfaces_after_retry_budget(vendor):
+    _StubVendor.throttle_remaining = 5
+    transport = _transport(vendor, attempts=2)
+    try:
+        with pytest.raises(RateLimitedError):
+            transport.get_json("/events")
+    finally:
+        transport.close()
+
+
+def test_pages_are_fetched_concurrently_in_order(vendor):
+    transport = _transport(vendor)
+    try:
+        pages = transport.get_pages("/events", [{"page": i} for i in range(8)], max_concurrency=4)
+    finally:
+        transport.close()
+    assert pages == [{"page": i} for i in range(8)]
+
+
+def test_jira_search_pages_go_through_the_transport(vendor):
+    _StubVendor.throttle_remaining = 1
+    before = RATE_LIMITED_TOTAL.labels(tool="jira")._value.get()
+    connector = JiraConnector()
+    config = {
+        "base_url": vendor,
+        "auth": {"token_ref": "env:JIRA_TOKEN"},
+        "projects": ["ENG"],
+        "rate_limit_per_second": 1_000,
+    }
+    try:
+        connector.validate(config)
+        pages = list(connector.iter_event_pages(config, page_size=2))
+        resumed = connector.fetch_events(config, cursors=pages[-1].cursors)
+    finally:
+        close_transports()
+    assert [[event.payload_json["issue_key"] for event in page.events] for page in pages] == [
+        ["ENG-0", "ENG-1"],
+        ["ENG-2"],
+    ]
+    assert pages[-1].cursors == {"ENG": "2026-02-07T10:02:00+00:00"}
+    assert resumed == []
+    assert RATE_LIMITED_TOTAL.labels(tool="jira")._value.get() == before + 1
+    jql = parse_qs(urlparse(_StubVendor.requests[-1]).query)["jql"][0]
+    assert 'updated >= "2026-02-06"' in jql
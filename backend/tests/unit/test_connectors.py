@@ -15,3 +15,12 @@ def test_connectors_require_secret_ref(connector):
 def test_connectors_reject_write_scope(connector):
     with pytest.raises(ValueError):
         connector.validate({"auth": {"token_ref": "env:TOKEN"}, "scopes": ["repo:write"]})
+
+
+@pytest.mark.parametrize("connector", [SlackConnector(), JiraConnector(), GitHubConnector()])
+def test_connectors_skip_events_at_or_before_cursor(connector):
+    config = {"auth": {"token_ref": "env:TOKEN"}}
+    event = connector.fetch_events(config)[0]
+    scope = connector.scope_of(event)
+    assert connector.cursor_of(event) == event.payload_json["ts"]
+    assert connector.fetch_events(config, cursors={scope: "2999-01-01T00:00:00+00:00"}) == []
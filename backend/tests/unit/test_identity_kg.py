@@ -0,0 +1,61 @@
+from sqlalchemy import event, func, select
+
+from ocg.db import models
+from ocg.services import identity, kg
+
+
+def _seed(db, start: int, stop: int, now) -> None:
+    db.add_all(
+        [
+            models.TraceEvent(
+                tool="jira",
+                external_event_id=f"evt-{i}",
+                tool_family="tickets",
+                action_type="comment",
+                event_time=now,
+                actor_principal_id=f"user-{i % 3}",
+                resource_id=None,
+                related_resource_ids=[],
+                entity_tags_json={"entity_type_tags": ["Ticket"]},
+                metadata_json={},
+                permission_state="KNOWN",
+            )
+            for i in range(start, stop)
+        ]
+    )
+    db.commit()
+
+
+def _count_statements(db, fn) -> int:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return len(statements)
+
+
+def test_identity_and_kg_builders_are_idempotent(db_session, now):
+    _seed(db_session, 0, 12, now)
+    assert identity.resolve_identities(db_session) == {"identities_created": 3}
+    assert kg.infer_kg_entities(db_session) == {"entities_created": 1, "edges_created": 3}
+    assert identity.resolve_identities(db_session) == {"identities_created": 0}
+    assert kg.infer_kg_entities(db_session) == {"entities_created": 0, "edges_created": 0}
+    assert db_session.scalar(select(func.count()).select_from(models.KGEdge)) == 3
+    assert db_session.scalar(select(func.count()).select_from(models.PrincipalMembership)) == 3
+
+
+def test_builder_statements_do_not_grow_with_batch_size(db_session, now):
+    _seed(db_session, 0, 12, now)
+    small = _count_statements(db_session, lambda: identity.resolve_identities(db_session))
+    small += _count_statements(db_session, lambda: kg.infer_kg_entities(db_session))
+    _seed(db_session, 12, 120, now)
+    large = _count_statements(db_session, lambda: identity.resolve_identities(db_session))
+    large += _count_statements(db_session, lambda: kg.infer_kg_entities(db_session))
+    assert large <= small
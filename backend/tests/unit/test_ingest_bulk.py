@@ -0,0 +1,267 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+
+from ocg.connectors.base import Connector, ConnectorEvent, NormalizedTrace, ResourceDelta
+from ocg.db import models
+from ocg.services import ingest
+
+
+class BatchConnector(Connector):
+    tool = "batch"
+
+    def __init__(self, now, count: int) -> None:
+        self._now = now
+        self._count = count
+
+    def validate(self, config):
+        return None
+
+    def fetch_events(self, config, cursors=None):
+        events = [
+            ConnectorEvent(
+                tool=self.tool,
+                external_event_id=f"evt-{i}",
+                fetched_at=self._now,
+                payload_json={"ticket": f"T-{i % 7}", "actor": f"user-{i % 3}", "i": i},
+                permission_state="KNOWN",
+            )
+            for i in range(self._count)
+        ]
+        # Duplicate within the same batch must be ignored.
+        return events + events[:1]
+
+    def fetch_acls(self, config):
+        return [
+            ResourceDelta(
+                tool=self.tool,
+                resource_type="ticket",
+                external_id="T-0",
+                url=None,
+                title="",
+                permission_state="KNOWN",
+                acl_principal_ids=["group:analyst", "user-0"],
+            )
+        ]
+
+    def normalize(self, event):
+        payload = event.payload_json
+        trace = NormalizedTrace(
+            tool=self.tool,
+            tool_family="tickets",
+            action_type="comment",
+            external_event_id=event.external_event_id,
+            event_time=self._now + timedelta(minutes=payload["i"]),
+            actor_principal_id=payload["actor"],
+            resource_ref=("ticket", payload["ticket"]),
+            related_resource_refs=[],
+            entity_tags_json={"entity_type_tags": ["Ticket"]},
+            metadata_json={},
+            permission_state=event.permission_state,
+        )
+        delta = ResourceDelta(
+            tool=self.tool,
+            resource_type="ticket",
+            external_id=payload["ticket"],
+            url=None,
+            title="",
+            permission_state="KNOWN",
+            acl_principal_ids=[payload["actor"], "group:analyst"],
+        )
+        return trace, delta
+
+
+def _count_statements(db_session, fn):
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return len(statements)
+
+
+def test_bulk_ingest_dedups_within_and_across_batches(db_session, now):
+    connector = BatchConnector(now, 20)
+    first = ingest.ingest_connector_batch(db_session, connector, {})
+    assert first["raw_event"] == 20
+    assert first["trace_event"] == 20
+
+    second = ingest.ingest_connector_batch(db_session, connector, {})
+    assert second["raw_event"] == 0
+    assert second["trace_event"] == 0
+    assert db_session.scalar(select(func.count()).select_from(models.TraceEvent)) == 20
+    assert db_session.scalar(select(func.count()).select_from(models.Resource)) == 7
+    active_acl = db_session.scalar(
+        select(func.count())
+        .select_from(models.ResourceACL)
+        .where(models.ResourceACL.revoked_at.is_(None))
+    )
+    expected_pairs = {(f"T-{i % 7}", f"user-{i % 3}") for i in range(20)}
+    assert active_acl == len(expected_pairs) + 7
+
+
+def test_bulk_ingest_statement_count_independent_of_batch_size(db_session, now):
+    small = _count_statements(
+        db_session,
+        lambda: ingest.ingest_connector_batch(db_session, BatchConnector(now, 10), {}),
+    )
+    db_session.query(models.TraceEvent).delete()
+    db_session.query(models.RawEvent).delete()
+    db_session.commit()
+    large = _count_statements(
+        db_session,
+        lambda: ingest.ingest_connector_batch(db_session, BatchConnector(now, 200), {}),
+    )
+    assert large <= small + 2
+
+
+class FailingPageConnector(BatchConnector):
+    def iter_event_pages(self, config, *, page_size, cursors=None):
+        pages = super().iter_event_pages(config, page_size=page_size, cursors=cursors)
+        for index, page in enumerate(pages):
+            if index == 2:
+                raise RuntimeError("vendor API went away")
+            yield page
+
+
+def test_ingest_commits_each_page(db_session, now):
+    result = ingest.ingest_connector_batch(db_session, BatchConnector(now, 25), {}, page_size=10)
+    assert result["pages"] == 3
+    assert result["trace_event"] == 25
+
+
+def test_crashed_ingest_keeps_committed_pages(db_session, now):
+    with pytest.raises(RuntimeError):
+        ingest.ingest_connector_batch(db_session, FailingPageConnector(now, 50), {}, page_size=10)
+    db_session.rollback()
+    assert db_session.scalar(select(func.count()).select_from(models.TraceEvent)) == 20
+
+    resumed = ingest.ingest_connector_batch(db_session, BatchConnector(now, 50), {}, page_size=10)
+    assert resumed["trace_event"] == 30
+
+
+class CursorConnector(BatchConnector):
+    def __init__(self, now, count: int) -> None:
+        super().__init__(now, count)
+        self.seen_cursors: list[dict[str, str]] = []
+
+    def fetch_events(self, config, cursors=None):
+        self.seen_cursors.append(dict(cursors or {}))
+        events = super().fetch_events(config)[: self._count]
+        start = int((cursors or {}).get("ENG", "-1")) + 1
+        return events[start:]
+
+    def scope_of(self, event):
+        return "ENG"
+
+    def cursor_of(self, event):
+        return str(event.payload_json["i"])
+
+
+def test_cursors_advance_with_each_committed_page(db_session, now):
+    connector = CursorConnector(now, 12)
+    ingest.ingest_connector_batch(db_session, connector, {}, page_size=5)
+    assert ingest.load_connector_cursors(db_session, "batch") == {"ENG": "11"}
+
+    connector._count = 15
+    result = ingest.ingest_connector_batch(db_session, connector, {}, page_size=5)
+    assert connector.seen_cursors[-1] == {"ENG": "11"}
+    assert result["raw_event"] == 3
+    assert ingest.load_connector_cursors(db_session, "batch") == {"ENG": "14"}
+
+
+class MutableAclConnector(BatchConnector):
+    def __init__(self, now, principals_by_ticket: dict[str, list[str]]) -> None:
+        super().__init__(now, 0)
+        self.principals_by_ticket = principals_by_ticket
+
+    def fetch_acls(self, config):
+        return [
+            ResourceDelta(
+                tool=self.tool,
+                resource_type="ticket",
+                external_id=ticket,
+                url=None,
+                title="",
+                permission_state="KNOWN",
+                acl_principal_ids=principals,
+            )
+            for ticket, principals in self.principals_by_ticket.items()
+        ]
+
+
+def _active_acl(db_session) -> set[tuple[str, str]]:
+    rows = db_session.execute(
+        select(models.Resource.external_id, models.ResourceACL.principal_id)
+        .join(models.ResourceACL, models.ResourceACL.resource_id == models.Resource.resource_id)
+        .where(models.ResourceACL.revoked_at.is_(None))
+    )
+    return {(row.external_id, row.principal_id) for row in rows}
+
+
+def test_sync_permissions_grants_and_revokes_differences(db_session, now):
+    connector = MutableAclConnector(now, {"T-1": ["a", "b"], "T-2": ["a"]})
+    first = ingest.sync_permissions(db_session, connector, {})
+    assert (first["resources"], first["acl_granted"], first["acl_revoked"]) == (2, 3, 0)
+
+    connector.principals_by_ticket = {"T-1": ["b", "c"], "T-2": ["a"]}
+    second = ingest.sync_permissions(db_session, connector, {})
+    assert (second["resources"], second["acl_granted"], second["acl_revoked"]) == (2, 1, 1)
+    assert _active_acl(db_session) == {("T-1", "b"), ("T-1", "c"), ("T-2", "a")}
+    revoked = db_session.scalars(
+        select(models.ResourceACL).where(models.ResourceACL.principal_id == "a")
+    ).all()
+    assert any(row.revoked_at is not None for row in revoked)
+
+
+def test_sync_permissions_statement_count_independent_of_acl_size(db_session, now):
+    def _run(count: int) -> int:
+        principals = {f"T-{i}": [f"p-{i}", f"p-{i + 1}"] for i in range(count)}
+        connector = MutableAclConnector(now, principals)
+        ingest.sync_permissions(db_session, connector, {})
+        connector.principals_by_ticket = {
+            ticket: [members[0], "group:all"] for ticket, members in principals.items()
+        }
+        return _count_statements(
+            db_session, lambda: ingest.sync_permissions(db_session, connector, {})
+        )
+
+    small = _run(5)
+    large = _run(150)
+    assert large <= small + 2
+
+
+def test_unchanged_resources_are_not_rewritten(db_session, now):
+    connector = MutableAclConnector(now, {"T-1": ["a"], "T-2": ["a"]})
+    first = ingest.sync_permissions(db_session, connector, {})
+    assert first["resources_inserted"] == 2
+
+    updates: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE RESOURCE "):
+            updates.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        second = ingest.sync_permissions(db_session, connector, {})
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    assert updates == []
+    assert (second["resources_updated"], second["resources_unchanged"]) == (0, 2)
+
+    connector.principals_by_ticket = {"T-1": ["a"]}
+    original = connector.fetch_acls
+    connector.fetch_acls = lambda config: [
+        ResourceDelta(**{**delta.__dict__, "title": "renamed"}) for delta in original(config)
+    ]
+    third = ingest.sync_permissions(db_session, connector, {})
+    assert third["resources_updated"] == 1
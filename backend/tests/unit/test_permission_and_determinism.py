@@ -1,9 +1,11 @@
 from datetime import timedelta
 
+from sqlalchemy import event, select
+
 from ocg.db import models
 from ocg.services.common import utcnow
-from ocg.services.personal import build_personal_timeline
 from ocg.services.permissions import PermissionEvaluator
+from ocg.services.personal import build_personal_timeline
 
 
 def _seed_identity(db, person_id: str) -> None:
@@ -118,3 +120,112 @@ def test_timeline_sort_is_deterministic(db_session, now):
         key=lambda item: item.sequence_rank,
     )
     assert [item.trace_event_id for item in items] == [first.trace_event_id, second.trace_event_id]
+
+
+def _event(resource_id: str | None, name: str, event_time) -> models.TraceEvent:
+    return models.TraceEvent(
+        tool="jira",
+        external_event_id=name,
+        tool_family="tickets",
+        action_type="comment",
+        event_time=event_time,
+        actor_principal_id="u1",
+        resource_id=resource_id,
+        related_resource_ids=[],
+        entity_tags_json={},
+        metadata_json={},
+        permission_state="KNOWN",
+    )
+
+
+def _seed_visibility_cases(db, now) -> list[models.TraceEvent]:
+    """Events on a group-granted, revoked, other-user, and UNKNOWN resource, then two more."""
+    _seed_identity(db, "u1")
+    resource_ids = []
+    for name, state, principal, revoked in (
+        ("granted", "KNOWN", "group:eng", None),
+        ("revoked", "KNOWN", "u1", utcnow()),
+        ("other", "KNOWN", "u2", None),
+        ("unknown", "UNKNOWN", "u1", None),
+    ):
+        resource = models.Resource(
+            tool="jira",
+            resource_type="ticket",
+            external_id=name,
+            url=None,
+            title=None,
+            permission_state=state,
+            created_at=utcnow(),
+            updated_at=utcnow(),
+        )
+        db.add(resource)
+        db.flush()
+        db.add(
+            models.ResourceACL(
+                resource_id=resource.resource_id,
+                principal_id=principal,
+                acl_source="jira",
+                granted_at=utcnow(),
+                revoked_at=revoked,
+            )
+        )
+        resource_ids.append(resource.resource_id)
+    events = [
+        _event(resource_id, f"evt-{index}", now + timedelta(minutes=index))
+        for index, resource_id in enumerate([*resource_ids, None, resource_ids[0]])
+    ]
+    db.add_all(events)
+    db.commit()
+    return events
+
+
+def test_filter_visible_events_is_set_based(db_session, now):
+    events = _seed_visibility_cases(db_session, now)
+    events.append(_event("missing", "evt-missing", now))
+
+    statements = []
+
+    def count(*args) -> None:
+        statements.append(args[2])
+
+    event.listen(db_session.bind, "before_cursor_execute", count)
+    try:
+        visible = PermissionEvaluator.filter_visible_events(
+            db_session, events=events, principal_ids=["u1", "group:eng"]
+        )
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", count)
+    assert [e.external_event_id for e in visible] == ["evt-0", "evt-4", "evt-5"]
+    assert len(statements) == 1
+
+
+def test_visibility_filters_push_the_same_rule_into_sql(db_session, now):
+    events = _seed_visibility_cases(db_session, now)
+    principals = ["u1", "group:eng"]
+    pushed = db_session.scalars(
+        select(models.TraceEvent.external_event_id)
+        .where(PermissionEvaluator.event_visibility_filter(principals))
+        .order_by(models.TraceEvent.event_time)
+    ).all()
+    in_python = PermissionEvaluator.filter_visible_events(
+        db_session, events=events, principal_ids=principals
+    )
+    assert pushed == [e.external_event_id for e in in_python] == ["evt-0", "evt-4", "evt-5"]
+
+    # Joined to resource, the trace clause must not correlate with the outer resource row.
+    joined = db_session.scalars(
+        select(models.Resource.external_id)
+        .join(models.TraceEvent, models.TraceEvent.resource_id == models.Resource.resource_id)
+        .where(
+            PermissionEvaluator.resource_visibility_filter(principals),
+            PermissionEvaluator.event_visibility_filter(principals),
+        )
+        .distinct()
+    ).all()
+    assert joined == ["granted"]
+    assert (
+        db_session.scalars(
+            select(models.Resource).where(PermissionEvaluator.resource_visibility_filter([]))
+        ).all()
+        == []
+    )
@@ -0,0 +1,412 @@
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+
+from ocg.core.settings import get_settings
+from ocg.db import models
+from ocg.services import aggregation, personal, personal_cache
+from ocg.services.common import utcnow
+from tests.integration.test_api_auth import _build_client, _token
+from tests.unit.test_permission_and_determinism import _seed_identity
+
+
+def _resource(db, external_id: str, principal_id: str, *, at) -> models.Resource:
+    resource = models.Resource(
+        tool="jira",
+        resource_type="ticket",
+        external_id=external_id,
+        url=None,
+        title=None,
+        permission_state="KNOWN",
+        created_at=at,
+        updated_at=at,
+    )
+    db.add(resource)
+    db.flush()
+    db.add(
+        models.ResourceACL(
+            resource_id=resource.resource_id,
+            principal_id=principal_id,
+            acl_source="jira",
+            granted_at=at,
+            revoked_at=None,
+        )
+    )
+    return resource
+
+
+def _event(db, name: str, event_time, resource, *, ingested_at=None) -> models.TraceEvent:
+    event = models.TraceEvent(
+        tool="jira",
+        external_event_id=name,
+        tool_family="tickets",
+        action_type="comment",
+        event_time=event_time,
+        actor_principal_id="u1",
+        resource_id=resource.resource_id,
+        related_resource_ids=[],
+        entity_tags_json={},
+        metadata_json={},
+        permission_state="KNOWN",
+        ingested_at=ingested_at or utcnow(),
+    )
+    db.add(event)
+    return event
+
+
+def _ranked(db) -> list[str]:
+    rows = db.execute(
+        select(models.TraceEvent.external_event_id)
+        .join(
+            models.PersonalTimelineItem,
+            models.PersonalTimelineItem.trace_event_id == models.TraceEvent.trace_event_id,
+        )
+        .order_by(models.PersonalTimelineItem.sequence_rank)
+    )
+    return list(rows.scalars())
+
+
+def _seed_history(db, now) -> models.Resource:
+    _seed_identity(db, "u1")
+    yesterday = utcnow() - timedelta(days=1)
+    resource = _resource(db, "ENG-1", "u1", at=yesterday)
+    for minute in (0, 10, 20):
+        _event(
+            db, f"old-{minute}", now + timedelta(minutes=minute), resource, ingested_at=yesterday
+        )
+    db.commit()
+    personal.build_personal_timeline(db, "u1", ["u1"])
+    return resource
+
+
+def test_new_events_are_merged_without_rebuild(db_session, now):
+    resource = _seed_history(db_session, now)
+    _event(db_session, "late", now + timedelta(minutes=5), resource)
+    _event(db_session, "new", now + timedelta(hours=1), resource)
+    db_session.commit()
+
+    result = personal.refresh_personal_timeline(db_session, "u1")
+    assert result == {"mode": "incremental", "added": 2, "removed": 0}
+    assert _ranked(db_session) == ["old-0", "late", "old-10", "old-20", "new"]
+    ranks = db_session.scalars(
+        select(models.PersonalTimelineItem.sequence_rank).order_by(
+            models.PersonalTimelineItem.sequence_rank
+        )
+    ).all()
+    assert ranks == [1, 2, 3, 4, 5]
+
+    # Nothing new: the refresh only moves the high-water mark.
+    assert personal.refresh_personal_timeline(db_session, "u1")["added"] == 0
+
+
+def test_acl_or_principal_change_forces_rebuild(db_session, now):
+    _seed_history(db_session, now)
+    acl = db_session.scalar(select(models.ResourceACL))
+    acl.revoked_at = utcnow()
+    db_session.commit()
+
+    assert personal.refresh_personal_timeline(db_session, "u1")["mode"] == "rebuild"
+    assert _ranked(db_session) == []
+
+    result = personal.refresh_personal_timeline(db_session, "u1", ["u1", "group:eng"])
+    assert result["mode"] == "rebuild"
+    assert personal.timeline_checkpoint(db_session, "u1")["principal_ids"] == ["group:eng", "u1"]
+
+
+def test_refresh_all_reclusters_changed_people(db_session, now):
+    resource = _seed_history(db_session, now)
+    # The first pass clusters the freshly built timeline; the second has nothing to do.
+    assert personal.refresh_personal_graphs(db_session)["reclustered"] == 1
+    assert personal.refresh_personal_graphs(db_session)["reclustered"] == 0
+    _event(db_session, "new", now + timedelta(hours=2), resource)
+    db_session.commit()
+    assert personal.refresh_personal_graphs(db_session) == {
+        "people": 1,
+        "rebuilt": 0,
+        "incremental": 1,
+        "reclustered": 1,
+    }
+    assert db_session.scalar(select(func.count()).select_from(models.PersonalTask)) == 2
+
+
+def test_personal_reads_do_not_write(monkeypatch):
+    enqueued = []
+    monkeypatch.setattr(
+        "ocg.workers.runtime.enqueue_personal_graph",
+        lambda person_id, principal_ids: enqueued.append((person_id, principal_ids)),
+    )
+    client, LocalSession = _build_client()
+    headers = {"Authorization": f"Bearer {_token('analyst')}"}
+    assert client.get("/api/v1/personal/timeline", headers=headers).json() == {
+        "items": [],
+        "next_cursor": None,
+    }
+    assert client.get("/api/v1/personal/tasks", headers=headers).json() == {
+        "tasks": [],
+        "next_cursor": None,
+    }
+    res = client.get("/api/v1/personal/timeline", headers=headers, params={"cursor": "nope"})
+    assert res.status_code == 400
+    assert enqueued == [("demo-user", ["demo-user", "group:analyst"])] * 3
+    db = LocalSession()
+    try:
+        assert personal.timeline_checkpoint(db, "demo-user") is None
+    finally:
+        db.close()
+
+
+def test_personal_reads_recheck_the_callers_current_principals(monkeypatch, now):
+    monkeypatch.setattr(
+        "ocg.workers.runtime.enqueue_personal_graph", lambda person_id, principal_ids: None
+    )
+    client, LocalSession = _build_client()
+    db = LocalSession()
+    try:
+        resource = _resource(db, "ENG-9", "group:admin", at=now)
+        _event(db, "admin-only", now, resource).actor_principal_id = "demo-user"
+        db.commit()
+        personal.build_personal_timeline(db, "demo-user", ["demo-user", "group:admin"])
+        personal.cluster_personal_tasks(db, "demo-user")
+    finally:
+        db.close()
+
+    admin = {"Authorization": f"Bearer {_token('admin')}"}
+    assert len(client.get("/api/v1/personal/timeline", headers=admin).json()["items"]) == 1
+    assert len(client.get("/api/v1/personal/tasks", headers=admin).json()["tasks"]) == 1
+    # The stored timeline was built with group:admin; an analyst token no longer has it.
+    analyst = {"Authorization": f"Bearer {_token('analyst')}"}
+    assert client.get("/api/v1/personal/timeline", headers=analyst).json()["items"] == []
+    assert client.get("/api/v1/personal/tasks", headers=analyst).json()["tasks"] == []
+
+
+def test_personal_pages_are_cached_and_revalidated_by_etag(monkeypatch, personal_versions):
+    enqueued = []
+    monkeypatch.setattr(
+        "ocg.workers.runtime.enqueue_personal_graph",
+        lambda person_id, principal_ids: enqueued.append(person_id),
+    )
+    client, _ = _build_client()
+    headers = {"Authorization": f"Bearer {_token('analyst')}"}
+    first = client.get("/api/v1/personal/timeline", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    # A cached page and a matching If-None-Match both skip the database and the scheduler.
+    assert client.get("/api/v1/personal/timeline", headers=headers).json() == first.json()
+    revalidated = client.get(
+        "/api/v1/personal/timeline", headers={**headers, "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert client.get("/api/v1/personal/tasks", headers=headers).headers["ETag"] != etag
+    assert enqueued == ["demo-user", "demo-user"]
+
+    # A worker bump reloads the page; unchanged content still revalidates.
+    personal_versions.bump(["demo-user"])
+    reloaded = client.get("/api/v1/personal/timeline", headers={**headers, "If-None-Match": etag})
+    assert reloaded.status_code == 304
+    assert len(enqueued) == 3
+
+    # The ETag follows the served content: after a lost bump, the reload on expiry is a 200.
+    page = {"items": [{"sequence_rank": 1}], "next_cursor": None}
+    monkeypatch.setattr(personal, "personal_timeline", lambda *args, **kwargs: page)
+    personal_cache.set_page_cache(personal_cache.PageCache(max_entries=128, ttl_seconds=60))
+    refreshed = client.get("/api/v1/personal/timeline", headers={**headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json() == page
+    assert refreshed.headers["ETag"] == f'"{personal_cache.page_etag(page)}"'
+
+
+def test_page_cache_evicts_least_recently_used_and_expires():
+    clock = [0.0]
+    cache = personal_cache.PageCache(max_entries=2, ttl_seconds=10, clock=lambda: clock[0])
+    etag = cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    assert cache.get("a") == (etag, {"n": 1})
+    cache.set("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == (personal_cache.page_etag({"n": 1}), {"n": 1})
+    clock[0] = 10.0
+    assert cache.get("c") is None
+
+
+def test_timeline_and_tasks_are_keyset_paginated(db_session, now):
+    resource = _seed_history(db_session, now)
+    for hour in (1, 2, 3):
+        _event(db_session, f"later-{hour}", now + timedelta(hours=hour), resource)
+    db_session.commit()
+    personal.refresh_personal_timeline(db_session, "u1")
+
+    ranks, cursor = [], None
+    while True:
+        page = personal.personal_timeline(db_session, "u1", None, None, limit=2, cursor=cursor)
+        assert len(page["items"]) <= 2
+        ranks += [item["sequence_rank"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert ranks == [6, 5, 4, 3, 2, 1]
+
+    window = personal.personal_timeline(
+        db_session,
+        "u1",
+        (now + timedelta(minutes=10)).isoformat(),
+        (now + timedelta(hours=2)).isoformat(),
+        limit=2,
+    )
+    assert [item["sequence_rank"] for item in window["items"]] == [4, 3]
+    rest = personal.personal_timeline(
+        db_session,
+        "u1",
+        (now + timedelta(minutes=10)).isoformat(),
+        (now + timedelta(hours=2)).isoformat(),
+        limit=2,
+        cursor=window["next_cursor"],
+    )
+    assert [item["sequence_rank"] for item in rest["items"]] == [2]
+    assert rest["next_cursor"] is None
+
+    # Bursts more than 30 minutes apart become separate tasks, newest first.
+    personal.cluster_personal_tasks(db_session, "u1")
+    first = personal.personal_tasks(db_session, "u1", limit=2)
+    second = personal.personal_tasks(db_session, "u1", limit=2, cursor=first["next_cursor"])
+    starts = [task["start_time"] for task in first["tasks"] + second["tasks"]]
+    assert len(starts) == 4
+    assert starts == sorted(starts, reverse=True)
+    assert second["next_cursor"] is None
+    assert (
+        personal.personal_tasks(db_session, "u1", (now + timedelta(hours=2)).isoformat(), None)[
+            "tasks"
+        ]
+        == first["tasks"]
+    )
+
+
+def _tasks(db) -> list[tuple[str, list[str]]]:
+    tasks = db.scalars(
+        select(models.PersonalTask.personal_task_id).order_by(models.PersonalTask.start_time)
+    ).all()
+    members: dict[str, list[str]] = {task_id: [] for task_id in tasks}
+    rows = db.execute(
+        select(
+            models.PersonalTaskMember.personal_task_id, models.PersonalTaskMember.trace_event_id
+        ).order_by(models.PersonalTaskMember.personal_task_id, models.PersonalTaskMember.ordinal)
+    ).all()
+    for task_id, trace_event_id in rows:
+        members[task_id].append(trace_event_id)
+    return list(members.items())
+
+
+def _assert_members_are_contiguous(db) -> None:
+    rows = db.execute(
+        select(models.PersonalTaskMember.personal_task_id, models.PersonalTaskMember.ordinal)
+    ).all()
+    ordinals: dict[str, list[int]] = {}
+    for task_id, ordinal in rows:
+        ordinals.setdefault(task_id, []).append(ordinal)
+    assert all(members for _, members in _tasks(db))
+    assert all(sorted(values) == list(range(len(values))) for values in ordinals.values())
+
+
+def test_task_clustering_reopens_only_the_changed_tail(db_session, now, monkeypatch):
+    # No overlap, so each refresh window holds only the events added since the last one.
+    monkeypatch.setattr(get_settings(), "personal_timeline_overlap_seconds", 0)
+    resource = _seed_history(db_session, now)
+    for minute in (120, 130):
+        _event(db_session, f"mid-{minute}", now + timedelta(minutes=minute), resource)
+    db_session.commit()
+    personal.refresh_personal_timeline(db_session, "u1")
+    assert personal.cluster_personal_tasks(db_session, "u1") == 2
+    first, second = _tasks(db_session)
+    assert personal.tasks_checkpoint(db_session, "u1") == {"dirty_from": None}
+
+    # In-order append within the gap extends the open session; the closed task is untouched.
+    _event(db_session, "mid-150", now + timedelta(minutes=150), resource)
+    db_session.commit()
+    personal.refresh_personal_timeline(db_session, "u1")
+    assert personal.tasks_checkpoint(db_session, "u1")["dirty_from"] is not None
+    assert personal.cluster_personal_tasks(db_session, "u1") == 2
+    tasks = _tasks(db_session)
+    assert tasks[0] == first
+    assert tasks[1][0] != second[0]
+    assert len(tasks[1][1]) == 3
+
+    # A late event bridging the two sessions merges them; the result matches a full rebuild.
+    _event(db_session, "bridge", now + timedelta(minutes=45), resource)
+    _event(db_session, "bridge-2", now + timedelta(minutes=70), resource)
+    _event(db_session, "bridge-3", now + timedelta(minutes=95), resource)
+    db_session.commit()
+    personal.refresh_personal_timeline(db_session, "u1")
+    assert personal.cluster_personal_tasks(db_session, "u1") == 1
+    incremental = [members for _, members in _tasks(db_session)]
+    personal.build_personal_timeline(db_session, "u1", ["u1"])
+    assert personal.tasks_checkpoint(db_session, "u1") is None
+    personal.cluster_personal_tasks(db_session, "u1")
+    assert [members for _, members in _tasks(db_session)] == incremental
+    _assert_members_are_contiguous(db_session)
+
+
+def test_bulk_clustering_matches_per_person_clustering(db_session, now):
+    resource = _seed_history(db_session, now)
+    _seed_identity(db_session, "u2")
+    db_session.add(
+        models.ResourceACL(
+            resource_id=resource.resource_id,
+            principal_id="u2",
+            acl_source="jira",
+            granted_at=utcnow() - timedelta(days=1),
+            revoked_at=None,
+        )
+    )
+    for minute in (0, 50, 60, 200):
+        event = _event(db_session, f"u2-{minute}", now + timedelta(minutes=minute), resource)
+        event.actor_principal_id = "u2"
+    db_session.commit()
+    personal.build_personal_timeline(db_session, "u2", ["u2"])
+    for person_id in ("u1", "u2"):
+        personal.cluster_personal_tasks(db_session, person_id)
+    per_person = sorted(members for _, members in _tasks(db_session))
+
+    assert personal.cluster_all_personal_tasks(db_session) == {"people": 2, "tasks": 4}
+    assert sorted(members for _, members in _tasks(db_session)) == per_person
+    assert personal.tasks_checkpoint(db_session, "u2") == {"dirty_from": None}
+
+    # A windowed pass reopens only tasks near ``since`` and leaves earlier ones in place.
+    before = {task_id for task_id, _ in _tasks(db_session)}
+    result = personal.cluster_all_personal_tasks(db_session, since=now + timedelta(minutes=150))
+    assert result == {"people": 2, "tasks": 1}
+    after = _tasks(db_session)
+    assert len(before & {task_id for task_id, _ in after}) == 3
+    assert sorted(members for _, members in after) == per_person
+    _assert_members_are_contiguous(db_session)
+
+    # Aggregation reads each task's events through the member rows, in timeline order.
+    personal.set_opt_in(db_session, "u2", True)
+    assert aggregation.abstract_opted_in_traces(db_session) == 3
+    traces = db_session.scalars(select(models.AbstractTrace)).all()
+    deltas = [[step["delta_time_ms_from_prev"] for step in trace.steps_json] for trace in traces]
+    assert sorted(deltas) == [[0], [0], [0, 600_000]]
+
+
+def test_aggregation_drops_events_revoked_since_the_last_refresh(db_session, now):
+    _seed_history(db_session, now)
+    other = _resource(db_session, "ENG-2", "u1", at=utcnow() - timedelta(days=1))
+    _event(db_session, "other-25", now + timedelta(minutes=25), other)
+    db_session.commit()
+    personal.build_personal_timeline(db_session, "u1", ["u1"])
+    personal.cluster_personal_tasks(db_session, "u1")
+    personal.set_opt_in(db_session, "u1", True)
+    assert aggregation.abstract_opted_in_traces(db_session) == 1
+    steps = db_session.scalar(select(models.AbstractTrace.steps_json))
+    assert len(steps) == 4
+
+    # The timeline still lists the event until its next refresh; aggregation must not.
+    db_session.execute(
+        update(models.ResourceACL)
+        .where(models.ResourceACL.resource_id == other.resource_id)
+        .values(revoked_at=utcnow())
+    )
+    db_session.commit()
+    assert aggregation.abstract_opted_in_traces(db_session) == 1
+    steps = db_session.scalar(select(models.AbstractTrace.steps_json))
+    assert len(steps) == 3
@@ -0,0 +1,54 @@
+from sqlalchemy import func, select
+
+from ocg.db import models
+from ocg.services import ingest
+from tests.unit.test_ingest_bulk import BatchConnector
+
+
+class MalformedConnector(BatchConnector):
+    """BatchConnector whose normalize chokes on every third payload until fixed."""
+
+    def __init__(self, now, count: int, *, fixed: bool = False) -> None:
+        super().__init__(now, count)
+        self.fixed = fixed
+
+    def normalize(self, event):
+        if not self.fixed and event.payload_json["i"] % 3 == 0:
+            raise KeyError("assignee")
+        return super().normalize(event)
+
+
+def _quarantined(db_session) -> dict[str, int]:
+    rows = db_session.execute(
+        select(models.IngestQuarantine.external_event_id, models.IngestQuarantine.attempts)
+    )
+    return {external_event_id: attempts for external_event_id, attempts in rows}
+
+
+def test_malformed_events_are_quarantined_and_page_commits(db_session, now):
+    result = ingest.ingest_connector_batch(db_session, MalformedConnector(now, 10), {})
+    assert result["raw_event"] == 10
+    assert result["trace_event"] == 6
+    assert result["quarantined"] == 4
+    assert _quarantined(db_session) == {"evt-0": 1, "evt-3": 1, "evt-6": 1, "evt-9": 1}
+
+    summary = ingest.quarantine_summary(db_session, "batch", limit=2)
+    assert summary["total"] == 4
+    assert len(summary["items"]) == 2
+    assert summary["items"][0]["error_type"] == "KeyError"
+
+
+def test_redrive_writes_fixed_events_and_keeps_failures(db_session, now):
+    ingest.ingest_connector_batch(db_session, MalformedConnector(now, 10), {})
+
+    still_broken = ingest.redrive_quarantined(db_session, MalformedConnector(now, 10), page_size=3)
+    assert still_broken["attempted"] == 4
+    assert still_broken["still_quarantined"] == 4
+    assert still_broken["pages"] == 2
+    assert set(_quarantined(db_session).values()) == {2}
+
+    fixed = ingest.redrive_quarantined(db_session, MalformedConnector(now, 10, fixed=True))
+    assert fixed["trace_event"] == 4
+    assert fixed["still_quarantined"] == 0
+    assert _quarantined(db_session) == {}
+    assert db_session.scalar(select(func.count()).select_from(models.TraceEvent)) == 10
@@ -1,6 +1,17 @@
 import pytest
 
-from ocg.services.reliability import RetryPolicy, retry_with_backoff
+from ocg.core.observability import CONNECTOR_ERRORS
+from ocg.services.reliability import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitPolicy,
+    InMemoryCircuitStore,
+    RetryPolicy,
+    retry_with_backoff,
+)
 
 
 class RetryableError(RuntimeError):
@@ -21,3 +32,68 @@ def test_retries_are_bounded():
             retryable=lambda exc: isinstance(exc, RetryableError),
         )
     assert attempts["count"] == 3
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        "jira",
+        store=InMemoryCircuitStore(clock),
+        policy=CircuitPolicy(failure_threshold=2, reset_timeout_seconds=30.0),
+        clock=clock,
+    )
+
+
+def _failing_pages():
+    raise ConnectionError("vendor down")
+    yield  # pragma: no cover
+
+
+def test_circuit_opens_after_threshold_and_fails_fast():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            list(breaker.guard(_failing_pages()))
+    assert breaker.snapshot()["state"] == CIRCUIT_OPEN
+
+    before = CONNECTOR_ERRORS.labels(tool="jira", reason="circuit_open")._value.get()
+    with pytest.raises(CircuitOpenError):
+        list(breaker.guard([1, 2]))
+    assert CONNECTOR_ERRORS.labels(tool="jira", reason="circuit_open")._value.get() == before + 1
+
+
+def test_half_open_allows_one_probe_and_closes_on_success():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            list(breaker.guard(_failing_pages()))
+    clock.now += 31
+    assert breaker.snapshot()["state"] == CIRCUIT_HALF_OPEN
+
+    probe = breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success(probe)
+    assert breaker.snapshot() == {"state": CIRCUIT_CLOSED, "failures": 0, "opened_at": None}
+
+
+def test_failed_probe_reopens_circuit():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            list(breaker.guard(_failing_pages()))
+    clock.now += 31
+    with pytest.raises(ConnectionError):
+        list(breaker.guard(_failing_pages()))
+    assert breaker.snapshot()["state"] == CIRCUIT_OPEN
+    assert breaker.snapshot()["opened_at"] == clock.now
@@ -0,0 +1,87 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import func, select
+
+from ocg.connectors.registry import CONNECTOR_REGISTRY
+from ocg.db import models
+from ocg.services import ingest
+from tests.unit.test_ingest_bulk import BatchConnector
+
+
+class FixedConnector(BatchConnector):
+    """BatchConnector whose normalize bug (action_type) has been fixed."""
+
+    def __init__(self, now, count: int) -> None:
+        super().__init__(now, count)
+        self.normalized = 0
+
+    def normalize(self, event):
+        self.normalized += 1
+        trace, delta = super().normalize(event)
+        return replace(trace, action_type="review"), replace(delta, title="fixed")
+
+
+def _traces(db_session) -> dict[str, tuple[str, str]]:
+    rows = db_session.execute(
+        select(
+            models.TraceEvent.external_event_id,
+            models.TraceEvent.trace_event_id,
+            models.TraceEvent.action_type,
+        )
+    )
+    return {row.external_event_id: (row.trace_event_id, row.action_type) for row in rows}
+
+
+def test_replay_rederives_traces_and_resources_in_place(db_session, now):
+    ingest.ingest_connector_batch(db_session, BatchConnector(now, 10), {})
+    before = _traces(db_session)
+
+    result = ingest.replay_raw_events(db_session, FixedConnector(now, 10), page_size=4, workers=1)
+    assert result["raw_event"] == 10
+    assert result["trace_event"] == 10
+    assert result["pages"] == 3
+    assert result["resources_updated"] == 7
+
+    after = _traces(db_session)
+    assert {key: trace_id for key, (trace_id, _) in after.items()} == {
+        key: trace_id for key, (trace_id, _) in before.items()
+    }
+    assert {action for _, action in after.values()} == {"review"}
+    assert db_session.scalar(select(func.count()).select_from(models.JobCheckpoint)) == 0
+
+
+def test_replay_resumes_from_checkpoint_after_crash(db_session, now, monkeypatch):
+    ingest.ingest_connector_batch(db_session, BatchConnector(now, 10), {})
+
+    write_page = ingest._upsert_normalized
+    written_pages = []
+
+    def crash_on_second_page(*args):
+        if written_pages:
+            raise RuntimeError("worker crashed")
+        written_pages.append(1)
+        return write_page(*args)
+
+    monkeypatch.setattr(ingest, "_upsert_normalized", crash_on_second_page)
+    with pytest.raises(RuntimeError):
+        ingest.replay_raw_events(db_session, FixedConnector(now, 10), page_size=4, workers=1)
+    db_session.rollback()
+    monkeypatch.setattr(ingest, "_upsert_normalized", write_page)
+    assert sum(action == "review" for _, action in _traces(db_session).values()) == 4
+
+    resumed = FixedConnector(now, 10)
+    result = ingest.replay_raw_events(db_session, resumed, page_size=4, workers=1)
+    assert result["raw_event"] == 6
+    assert resumed.normalized == 6
+    assert {action for _, action in _traces(db_session).values()} == {"review"}
+
+
+def test_replay_normalizes_in_worker_processes(db_session, now, monkeypatch):
+    ingest.ingest_connector_batch(db_session, BatchConnector(now, 10), {})
+    connector = FixedConnector(now, 10)
+    monkeypatch.setitem(CONNECTOR_REGISTRY, connector.tool, connector)
+
+    result = ingest.replay_raw_events(db_session, connector, page_size=5, workers=2)
+    assert result["trace_event"] == 10
+    assert {action for _, action in _traces(db_session).values()} == {"review"}
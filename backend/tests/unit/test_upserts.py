@@ -0,0 +1,78 @@
+from sqlalchemy import func, select
+
+from ocg.db import models
+from ocg.db.upsert import insert_ignore, upsert
+from ocg.services import ingest
+from ocg.services.common import utcnow
+from tests.unit.test_ingest_bulk import BatchConnector
+
+
+def _count(db_session, model) -> int:
+    return db_session.scalar(select(func.count()).select_from(model))
+
+
+def test_insert_ignore_returns_only_inserted_rows(db_session):
+    rows = [
+        {"principal_id": f"user-{i}", "principal_type": "user", "created_at": utcnow()}
+        for i in range(3)
+    ]
+    assert (
+        len(
+            insert_ignore(
+                db_session, models.Principal, rows, returning=models.Principal.principal_id
+            )
+        )
+        == 3
+    )
+    extra = {"principal_id": "user-9", "principal_type": "user", "created_at": utcnow()}
+    inserted = insert_ignore(
+        db_session,
+        models.Principal,
+        [*rows, extra],
+        conflict_columns=("principal_id",),
+        returning=models.Principal.principal_id,
+    )
+    assert inserted == ["user-9"]
+    assert _count(db_session, models.Principal) == 4
+
+
+def test_upsert_overwrites_update_columns(db_session, now):
+    row = {"job_name": "job", "checkpoint_json": {"n": 1}, "updated_at": now}
+    upsert(
+        db_session,
+        models.JobCheckpoint,
+        [row],
+        conflict_columns=("job_name",),
+        update_columns=("checkpoint_json", "updated_at"),
+    )
+    upsert(
+        db_session,
+        models.JobCheckpoint,
+        [{**row, "checkpoint_json": {"n": 2}}],
+        conflict_columns=("job_name",),
+        update_columns=("checkpoint_json", "updated_at"),
+    )
+    assert db_session.scalar(select(models.JobCheckpoint.checkpoint_json)) == {"n": 2}
+
+
+def test_ingest_tolerates_rows_committed_by_a_concurrent_worker(db_session, now, monkeypatch):
+    connector = BatchConnector(now, 10)
+    ingest.ingest_connector_batch(db_session, connector, {})
+
+    # Simulate a second worker whose prefetch ran before the first one committed.
+    monkeypatch.setattr(ingest, "_existing_external_ids", lambda *args, **kwargs: set())
+    load_resources = ingest._load_resources
+    calls = []
+
+    def _stale_load(db, keys):
+        calls.append(keys)
+        return {} if len(calls) == 1 else load_resources(db, keys)
+
+    monkeypatch.setattr(ingest, "_load_resources", _stale_load)
+    result = ingest.ingest_connector_batch(db_session, connector, {})
+    assert result["raw_event"] == 0
+    assert result["trace_event"] == 0
+    assert result["resources_inserted"] == 0
+    assert _count(db_session, models.RawEvent) == 10
+    assert _count(db_session, models.TraceEvent) == 10
+    assert _count(db_session, models.Resource) == 7
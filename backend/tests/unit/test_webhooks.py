@@ -0,0 +1,146 @@
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from ocg.connectors.base import ConnectorEvent
+from ocg.core.settings import get_settings
+from ocg.db import models
+from ocg.services import ingest, webhooks
+from tests.integration.test_api_auth import _build_client
+from tests.unit.test_ingest_bulk import BatchConnector
+
+
+def _events(now, count: int) -> list[ConnectorEvent]:
+    return [
+        ConnectorEvent(
+            tool="batch",
+            external_event_id=f"hook-{i}",
+            fetched_at=now,
+            payload_json={"ticket": "T-1", "actor": "user-1", "i": i},
+            permission_state="KNOWN",
+        )
+        for i in range(count)
+    ]
+
+
+class RejectingConnector(BatchConnector):
+    def validate(self, config):
+        raise ValueError("token missing")
+
+
+def test_buffer_flushes_on_size_or_age(db_session, now, webhook_buffer):
+    webhooks.buffer_webhook_events("batch", _events(now, 3))
+    due = {"buffer": webhook_buffer, "batch_size": 3, "flush_interval_ms": 500}
+    assert webhooks.flush_due("batch", **due, now=now)
+    assert not webhooks.flush_due("batch", **{**due, "batch_size": 4}, now=now)
+    assert webhooks.flush_due(
+        "batch", **{**due, "batch_size": 4}, now=now + timedelta(milliseconds=500)
+    )
+
+    result = webhooks.flush_webhook_events(db_session, BatchConnector(now, 0), {}, max_events=2)
+    assert result == {"events": 2, "raw_event": 2, "trace_event": 2, "quarantined": 0}
+    assert webhook_buffer.depth("batch") == 1
+    # Webhook pages never move polling cursors.
+    assert ingest.load_connector_cursors(db_session, "batch") == {}
+
+
+def test_failed_flush_requeues_batch(db_session, now, webhook_buffer):
+    webhooks.buffer_webhook_events("batch", _events(now, 3))
+    before = webhook_buffer.oldest("batch")
+    with pytest.raises(ValueError):
+        webhooks.flush_webhook_events(db_session, RejectingConnector(now, 0), {})
+    assert webhook_buffer.depth("batch") == 3
+    assert webhook_buffer.oldest("batch") == before
+    assert webhook_buffer.processing("batch") == []
+
+
+def test_batch_claimed_before_a_crash_is_redelivered(db_session, now, webhook_buffer):
+    webhooks.buffer_webhook_events("batch", _events(now, 3))
+    # A batcher that dies between claim and commit leaves the batch in processing.
+    claimed = webhook_buffer.claim("batch", 2)
+    assert webhook_buffer.depth("batch") == 1
+    assert webhook_buffer.processing("batch") == claimed
+
+    webhooks.run_batcher(
+        lambda: {"batch": (BatchConnector(now, 0), {})},
+        lambda: db_session,
+        batch_size=3,
+        flush_interval_ms=60_000,
+        buffer=webhook_buffer,
+        once=True,
+    )
+    assert webhook_buffer.depth("batch") == 0
+    assert webhook_buffer.processing("batch") == []
+    assert db_session.scalar(select(func.count()).select_from(models.TraceEvent)) == 3
+
+
+def test_push_rejects_batches_over_capacity(monkeypatch, now, webhook_buffer):
+    monkeypatch.setattr(get_settings(), "webhook_buffer_max_events", 3)
+    webhooks.buffer_webhook_events("batch", _events(now, 2))
+    with pytest.raises(webhooks.WebhookBufferFullError):
+        webhooks.buffer_webhook_events("batch", _events(now, 2))
+    assert webhook_buffer.depth("batch") == 2
+
+
+def test_webhook_endpoint_validates_and_buffers(monkeypatch, webhook_buffer):
+    monkeypatch.setenv("JIRA_WEBHOOK_SECRET", "hook-secret")
+    client, LocalSession = _build_client()
+    db = LocalSession()
+    try:
+        ingest.set_connector_enabled(
+            db,
+            "jira",
+            True,
+            {
+                "auth": {"token_ref": "env:JIRA_TOKEN"},
+                "webhook_secret_ref": "env:JIRA_WEBHOOK_SECRET",
+            },
+        )
+    finally:
+        db.close()
+    body = json.dumps(
+        {
+            "external_event_id": "jira-hook-1",
+            "payload": {
+                "issue_key": "ENG-7",
+                "actor": "demo-user",
+                "transition": "Done",
+                "ts": "2026-02-07T10:00:00+00:00",
+            },
+        }
+    ).encode()
+    signature = "sha256=" + hmac.new(b"hook-secret", body, hashlib.sha256).hexdigest()
+    url = "/api/v1/ingest/jira/webhook"
+
+    assert client.post(url, content=body).status_code == 401
+    bad = client.post(url, content=b'{"payload": {}}', headers={"X-OCG-Signature": "sha256=0"})
+    assert bad.status_code == 401
+    accepted = client.post(url, content=body, headers={"X-OCG-Signature": signature})
+    assert accepted.status_code == 202
+    assert accepted.json() == {"tool": "jira", "accepted": 1, "buffered": 1}
+
+    malformed = b'{"payload": {}}'
+    malformed_signature = (
+        "sha256=" + hmac.new(b"hook-secret", malformed, hashlib.sha256).hexdigest()
+    )
+    rejected = client.post(url, content=malformed, headers={"X-OCG-Signature": malformed_signature})
+    assert rejected.status_code == 400
+
+    db = LocalSession()
+    try:
+        targets = ingest.enabled_connector_targets(db)
+    finally:
+        db.close()
+    webhooks.run_batcher(
+        lambda: targets, LocalSession, batch_size=1, flush_interval_ms=60_000, once=True
+    )
+    assert webhook_buffer.depth("jira") == 0
+    db = LocalSession()
+    try:
+        assert db.scalar(select(func.count()).select_from(models.TraceEvent)) == 1
+    finally:
+        db.close()
@@ -1,6 +1,6 @@
 import pytest
 
-from ocg.workers import runtime
+from ocg.workers import jobs, runtime
 from ocg.workers.queues import ALL_QUEUES
 
 
@@ -21,3 +21,23 @@ def test_parse_queue_names_rejects_unknown():
 def test_scheduler_rejects_non_positive_interval():
     with pytest.raises(ValueError):
         runtime.run_scheduler(interval_seconds=0, once=True)
+
+
+def test_personal_refresh_key_follows_the_principal_set():
+    key = jobs.personal_refresh_key("u1", ["group:a", "u1"])
+    assert key == jobs.personal_refresh_key("u1", ["u1", "group:a", "u1"])
+    assert key != jobs.personal_refresh_key("u1", ["u1"])
+    assert key.startswith("ocg:personal_refresh:u1:")
+
+
+def test_personal_graph_job_releases_its_dedup_key_on_failure(monkeypatch):
+    released = []
+
+    def fail(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(jobs.personal, "refresh_personal_timeline", fail)
+    monkeypatch.setattr(jobs, "_release_personal_refresh", lambda *args: released.append(args))
+    with pytest.raises(RuntimeError):
+        jobs.run_personal_graph("u1", ["u1"])
+    assert released == [("u1", ["u1"])]
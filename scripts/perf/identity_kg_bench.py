@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ocg.db import models
+from ocg.db.base import Base
+from ocg.services import identity, kg
+
+
+SIZES = [1_000, 2_000, 4_000, 8_000]
+
+
+def _seed(session, size: int) -> None:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    actors = max(size // 4, 1)
+    session.add_all(
+        [
+            models.TraceEvent(
+                tool="jira",
+                external_event_id=f"evt-{i}",
+                tool_family="tickets",
+                action_type="comment",
+                event_time=start + timedelta(seconds=i),
+                actor_principal_id=f"user-{i % actors}",
+                resource_id=None,
+                related_resource_ids=[],
+                entity_tags_json={"entity_type_tags": ["Ticket", "Service"]},
+                metadata_json={},
+                permission_state="KNOWN",
+            )
+            for i in range(size)
+        ]
+    )
+    session.commit()
+
+
+def _run(size: int) -> dict[str, float]:
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        _seed(session, size)
+        start = time.perf_counter()
+        identity.resolve_identities(session)
+        identity_s = time.perf_counter() - start
+        start = time.perf_counter()
+        kg.infer_kg_entities(session)
+        kg_s = time.perf_counter() - start
+    finally:
+        session.close()
+        engine.dispose()
+    return {
+        "events": size,
+        "resolve_identities_s": identity_s,
+        "infer_kg_entities_s": kg_s,
+        "us_per_event": (identity_s + kg_s) / size * 1_000_000,
+    }
+
+
+def main() -> None:
+    runs = [_run(size) for size in SIZES]
+    base = runs[0]["us_per_event"]
+    for run in runs:
+        # Set-based builders keep per-event cost flat; per-row lookups grow it with size.
+        run["per_event_vs_smallest"] = run["us_per_event"] / base
+        print(
+            f"events={run['events']:>6} us/event={run['us_per_event']:8.1f} "
+            f"ratio={run['per_event_vs_smallest']:.2f}"
+        )
+    out = Path("artifacts/perf")
+    out.mkdir(parents=True, exist_ok=True)
+    (out / "identity_kg.json").write_text(json.dumps(runs, indent=2), encoding="utf-8")
+    print("identity_kg_bench: wrote artifacts/perf/identity_kg.json")
+
+
+if __name__ == "__main__":
+    main()
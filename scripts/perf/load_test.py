@@ -0,0 +1,316 @@
+"""Concurrent HTTP load test for the read APIs, reporting latency percentiles per endpoint.
+
+Usage (from the repo root, API running with seeded data):
+    python scripts/perf/load_test.py --concurrency 32 --duration 60
+    python scripts/perf/load_test.py --mix analytics=6,suggest=3,personal=1 --users 50
+    python scripts/perf/load_test.py --compare artifacts/perf/load_test_prev.json
+
+``--concurrency`` workers issue requests back to back for ``--duration`` seconds (after a
+``--warmup`` that is not recorded), each picking a scenario by the ``--mix`` weights. Dev auth
+(``X-Dev-User``/``X-Dev-Role``) rotates personal requests across ``--users`` people; pass
+``--token`` to send a bearer token instead. The JSON report carries the parameters next to the
+results so runs at different concurrency levels can be compared when sizing API replicas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from urllib.parse import quote
+
+import httpx
+
+
+DEFAULT_OUTPUT = Path("artifacts/perf/load_test.json")
+GROUPS = ("analytics", "suggest", "personal")
+# Recorded for timeouts and connection errors, so they count as errors.
+TRANSPORT_ERROR_STATUS = 599
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    group: str
+    method: str
+    path: str
+    body: dict | None = None
+
+
+def _scenarios(process_key: str, pattern_id: str | None) -> list[Scenario]:
+    key = quote(process_key, safe="")
+    scenarios = [
+        Scenario("analytics.processes", "analytics", "GET", "/api/v1/analytics/processes"),
+        Scenario(
+            "analytics.process_patterns",
+            "analytics",
+            "GET",
+            f"/api/v1/analytics/processes/{key}/patterns",
+        ),
+        Scenario(
+            "analytics.process_variants",
+            "analytics",
+            "GET",
+            f"/api/v1/analytics/processes/{key}/variants",
+        ),
+        Scenario(
+            "suggest.next_steps",
+            "suggest",
+            "POST",
+            "/api/v1/suggest/next_steps",
+            {"process_key": process_key, "recent_steps": [], "limit": 5},
+        ),
+        Scenario("personal.timeline", "personal", "GET", "/api/v1/personal/timeline"),
+        Scenario("personal.tasks", "personal", "GET", "/api/v1/personal/tasks"),
+    ]
+    if pattern_id:
+        scenarios += [
+            Scenario(
+                f"analytics.pattern_{view}",
+                "analytics",
+                "GET",
+                f"/api/v1/analytics/patterns/{quote(pattern_id, safe='')}/{view}",
+            )
+            for view in ("variants", "edges", "bottlenecks")
+        ]
+    return scenarios
+
+
+def parse_mix(raw: str) -> dict[str, float]:
+    """``analytics=5,suggest=3,personal=2`` -> group weights (groups left out get 0)."""
+    weights = dict.fromkeys(GROUPS, 0.0)
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        group, _, weight = item.partition("=")
+        if group not in weights:
+            raise ValueError(f"unknown mix group {group!r}; expected one of {', '.join(GROUPS)}")
+        weights[group] = float(weight)
+    if sum(weights.values()) <= 0:
+        raise ValueError("mix needs at least one positive weight")
+    return weights
+
+
+def percentile(sorted_ms: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_ms:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_ms)))
+    return round(sorted_ms[rank - 1], 2)
+
+
+def summarize(latencies_ms: list[float], statuses: Counter, seconds: float) -> dict:
+    ordered = sorted(latencies_ms)
+    total = sum(statuses.values())
+    errors = sum(count for status, count in statuses.items() if not 200 <= int(status) < 400)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(total / seconds, 1) if seconds else 0.0,
+        "latency_ms": {
+            "p50": percentile(ordered, 50),
+            "p95": percentile(ordered, 95),
+            "p99": percentile(ordered, 99),
+            "max": round(ordered[-1], 2) if ordered else 0.0,
+            "mean": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+        },
+        "status": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+async def _discover_pattern(client: httpx.AsyncClient, process_key: str) -> str | None:
+    response = await client.get(
+        f"/api/v1/analytics/processes/{quote(process_key, safe='')}/patterns"
+    )
+    if response.status_code != 200:
+        return None
+    patterns = response.json().get("patterns", [])
+    return patterns[0]["pattern_id"] if patterns else None
+
+
+async def run_load(
+    *,
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    mix: dict[str, float],
+    process_key: str,
+    users: int,
+    user_prefix: str,
+    role: str,
+    token: str | None,
+    seed: int,
+    timeout: float,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {"X-Dev-Role": role}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, headers=headers, timeout=timeout, limits=limits, transport=transport
+    ) as client:
+        pattern_id = await _discover_pattern(client, process_key)
+        scenarios = [s for s in _scenarios(process_key, pattern_id) if mix[s.group] > 0]
+        per_group = Counter(s.group for s in scenarios)
+        weights = [mix[s.group] / per_group[s.group] for s in scenarios]
+        latencies: dict[str, list[float]] = defaultdict(list)
+        statuses: dict[str, Counter] = defaultdict(Counter)
+
+        loop = asyncio.get_running_loop()
+        measure_from = loop.time() + warmup
+        stop_at = measure_from + duration
+
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(f"{seed}:{worker_id}")
+            sent = 0
+            while loop.time() < stop_at:
+                scenario = rng.choices(scenarios, weights)[0]
+                request_headers = {}
+                if not token:
+                    user = (worker_id + sent * concurrency) % users
+                    request_headers["X-Dev-User"] = (
+                        user_prefix if users == 1 else f"{user_prefix}{user}"
+                    )
+                sent += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.request(
+                        scenario.method,
+                        scenario.path,
+                        json=scenario.body,
+                        headers=request_headers,
+                    )
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = TRANSPORT_ERROR_STATUS
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if loop.time() >= measure_from:
+                    latencies[scenario.name].append(elapsed_ms)
+                    statuses[scenario.name][status] += 1
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        measured = max(loop.time() - measure_from, 1e-9)
+
+    all_latencies = [ms for values in latencies.values() for ms in values]
+    all_statuses = sum(statuses.values(), Counter())
+    return {
+        "pattern_id": pattern_id,
+        "overall": summarize(all_latencies, all_statuses, measured),
+        "endpoints": {
+            name: summarize(latencies[name], statuses[name], measured) for name in sorted(latencies)
+        },
+    }
+
+
+def compare(current: dict, previous: dict) -> list[str]:
+    """Human-readable p95/throughput/error-rate deltas against a previous report."""
+    lines = []
+    names = ["overall", *sorted(current["results"]["endpoints"])]
+    for name in names:
+        now = current["results"] if name == "overall" else current["results"]["endpoints"]
+        before = previous["results"] if name == "overall" else previous["results"]["endpoints"]
+        now, before = now.get(name), before.get(name)
+        if not now or not before:
+            continue
+        lines.append(
+            f"{name:<30} p95 {before['latency_ms']['p95']:>8} -> {now['latency_ms']['p95']:>8} ms  "
+            f"rps {before['throughput_rps']:>8} -> {now['throughput_rps']:>8}  "
+            f"errors {before['error_rate']:.2%} -> {now['error_rate']:.2%}"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8080")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds.")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unrecorded seconds first.")
+    parser.add_argument("--mix", default="analytics=5,suggest=3,personal=2")
+    parser.add_argument("--process-key", default="chat:action=message")
+    parser.add_argument("--users", type=int, default=1, help="Dev-auth people to rotate.")
+    parser.add_argument(
+        "--user-prefix",
+        default="demo-user",
+        help="Dev-auth person id; with --users N > 1, people are <prefix>0..<prefix>N-1.",
+    )
+    parser.add_argument("--role", default="analyst")
+    parser.add_argument("--token", default=None, help="Bearer token instead of dev auth.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", type=Path, default=None, help="Previous report to diff.")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1 or args.duration <= 0 or args.users < 1:
+        parser.error("--concurrency and --users must be >= 1 and --duration > 0")
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+    params = {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "mix": mix,
+        "process_key": args.process_key,
+        "users": args.users,
+        "auth": "bearer" if args.token else "dev",
+        "seed": args.seed,
+    }
+    try:
+        results = asyncio.run(
+            run_load(
+                base_url=args.base_url,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+                mix=mix,
+                process_key=args.process_key,
+                users=args.users,
+                user_prefix=args.user_prefix,
+                role=args.role,
+                token=args.token,
+                seed=args.seed,
+                timeout=args.timeout,
+            )
+        )
+    except httpx.HTTPError as exc:
+        print(f"load_test: cannot reach {args.base_url}: {exc}")
+        return 2
+    report = {
+        "started_at": datetime.now(tz=UTC).isoformat(),
+        "params": params,
+        "results": results,
+    }
+    overall = results["overall"]
+    print(
+        f"load_test: {overall['requests']} requests at concurrency {args.concurrency} "
+        f"({args.users} users): {overall['throughput_rps']} rps, "
+        f"p50/p95/p99 {overall['latency_ms']['p50']}/{overall['latency_ms']['p95']}/"
+        f"{overall['latency_ms']['p99']} ms, errors {overall['error_rate']:.2%}"
+    )
+    for name, summary in results["endpoints"].items():
+        latency = summary["latency_ms"]
+        print(
+            f"  {name:<30} n={summary['requests']:>7} p50={latency['p50']:>8} "
+            f"p95={latency['p95']:>8} p99={latency['p99']:>8} errors={summary['error_rate']:.2%}"
+        )
+    if args.compare:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare(report, previous):
+            print(f"  {line}")
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"load_test: wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,268 @@
+"""End-to-end pipeline benchmark: seed synthetic events, time every stage, compare to a baseline.
+
+Usage (from the repo root):
+    PYTHONPATH=backend python scripts/perf/pipeline_bench.py --events 100000 --people 20
+    PYTHONPATH=backend python scripts/perf/pipeline_bench.py --save-baseline
+    PYTHONPATH=backend python scripts/perf/pipeline_bench.py --database-url postgresql+psycopg://...
+
+Events come from the seeded ``synthetic`` connector, so a given set of parameters always
+produces the same dataset. Each stage reports rows, seconds, rows/sec, SQL statement count,
+and process peak RSS after the stage. With a baseline present, a stage fails the run (exit 1)
+when its rows/sec drops or its statement count grows by more than ``--threshold`` (rows/sec is
+only compared for stages that ran at least ``--min-seconds``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from ocg.connectors.registry import CONNECTOR_REGISTRY
+from ocg.core.settings import Settings
+from ocg.db import models
+from ocg.db.base import Base
+from ocg.services import aggregation, identity, ingest, kg, personal
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+STAGES = (
+    "ingest_connector_batch",
+    "resolve_identities",
+    "infer_kg_entities",
+    "build_personal_timeline",
+    "cluster_personal_tasks",
+    "abstract_opted_in_traces",
+    "cluster_and_publish",
+)
+DEFAULT_BASELINE = Path("artifacts/perf/pipeline_baseline.json")
+DEFAULT_OUTPUT = Path("artifacts/perf/pipeline.json")
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _count(db: Session, model) -> int:
+    return int(db.scalar(select(func.count()).select_from(model)) or 0)
+
+
+class StageRecorder:
+    def __init__(self, engine) -> None:
+        self.statements = 0
+        self.stages: dict[str, dict] = {}
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.statements += 1
+
+    def run(self, stage: str, rows: Callable[[], int], call: Callable[[], object]) -> None:
+        """Time ``call``; ``rows`` counts the stage's input rows and is evaluated untimed."""
+        input_rows = rows()
+        statements = self.statements
+        started = time.perf_counter()
+        call()
+        seconds = time.perf_counter() - started
+        self.stages[stage] = {
+            "rows": input_rows,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(input_rows / seconds, 1) if seconds else 0.0,
+            "queries": self.statements - statements,
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+        print(
+            f"{stage:<26} rows={input_rows:>9} s={seconds:8.2f} "
+            f"rows/s={self.stages[stage]['rows_per_second']:>10.1f} "
+            f"queries={self.stages[stage]['queries']:>6} rss_mb={self.stages[stage]['peak_rss_mb']}"
+        )
+
+
+def run_pipeline(params: dict) -> dict[str, dict]:
+    url = params["database_url"]
+    if url.startswith("sqlite") and ":memory:" in url:
+        engine = create_engine(
+            url,
+            future=True,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(url, future=True)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    recorder = StageRecorder(engine)
+    try:
+        if _count(db, models.TraceEvent):
+            raise SystemExit("pipeline_bench: database is not empty; use a dedicated database")
+        connector = CONNECTOR_REGISTRY["synthetic"]
+        config = {
+            "seed": params["seed"],
+            "events": params["events"],
+            "actors": params["actors"],
+            "resources": params["resources"],
+        }
+        ingest.set_connector_enabled(db, "synthetic", True, config)
+        db.commit()
+        # The most active actors (Zipf rank order) are the people whose personal graph is built.
+        people = [f"synthetic-user-{index}" for index in range(params["people"])]
+
+        def personal_rows(model, column) -> Callable[[], int]:
+            return lambda: int(
+                db.scalar(select(func.count()).select_from(model).where(column.in_(people))) or 0
+            )
+
+        def build_timelines() -> None:
+            for person_id in people:
+                personal.build_personal_timeline(db, person_id, [person_id])
+
+        recorder.run(
+            "ingest_connector_batch",
+            lambda: params["events"],
+            lambda: ingest.ingest_connector_batch(
+                db, connector, config, page_size=params["page_size"]
+            ),
+        )
+        recorder.run(
+            "resolve_identities",
+            lambda: _count(db, models.TraceEvent),
+            lambda: identity.resolve_identities(db),
+        )
+        recorder.run(
+            "infer_kg_entities",
+            lambda: _count(db, models.TraceEvent),
+            lambda: kg.infer_kg_entities(db),
+        )
+        for person_id in people:
+            identity.ensure_person_and_principal(db, person_id)
+            personal.set_opt_in(db, person_id, True)
+        recorder.run(
+            "build_personal_timeline",
+            personal_rows(models.TraceEvent, models.TraceEvent.actor_principal_id),
+            build_timelines,
+        )
+        recorder.run(
+            "cluster_personal_tasks",
+            personal_rows(models.PersonalTimelineItem, models.PersonalTimelineItem.person_id),
+            lambda: personal.cluster_all_personal_tasks(db),
+        )
+        recorder.run(
+            "abstract_opted_in_traces",
+            personal_rows(models.PersonalTask, models.PersonalTask.person_id),
+            lambda: aggregation.abstract_opted_in_traces(db),
+        )
+        settings = Settings(
+            k_anonymity_k=min(5, params["people"]),
+            k_anonymity_n=min(20, params["people"]),
+        )
+        recorder.run(
+            "cluster_and_publish",
+            lambda: _count(db, models.AbstractTrace),
+            lambda: aggregation.cluster_and_publish(db, settings),
+        )
+    finally:
+        db.close()
+        engine.dispose()
+    return recorder.stages
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_seconds: float = 0.0) -> list[str]:
+    """Stages whose rows/sec fell, or statement count rose, by more than ``threshold``.
+
+    Throughput of stages that took under ``min_seconds`` in the baseline is too noisy to
+    compare; their statement counts still are.
+    """
+    regressions = []
+    for stage in STAGES:
+        now, before = current["stages"].get(stage), baseline["stages"].get(stage)
+        if not now or not before:
+            continue
+        timed = before["seconds"] >= min_seconds
+        if timed and now["rows_per_second"] < before["rows_per_second"] * (1 - threshold):
+            regressions.append(
+                f"{stage}: rows/sec {now['rows_per_second']} < baseline "
+                f"{before['rows_per_second']} (-{threshold:.0%} allowed)"
+            )
+        if now["queries"] > before["queries"] * (1 + threshold):
+            regressions.append(
+                f"{stage}: queries {now['queries']} > baseline {before['queries']} "
+                f"(+{threshold:.0%} allowed)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+pysqlite:///:memory:")
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--actors", type=int, default=200)
+    parser.add_argument("--resources", type=int, default=300)
+    parser.add_argument("--people", type=int, default=10, help="Opted-in people to build.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.20)
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=1.0,
+        help="Skip the rows/sec check for stages faster than this in the baseline.",
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    if not 1 <= args.people <= args.actors:
+        parser.error("--people must be between 1 and --actors")
+
+    params = {
+        "database_url": args.database_url.split("://", 1)[0],
+        "events": args.events,
+        "actors": args.actors,
+        "resources": args.resources,
+        "people": args.people,
+        "seed": args.seed,
+        "page_size": args.page_size,
+    }
+    stages = run_pipeline({**params, "database_url": args.database_url})
+    report = {"params": params, "stages": stages}
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"pipeline_bench: wrote {args.output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"pipeline_bench: saved baseline {args.baseline}")
+        return 0
+    if not args.baseline.is_file():
+        print("pipeline_bench: no baseline; run with --save-baseline to record one")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline["params"] != params:
+        print(f"pipeline_bench: baseline params differ ({baseline['params']}); not comparing")
+        return 2
+    regressions = compare(report, baseline, args.threshold, args.min_seconds)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        return 1
+    print("pipeline_bench: within baseline thresholds")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())